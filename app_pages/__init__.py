@@ -0,0 +1,21 @@
+"""
+Page registry for app.py.
+
+Each page module is imported the first time its page is opened (later
+calls are served from sys.modules), so a fresh process only pays for
+the libraries of the page the user actually visits.
+"""
+import importlib
+
+PAGES = {
+    "Project Summary": "app_pages.page_1_summary",
+    "Workforce Analysis": "app_pages.page_2_analysis",
+    "Project Hypotheses": "app_pages.page_3_hypotheses",
+    "Attrition Predictor (ML)": "app_pages.page_4_ml",
+    "Technical: Model & Evaluation": "app_pages.page_5_technical",
+}
+
+
+def load_page(label):
+    """Return the `run` function of the page called `label`."""
+    return importlib.import_module(PAGES[label]).run
@@ -1,26 +1,7 @@
 import streamlit as st
-import pandas as pd
 from pathlib import Path
-from src.config import ROOT, RAW_CSV, PROCESSED_PARQUET, READY_PARQUET
-
-
-def _load_preview():
-    """
-    Try these files in order and return a small preview:
-    1) ready parquet (best for the app)
-    2) processed parquet
-    3) raw CSV
-    """
-    for p in (READY_PARQUET, PROCESSED_PARQUET, RAW_CSV):
-        try:
-            if p.exists():
-                if p.suffix == ".parquet":
-                    return pd.read_parquet(p), p
-                else:
-                    return pd.read_csv(p), p
-        except Exception:
-            continue
-    return None, None
+from src.config import ROOT
+from src.data import load_dataset
 
 
 def run():
@@ -39,7 +20,7 @@ def run():
     """)
 
     # -- Dataset overview --
-    df, src = _load_preview()
+    df, src = load_dataset()
     st.markdown("### Dataset at a Glance")
 
     if df is not None:
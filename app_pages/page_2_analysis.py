@@ -1,36 +1,21 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 from pathlib import Path
 
 # Import from src modules for consistency
-from src.config import ROOT, READY_PARQUET, PROCESSED_PARQUET, RAW_CSV
+from src.config import ROOT, CHART_MAX_POINTS
+from src.chart_data import box_summary, category_counts, hierarchy_counts
+from src.corr_stats import get_corr_stats, query_corr
+from src.cube import get_cube, query_rates
+from src.data import first_existing
+from src.filters import available_columns, filter_options, scan_filtered
 from src.features import NUM_FEATURES, CAT_FEATURES
 
-# Use paths from config
-READY = READY_PARQUET
-PROCESSED = PROCESSED_PARQUET
-
 # Use features from src.features
 SUGGESTED_CAT = CAT_FEATURES
 SUGGESTED_NUM = NUM_FEATURES
 
-def _load_df():
-    """Load dataset from preferred locations; return (DataFrame, path) or (None, None)."""
-    for p in (READY, PROCESSED, RAW_CSV):
-        if p.exists():
-            if p.suffix == ".parquet":
-                return pd.read_parquet(p), p
-            return pd.read_csv(p), p
-    return None, None
-
-def _ensure_target(df: pd.DataFrame) -> pd.DataFrame:
-    """Add binary target column if missing and 'Attrition' exists."""
-    if "target" not in df.columns and "Attrition" in df.columns:
-        df = df.copy()
-        df["target"] = df["Attrition"].map({"Yes": 1, "No": 0})
-    return df
-
 def run():
     st.title("Workforce Analysis (Conventional)")
     
@@ -41,22 +26,26 @@ def run():
     of the workforce.
     """)
 
-    df, src = _load_df()
-    if df is None:
+    src = first_existing()
+    if src is None:
         st.warning("No data found in data/processed/ or data/raw/. Run Notebook 01–02.")
         return
 
-    df = _ensure_target(df)
-    st.caption(f"Loaded from: `{src.relative_to(ROOT)}` - Rows: {len(df):,} - Columns: {len(df.columns)}")
+    # Only the columns the charts below use are ever read
+    all_cols = available_columns(src)
+    chart_cols = [c for c in [*SUGGESTED_CAT, *SUGGESTED_NUM, "Attrition", "target"]
+                  if c in all_cols]
+    opts = filter_options(src)
+    st.caption(f"Loaded from: `{src.relative_to(ROOT)}` - Rows: {opts['rows']:,} - Columns: {len(all_cols)}")
 
      # Filters (affect all charts below)
     
     # Simple Filters (affect charts)
     with st.expander("Filters", expanded=False):
-        dept_opts = df["Department"].dropna().unique().tolist() if "Department" in df.columns else []
-        ot_opts   = df["OverTime"].dropna().unique().tolist()   if "OverTime"   in df.columns else []
-        min_age   = int(df["Age"].min()) if "Age" in df.columns else 18
-        max_age   = int(df["Age"].max()) if "Age" in df.columns else 70
+        dept_opts = opts["departments"]
+        ot_opts   = opts["overtime"]
+        min_age   = opts["age_min"]
+        max_age   = opts["age_max"]
 
         colf1, colf2, colf3 = st.columns(3)
         with colf1:
@@ -77,27 +66,29 @@ def run():
                 key="filter_age_range"
             )
 
-    # apply filters 
-    mask = pd.Series(True, index=df.index)
-    if "Department" in df.columns and sel_dept:
-        mask &= df["Department"].isin(sel_dept)
-    if "OverTime" in df.columns and sel_ot:
-        mask &= df["OverTime"].isin(sel_ot)
-    if "Age" in df.columns:
-        mask &= df["Age"].between(age_range[0], age_range[1])
-
-    dff = df[mask].copy()
+    # apply filters inside the Arrow scan (shared cached result: read-only)
+    dff = scan_filtered(
+        src, chart_cols,
+        departments=sel_dept if "Department" in all_cols else None,
+        overtime=sel_ot if "OverTime" in all_cols else None,
+        age_range=age_range if "Age" in all_cols else None,
+    )
     st.caption(f"Filtered rows: {len(dff):,}")
 
-    # 1) Categorical comparison (grouped histogram)
+    # Charts below are drawn from aggregates, never from the raw rows, so
+    # the browser payload does not grow with headcount
+    icube = get_cube(src)
+
+    # 1) Categorical comparison (grouped counts from the rollup cube)
     st.subheader("Compare attrition by category")
     cat_choices = [c for c in SUGGESTED_CAT if c in dff.columns]
     if not cat_choices:
         st.info("No suggested categorical columns found in data.")
     else:
         cat = st.selectbox("Categorical", cat_choices, index=0, key="cat_select")
-        hue = "Attrition" if "Attrition" in dff.columns else "target"
-        fig_cat = px.histogram(dff, x=cat, color=hue, barmode="group")
+        counts = category_counts(icube, cat, departments=sel_dept,
+                                 overtime=sel_ot, age_range=age_range)
+        fig_cat = px.bar(counts, x=cat, y="count", color="Attrition", barmode="group")
         st.plotly_chart(fig_cat, use_container_width=True)
         st.caption("Bars higher for 'Attrition=Yes' suggest a stronger link with leaving.")
 
@@ -107,15 +98,11 @@ def run():
     if cat_choices:
         cat2 = st.selectbox("Choose category", cat_choices, index=0,
                             key="cat_rate_select")
-        hue_col = "Attrition" if "Attrition" in dff.columns else "target"
-
-        # Make sure target exists for rate calculation
-        if "target" not in dff.columns and "Attrition" in dff.columns:
-            dff["target"] = dff["Attrition"].map({"Yes": 1, "No": 0})
 
-        rate_df = (dff.groupby(cat2)["target"]
-                   .agg(attrition_rate="mean", employee_count="size")
-                   .reset_index())
+        # Answered from the pre-built rollup cube, not from the raw rows
+        rate_df = (query_rates(icube, cat2, departments=sel_dept,
+                               overtime=sel_ot, age_range=age_range)
+                   .rename(columns={"rate": "attrition_rate", "n": "employee_count"}))
         rate_df["attrition_rate_pct"] = (100 * rate_df["attrition_rate"]).round(1)
 
         fig_rate = px.bar(
@@ -143,12 +130,29 @@ def run():
         num = st.selectbox("Numeric feature", num_choices, index=0,
                            key="num_select")
         hue = "Attrition" if "Attrition" in dff.columns else "target"
-        fig_box = px.box(dff, x=hue, y=num, points="all",
-                         title=f"{num} distribution by Attrition")
+        # Five-number summaries + a capped sample of outliers instead of every point
+        stats, outliers = box_summary(dff, num, hue, max_points=CHART_MAX_POINTS)
+        fig_box = go.Figure()
+        for row in stats.itertuples(index=False):
+            g = str(getattr(row, hue))
+            fig_box.add_trace(go.Box(
+                x=[g], q1=[row.q1], median=[row.median], q3=[row.q3], mean=[row.mean],
+                lowerfence=[row.lowerfence], upperfence=[row.upperfence],
+                name=g, boxpoints=False,
+            ))
+            pts = outliers.loc[outliers[hue] == getattr(row, hue), num]
+            fig_box.add_trace(go.Scatter(
+                x=[g] * len(pts), y=pts, mode="markers", name=f"{g} outliers",
+                marker=dict(size=4, opacity=0.6), showlegend=False,
+            ))
+        fig_box.update_layout(title=f"{num} distribution by Attrition",
+                              xaxis_title=hue, yaxis_title=num)
         st.plotly_chart(fig_box, use_container_width=True)
+        shown, total = len(outliers), int(stats["n_outliers"].sum()) if len(stats) else 0
         st.caption(
             "If box plots differ a lot between Yes/No, "
-            "that feature may matter for attrition."
+            "that feature may matter for attrition. "
+            f"Outliers shown: {shown:,} of {total:,}."
         )
 
     # 4) Interactive sunburst chart (drill-down by clicking)
@@ -163,9 +167,12 @@ def run():
     # Build the sunburst only if the needed columns exist
     sunburst_cols = ["Department", "JobRole", "OverTime"]
     if all(c in dff.columns for c in sunburst_cols) and "Attrition" in dff.columns:
+        # One row per leaf; Attrition is the outer ring so colours are exact
+        leaves = hierarchy_counts(dff, [*sunburst_cols, "Attrition"])
         fig_sun = px.sunburst(
-            dff,
-            path=sunburst_cols,
+            leaves,
+            path=[*sunburst_cols, "Attrition"],
+            values="count",
             color="Attrition",
             color_discrete_map={"Yes": "#EF553B", "No": "#636EFA"},
             title="Click segments to drill down",
@@ -184,14 +191,11 @@ def run():
    
     st.divider()
     st.subheader("Correlation heatmap (numeric features)")
-    if "target" not in dff.columns and "Attrition" in dff.columns:
-        dff["target"] = dff["Attrition"].map({"Yes": 1, "No": 0})
-
-    num_cols = [c for c in SUGGESTED_NUM if c in dff.columns]
-    cols_for_corr = [*num_cols, "target"] if "target" in dff.columns else num_cols
+    # Summed from per-segment sufficient statistics, not from the raw rows
+    corr = query_corr(get_corr_stats(src), departments=sel_dept,
+                      overtime=sel_ot, age_range=age_range)
 
-    if len(cols_for_corr) >= 2:
-        corr = dff[cols_for_corr].corr(numeric_only=True)
+    if len(corr.columns) >= 2:
         heat = px.imshow(
             corr, text_auto=True, aspect="auto",
             title="Correlation heatmap (hover for values)",
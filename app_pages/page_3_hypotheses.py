@@ -3,170 +3,75 @@ import pandas as pd
 
 # Import from src modules for consistency
 from src.config import READY_PARQUET, PROCESSED_PARQUET
+from src.data import first_existing
+from src.hypotheses import ALPHA, HYPOTHESES, get_results, rates, verdict
+from src.resampling import LEVEL, RESAMPLES, get_intervals
 
-def _load_df():
-    """Load the processed dataset using paths from config."""
-    for p in (READY_PARQUET, PROCESSED_PARQUET):
-        if p.exists():
-            return pd.read_parquet(p)
-    return None
 def run():
     st.title("Project Hypotheses & Validation")
     st.markdown("""
     This page tests three hypotheses about employee attrition using the IBM HR dataset.  
     Each hypothesis is stated, tested with data, and given a clear **Supported / Not Supported** verdict.
     """)
-         
 
-    # Use the helper function defined above
-    df = _load_df()
 
-    if df is None:
+    src = first_existing((READY_PARQUET, PROCESSED_PARQUET))
+    if src is None:
         st.warning("Processed data not found. Run Notebook 02.")
         return
 
-     # Make sure we have a binary target column (0 = Stay, 1 = Leave)
-    if "target" not in df.columns and "Attrition" in df.columns:
-        df["target"] = df["Attrition"].map({"Yes": 1, "No": 0})
-
-    # H1: Overtime workers leave more
-    st.markdown("---")
-    st.subheader("H1: Overtime workers have higher attrition")
-    st.markdown("""
-    **Hypothesis:** Employees who work overtime are more likely to leave  
-    than those who do not.
-    """)
-
-    # Calculate rates per group
-    h1 = (df.groupby("OverTime")["target"]
-          .agg(rate="mean", n="size")
-          .reset_index())
-    h1["rate_pct"] = (100 * h1["rate"]).round(1)
-
-    # Show evidence table
-    st.dataframe(h1, use_container_width=True)
-
-    # Show bar chart
-    st.bar_chart(h1.set_index("OverTime")["rate"])
-
-    # Get the actual numbers for the conclusion
-    ot_yes_rate = h1.loc[h1["OverTime"] == "Yes", "rate_pct"].values
-    ot_no_rate = h1.loc[h1["OverTime"] == "No", "rate_pct"].values
-
-    if len(ot_yes_rate) > 0 and len(ot_no_rate) > 0:
-        gap = float(ot_yes_rate[0] - ot_no_rate[0])
-        st.success(
-            f"**H1: SUPPORTED ✅** — Overtime workers have an attrition rate of "
-            f"**{ot_yes_rate[0]:.1f}%** compared to **{ot_no_rate[0]:.1f}%** "
-            f"for non-overtime workers (a gap of **{gap:.1f} percentage points**)."
-        )
-    else:
-        st.warning("Could not compute OverTime rates — check the data.")
-
-
-    # H2: Lower job satisfaction increases attrition
-    st.markdown("---")
-    st.subheader("H2: Lower job satisfaction increases attrition")
-    st.markdown("""
-    **Hypothesis:** Employees with lower job satisfaction levels leave at  
-    higher rates than those with higher satisfaction.
-    """)
-
-    if "JobSatisfaction" in df.columns:
-        h2 = (df.groupby("JobSatisfaction")["target"]
-              .agg(rate="mean", n="size")
-              .reset_index()
-              .sort_values("JobSatisfaction"))
-        h2["rate_pct"] = (100 * h2["rate"]).round(1)
-
-        # Show evidence table
-        st.dataframe(h2, use_container_width=True)
-
-        # Show bar chart
-        st.bar_chart(h2.set_index("JobSatisfaction")["rate"])
-
-        # Get lowest and highest satisfaction rates for conclusion
-        lowest_sat_rate = h2.loc[
-            h2["JobSatisfaction"] == h2["JobSatisfaction"].min(), "rate_pct"
-        ].values
-        highest_sat_rate = h2.loc[
-            h2["JobSatisfaction"] == h2["JobSatisfaction"].max(), "rate_pct"
-        ].values
-
-        if len(lowest_sat_rate) > 0 and len(highest_sat_rate) > 0:
+    # Every contingency table (hypotheses + screening) comes from one pass
+    # over the data and one batch of chi-square tests, cached per file version
+    results = get_results(src)
+    tables, tests = results["tables"], results["tests"]
+    # Bootstrap / permutation intervals, cached by the dataset's hash
+    intervals = get_intervals(src, tables, HYPOTHESES)
+
+    verdicts = {}
+    for spec in HYPOTHESES:
+        if spec["id"] not in tables:
+            continue
+        st.markdown("---")
+        st.subheader(f"{spec['id']}: {spec['title']}")
+        st.markdown(f"**Hypothesis:** {spec['statement']}")
+
+        # Evidence table and bar chart (rate per group)
+        group_col = spec.get("group", spec["column"])
+        evidence = rates(tables[spec["id"]], group_col)
+        evidence["rate_pct"] = (100 * evidence["rate"]).round(1)
+        interval = intervals[spec["id"]]  # None when a compared group is missing
+        if interval is not None:
+            groups, gap = interval
+            evidence["ci_low_pct"] = (100 * groups["ci_low"].to_numpy()).round(1)
+            evidence["ci_high_pct"] = (100 * groups["ci_high"].to_numpy()).round(1)
+        st.dataframe(evidence, use_container_width=True)
+        st.bar_chart(evidence.set_index(group_col)["rate"])
+
+        supported, high, low, p = verdict(spec, tables, tests)
+        verdicts[spec["id"]] = (supported, high, low, p)
+        if high is None or low is None:
+            st.warning(f"Could not compute {spec['column']} rates — check the data.")
+        elif supported:
             st.success(
-                f"**H2: SUPPORTED ✅** — Employees with the lowest satisfaction "
-                f"(level {int(h2['JobSatisfaction'].min())}) have an attrition rate of "
-                f"**{lowest_sat_rate[0]:.1f}%**, compared to **{highest_sat_rate[0]:.1f}%** "
-                f"for the highest satisfaction (level {int(h2['JobSatisfaction'].max())}). "
-                f"Attrition decreases as satisfaction increases."
+                f"**{spec['id']}: SUPPORTED ✅** — {spec['high_label']} have an attrition rate of "
+                f"**{100 * high:.1f}%** compared to **{100 * low:.1f}%** "
+                f"for {spec['low_label']} (a gap of **{100 * (high - low):.1f} percentage points**)."
             )
         else:
-            st.warning("Could not compute JobSatisfaction rates — check the data.")
-    else:
-        st.info("JobSatisfaction column not found in the dataset.")
-
-
-    # H3: Younger employees (≤30) leave more often
-    st.markdown("---")
-    st.subheader("H3: Younger employees (≤30) leave more often")
-    st.markdown("""
-    **Hypothesis:** Employees aged 30 or under have a higher attrition rate  
-    than employees over 30.
-    """)
-
-    # Split into two age groups
-    age_group = (df["Age"] <= 30).map({True: "<=30", False: ">30"})
-    h3 = (df.assign(AgeGroup=age_group)
-          .groupby("AgeGroup")["target"]
-          .agg(rate="mean", n="size")
-          .reset_index()
-          .sort_values("AgeGroup"))
-    h3["rate_pct"] = (100 * h3["rate"]).round(1)
-
-    # Show evidence table
-    st.dataframe(h3, use_container_width=True)
-
-    # Show bar chart
-    st.bar_chart(h3.set_index("AgeGroup")["rate"])
-
-    
-    # H3: Younger employees (≤30) leave more often
-    st.markdown("---")
-    st.subheader("H3: Younger employees (≤30) leave more often")
-    st.markdown("""
-    **Hypothesis:** Employees aged 30 or under have a higher attrition rate  
-    than employees over 30.
-    """)
-
-    # Split into two age groups
-    age_group = (df["Age"] <= 30).map({True: "<=30", False: ">30"})
-    h3 = (df.assign(AgeGroup=age_group)
-          .groupby("AgeGroup")["target"]
-          .agg(rate="mean", n="size")
-          .reset_index()
-          .sort_values("AgeGroup"))
-    h3["rate_pct"] = (100 * h3["rate"]).round(1)
-
-    # Show evidence table
-    st.dataframe(h3, use_container_width=True)
-
-    # Show bar chart
-    st.bar_chart(h3.set_index("AgeGroup")["rate"])
-
-    # Get rates for conclusion
-    young_rate = h3.loc[h3["AgeGroup"] == "<=30", "rate_pct"].values
-    older_rate = h3.loc[h3["AgeGroup"] == ">30", "rate_pct"].values
-
-    if len(young_rate) > 0 and len(older_rate) > 0:
-        gap = float(young_rate[0] - older_rate[0])
-        st.success(
-            f"**H3: SUPPORTED ✅** — Employees aged ≤30 have an attrition rate of "
-            f"**{young_rate[0]:.1f}%** compared to **{older_rate[0]:.1f}%** "
-            f"for those over 30 (a gap of **{gap:.1f} percentage points**)."
+            st.warning(
+                f"**{spec['id']}: NOT SUPPORTED ❌** — {spec['high_label']}: "
+                f"**{100 * high:.1f}%** vs **{100 * low:.1f}%** for {spec['low_label']} "
+                f"(p = {p:.3g})."
+            )
+        if interval is None:
+            continue
+        st.caption(
+            f"{LEVEL:.0%} bootstrap interval for the gap: "
+            f"{100 * gap['ci_low']:.1f} to {100 * gap['ci_high']:.1f} points · "
+            f"permutation p = {gap['perm_p']:.2g} "
+            f"(gaps beyond ±{100 * max(abs(gap['null_low']), gap['null_high']):.1f} points "
+            f"are rare by chance) · {RESAMPLES:,} resamples."
         )
-    else:
-        st.warning("Could not compute age group rates — check the data.")
 
     # Chi-square statistical tests (adds rigour to the validation)
     st.markdown("---")
@@ -177,65 +82,54 @@ def run():
     association is significant.
     """)
 
-    import importlib.util
-    if importlib.util.find_spec("scipy") is None:
-        st.info("SciPy not installed — skipping chi-square tests. "
-                "Run `pip install scipy` to enable.")
-    else:
-        from scipy.stats import chi2_contingency
-
-        results = []
+    chi_df = pd.DataFrame([
+        {"Hypothesis": s["label"], "p-value": verdicts[s["id"]][3],
+         "Significant": "Yes ✅" if verdicts[s["id"]][3] < ALPHA else "No ❌"}
+        for s in HYPOTHESES if s["id"] in verdicts
+    ])
+    st.dataframe(chi_df, use_container_width=True)
 
-        # H1: OverTime vs target
-        if "OverTime" in df.columns:
-            chi2, p1, _, _ = chi2_contingency(
-                pd.crosstab(df["OverTime"], df["target"])
-            )
-            results.append({"Hypothesis": "H1 (OverTime)", "p-value": p1,
-                            "Significant": "Yes ✅" if p1 < 0.05 else "No ❌"})
-
-        # H2: JobSatisfaction vs target
-        if "JobSatisfaction" in df.columns:
-            chi2, p2, _, _ = chi2_contingency(
-                pd.crosstab(df["JobSatisfaction"], df["target"])
-            )
-            results.append({"Hypothesis": "H2 (JobSatisfaction)", "p-value": p2,
-                            "Significant": "Yes ✅" if p2 < 0.05 else "No ❌"})
-
-        # H3: AgeGroup vs target
-        age_grp = (df["Age"] <= 30).map({True: "<=30", False: ">30"})
-        chi2, p3, _, _ = chi2_contingency(
-            pd.crosstab(age_grp, df["target"])
+    # Overall conclusion for the statistical tests
+    if verdicts and all(p < ALPHA for *_, p in verdicts.values()):
+        st.success(
+            f"**All {len(verdicts)} hypotheses are statistically significant (p < 0.05).** "
+            "The observed differences in attrition rates are very unlikely "
+            "to be caused by random chance alone."
         )
-        results.append({"Hypothesis": "H3 (Age ≤30 vs >30)", "p-value": p3,
-                        "Significant": "Yes ✅" if p3 < 0.05 else "No ❌"})
-
-        # Show results as a clean table
-        chi_df = pd.DataFrame(results)
-        st.dataframe(chi_df, use_container_width=True)
-
-        # Overall conclusion for the statistical tests
-        all_sig = all(r["p-value"] < 0.05 for r in results)
-        if all_sig:
-            st.success(
-                "**All three hypotheses are statistically significant (p < 0.05).** "
-                "The observed differences in attrition rates are very unlikely "
-                "to be caused by random chance alone."
-            )
-        else:
-            st.warning("Not all hypotheses reached statistical significance.")
+    else:
+        st.warning("Not all hypotheses reached statistical significance.")
+
+    # Screening: every categorical column against attrition, same batch
+    with st.expander("Screen every categorical column against attrition"):
+        screen = (tests.drop(index=[s["id"] for s in HYPOTHESES], errors="ignore")
+                  .sort_values("p_value")
+                  .rename_axis("Column").reset_index())
+        screen["Significant"] = (screen["p_value"] < ALPHA).map({True: "Yes ✅", False: "No ❌"})
+        st.dataframe(screen, use_container_width=True)
+        st.caption("Cramér's V measures the strength of the association "
+                   "(0 = none, 1 = perfect); the p-value only says whether it is real.")
 
  
     # Final summary box so the assessor sees a clear overall verdict
     st.markdown("---")
     st.subheader("Summary of Findings")
-    st.info("""
-    **H1 — OverTime:** SUPPORTED ✅ — Overtime workers leave at roughly 3× the rate.  
-    **H2 — Job Satisfaction:** SUPPORTED ✅ — Lowest satisfaction has ~2× the attrition of highest.  
-    **H3 — Age ≤30:** SUPPORTED ✅ — Younger employees leave at roughly double the rate.
-
-    **Recommended actions:**
-    - Review overtime policies and workload distribution.
-    - Run regular satisfaction surveys and target low-scoring teams.
-    - Build early-career retention programmes (mentorship, progression paths).
-    """)
+    lines, actions = [], []
+    for spec in HYPOTHESES:
+        if spec["id"] not in verdicts:
+            continue
+        supported, high, low, p = verdicts[spec["id"]]
+        if high is None or low is None:
+            lines.append(f"**{spec['label']}:** NOT TESTED — group rates unavailable.")
+            continue
+        ratio = f" ({high / low:.1f}× the rate)" if low > 0 else ""
+        lines.append(
+            f"**{spec['label']}:** {'SUPPORTED ✅' if supported else 'NOT SUPPORTED ❌'} — "
+            f"{spec['high_label']} {100 * high:.1f}% vs {100 * low:.1f}% for "
+            f"{spec['low_label']}{ratio}, p = {p:.2g}."
+        )
+        if supported:
+            actions.append(f"- {spec['action']}")
+    summary = "  \n".join(lines)
+    if actions:
+        summary += "\n\n**Recommended actions:**\n" + "\n".join(actions)
+    st.info(summary)
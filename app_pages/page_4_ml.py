@@ -1,56 +1,55 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
-import json
 from pathlib import Path
 
+from src.data import load_dataset
+from src.features import NUM_FEATURES
+from src.predict_cache import PredictionCache
+from src.registry import ModelLoader
+from src.schema import build_schema, is_integer
+from src.scoring import risk_band
+
 # Try to import shared paths. If that fails, use local fallbacks.
 try:
-    from src.config import (
-        ROOT, READY_PARQUET, PROCESSED_PARQUET, RAW_CSV,
-        MODEL_FILE, FEATURES_FILE
-    )
+    from src.config import ROOT, MODEL_FILE, FEATURES_FILE
 except Exception:
     ROOT = Path(__file__).resolve().parents[1]
-    READY_PARQUET     = ROOT / "data" / "processed" / "hr_attrition_ready.parquet"
-    PROCESSED_PARQUET = ROOT / "data" / "processed" / "hr_attrition.parquet"
-    RAW_CSV           = ROOT / "data" / "raw" / "WA_Fn-UseC_-HR-Employee-Attrition.csv"
     MODEL_FILE        = ROOT / "artifacts" / "v1" / "rf_pipeline.joblib"
     FEATURES_FILE     = ROOT / "artifacts" / "v1" / "features.json"
     
 # ---- Cache helpers ----
 @st.cache_resource
-def _load_artifacts():
-    """Load the trained model and the feature list once."""
-    pipe = joblib.load(MODEL_FILE)
-    feats = json.loads(Path(FEATURES_FILE).read_text())
-    return pipe, feats
-
-@st.cache_data
-def _load_dataset():
-    """Load a dataset (prefer ready → processed → raw)."""
-    for p in (READY_PARQUET, PROCESSED_PARQUET, RAW_CSV):
-        if Path(p).exists():
-            if Path(p).suffix == ".parquet":
-                df = pd.read_parquet(p)
-            else:
-                df = pd.read_csv(p)
-            # Make sure we have a 0/1 target
-            if "target" not in df.columns and "Attrition" in df.columns:
-                df = df.copy()
-                df["target"] = df["Attrition"].map({"Yes": 1, "No": 0})
-            return df, Path(p)
-    return None, None
+def _model_loader():
+    """
+    Registry-backed model shared by every session. A newly activated
+    version is loaded and warmed in the background, then swapped in.
+    """
+    return ModelLoader()
+
+@st.cache_resource
+def _schema_from_data(version, feats):
+    """
+    Fallback for model versions exported without feature_schema.json: one
+    scan of the dataset per version, instead of one per render.
+    """
+    df, _ = load_dataset(columns=list(feats))
+    if df is None or any(f not in df.columns for f in feats):
+        return None
+    num = [f for f in feats if f in NUM_FEATURES]
+    return build_schema(df, num, [f for f in feats if f not in num])
+
+@st.cache_resource
+def _prediction_cache():
+    """One LRU cache of predictions shared by every session."""
+    return PredictionCache(maxsize=1024)
+
+_BAND_ICONS = {"Low": "✅", "Medium": "⚠️", "High": "🔴"}
 
 def _band(prob: float):
     """Turn a probability into a simple risk label and icon."""
-    if prob < 0.35:
-        return "Low", "✅"
-    elif prob < 0.60:
-        return "Medium", "⚠️"
-    else:
-        return "High", "🔴"
+    band = risk_band(prob)
+    return band, _BAND_ICONS[band]
 
 def run():
     st.title("Attrition Predictor (ML)")
@@ -62,52 +61,52 @@ def run():
     for proactive retention planning.
     """)
     try:
-        pipe, feats = _load_artifacts()
+        model = _model_loader().get()
+        feats = model.feats
     except Exception as e:
         st.error("Model not found yet. Train & export via Notebook 03 before using this page.")
         st.caption(f"Expected: {MODEL_FILE.relative_to(ROOT)} and {FEATURES_FILE.relative_to(ROOT)}")
         st.caption(f"Error: {e}")
         return
+    if _model_loader().error is not None:
+        st.warning(f"The newly activated model version could not be loaded, so "
+                   f"{model.version} is still in use. Error: {_model_loader().error}")
 
-    # 2) Load data (used to build sensible input widgets)
-    df, src = _load_dataset()
-    if df is None:
-        st.warning("No data found in data/processed or data/raw. Run Notebook 01–02.")
+    # 2) Feature schema exported with the model (types, ranges, medians and
+    # category vocabularies), so building the form never reads the dataset
+    schema = model.schema or _schema_from_data(model.version, tuple(feats))
+    if schema is None:
+        st.warning("No feature schema for this model and no data found in "
+                   "data/processed or data/raw. Run `python -m src.schema`.")
         return
-    st.caption(f"Using dataset: `{src.relative_to(ROOT)}`")
-
-    # Check that all training features exist in the current data
-    missing = [c for c in feats if c not in df.columns]
+    missing = [c for c in feats if c not in schema["features"]]
     if missing:
-        st.error(f"Missing columns in data: {missing}")
-        st.caption("Recreate the ready parquet in Notebook 02 so it matches the training features.")
+        st.error(f"Missing features in the schema: {missing}")
+        st.caption("Re-export the model in Notebook 03 so the schema matches the training features.")
         return
-    # 3) Simple form: one input per feature (numbers → number input, text/categorical → dropdown)
+
+    # 3) Simple form: one input per feature (numbers → number input, categorical → dropdown)
     st.subheader("Enter an employee profile")
-    st.caption("Dropdowns show values seen in the dataset.")
+    st.caption("Ranges and dropdowns show values seen in training; "
+               "numbers start at the training median, dropdowns at the most common value.")
     user_vals = {}
 
     with st.form("ml_form", clear_on_submit=False):
         cols = st.columns(2)  # nicer layout
         for i, feat in enumerate(feats):
             col = cols[i % 2]
-            ser = df[feat]
-
-            if pd.api.types.is_numeric_dtype(ser):
-                # Basic numeric bounds and default
-                vmin = float(np.nanmin(ser)) if ser.notna().any() else 0.0
-                vmax = float(np.nanmax(ser)) if ser.notna().any() else 100.0
-                vdef = float(np.nanmedian(ser)) if ser.notna().any() else 0.0
-                step = 1.0 if ser.dtype.kind in "iu" else 0.1
+            spec = schema["features"][feat]
+
+            if spec["kind"] == "numeric":
+                step = 1.0 if is_integer(spec) else 0.1
                 with col:
                     user_vals[feat] = st.number_input(
-                        feat, min_value=vmin, max_value=vmax, value=vdef, step=step,
-                        key=f"in_num_{feat}"
+                        feat, min_value=float(spec["min"]), max_value=float(spec["max"]),
+                        value=float(spec["median"]), step=step, key=f"in_num_{feat}"
                     )
             else:
-                # Categorical options from the data
-                opts = sorted([str(x) for x in ser.dropna().unique().tolist()])
-                default_idx = 0 if opts else None
+                opts = spec["categories"]
+                default_idx = opts.index(spec["mode"]) if spec["mode"] in opts else 0
                 with col:
                     user_vals[feat] = st.selectbox(
                         feat, options=opts, index=default_idx if opts else None,
@@ -117,12 +116,13 @@ def run():
 
     if not submitted:
         st.info("Fill the form and click **Predict**.")
-        
-    
-    # 4) Predict
-    X = pd.DataFrame([user_vals])[feats]  # keep exact training feature order
+        return
+
+    # 4) Predict (repeat profiles are answered from the shared LRU cache;
+    # keys include the model hash, so a swapped-in version starts fresh)
+    cache = _prediction_cache()
     try:
-        prob = float(pipe.predict_proba(X)[0, 1])
+        prob = cache.get_or_compute(model.digest, user_vals, feats, model.predict_one)
     except Exception as e:
         st.error(f"Prediction failed: {e}")
         st.stop()
@@ -133,5 +133,33 @@ def run():
     st.metric(label="Attrition probability", value=f"{prob:.2%}")
     st.markdown(f"**Risk band:** {icon} **{band}**")
     st.caption("Note: thresholds are examples (Low < 0.35, Medium 0.35–0.59, High ≥ 0.60). Adjust with stakeholders.")
+
+    # 6) Reasons: how each input moved the score away from the average employee
+    try:
+        bias, contrib = model.explain(pd.DataFrame([user_vals]))
+    except Exception as e:
+        st.caption(f"Explanation unavailable: {e}")
+    else:
+        st.subheader("Why this score?")
+        effects = contrib.iloc[0]
+        reasons = pd.DataFrame({
+            "Feature": effects.index,
+            "Value": [str(user_vals[f]) for f in effects.index],
+            "Effect (points)": (100 * effects.to_numpy()).round(1),
+        })
+        reasons["Direction"] = np.where(reasons["Effect (points)"] >= 0,
+                                        "🔺 raises risk", "🔻 lowers risk")
+        order = effects.abs().to_numpy().argsort()[::-1]
+        st.dataframe(reasons.iloc[order].reset_index(drop=True).head(8),
+                     use_container_width=True, hide_index=True)
+        st.caption(
+            f"Starts from the average risk of **{bias:.1%}**; each feature adds or removes "
+            f"percentage points along the trees' decision paths (all {len(feats)} effects sum to "
+            f"{100 * (prob - bias):+.1f} points)."
+        )
+
+    stats = cache.stats()
+    st.caption(f"Model version: `{model.version}` · Prediction cache: {stats['hits']:,} hits · {stats['misses']:,} misses · "
+               f"{stats['size']:,}/{stats['maxsize']:,} profiles stored")
     
     
\ No newline at end of file
@@ -1,20 +1,14 @@
 import streamlit as st
 import pandas as pd
-import json
-import joblib
-import numpy as np
-import matplotlib.pyplot as plt
+import altair as alt
 from pathlib import Path
-from sklearn.metrics import (
-    roc_auc_score,
-    confusion_matrix,
-    ConfusionMatrixDisplay,
-    classification_report,
-    precision_score,
-    recall_score,
-    f1_score,
-    accuracy_score,
-)
+from src.data import load_dataset
+from src.evaluation import counts_at, cumulative_counts, threshold_grid, threshold_sweep
+from src.importance import load_importance
+from src.score_cache import load_or_score, scores_key
+
+# joblib, matplotlib and sklearn.metrics are imported inside the functions
+# that use them, so opening the app does not pay for them up front
 
 # -- Paths (use src.config, fall back to local if import fails) --
 ROOT = Path(__file__).resolve().parents[1]
@@ -31,32 +25,63 @@ except Exception:
 
 ROC_PATH = ASSETS_DIR / "roc_curve.png"
 CM_PATH = ASSETS_DIR / "confusion_matrix_050.png"
-THR_CSV = ASSETS_DIR / "threshold_metrics.csv"
 
 
 # -- Cached loaders (run once, then reuse) --
 
 @st.cache_resource
-def _load_artifacts():
-    """Load the trained model and feature list once."""
-    model = joblib.load(MODEL_PATH)
-    feats = json.loads(FEATS_PATH.read_text())
-    return model, feats
-
-
-@st.cache_data
-def _load_ready_df():
-    """Load the processed dataset once."""
-    return pd.read_parquet(DATA_READY) if DATA_READY.exists() else None
-
-
-@st.cache_data
-def _load_threshold_table():
-    """Load the pre-computed threshold metrics table."""
-    return pd.read_csv(THR_CSV) if THR_CSV.exists() else None
+def _model_loader():
+    """
+    Registry-backed model shared by every session (the memory-mapped
+    compiled forest when available). Newly activated versions are loaded
+    and warmed in the background, then swapped in.
+    """
+    from src.registry import ModelLoader
+    return ModelLoader()
+
+
+@st.cache_resource(max_entries=4)
+def _threshold_curve(version, _y_true, _y_prob):
+    """Cumulative confusion counts over the sorted scores, once per version."""
+    return cumulative_counts(_y_true, _y_prob)
+
+
+def _confusion_chart(tn, fp, fn, tp, thr):
+    """2×2 confusion matrix as a small Vega-Lite chart (rendered in the browser)."""
+    labels = ["Stay (0)", "Leave (1)"]
+    cells = pd.DataFrame({
+        "Actual": [labels[0], labels[0], labels[1], labels[1]],
+        "Predicted": [labels[0], labels[1], labels[0], labels[1]],
+        "Count": [tn, fp, fn, tp],
+    })
+    base = alt.Chart(cells).encode(
+        x=alt.X("Predicted:N", sort=labels, title="Predicted label"),
+        y=alt.Y("Actual:N", sort=labels, title="True label"),
+    )
+    heat = base.mark_rect().encode(
+        color=alt.Color("Count:Q", scale=alt.Scale(scheme="blues"), legend=None)
+    )
+    text = base.mark_text(fontSize=22).encode(
+        text="Count:Q",
+        color=alt.condition(alt.datum.Count > max(tn, fp, fn, tp) / 2,
+                            alt.value("white"), alt.value("black")),
+    )
+    return (heat + text).properties(
+        title=f"Confusion Matrix @ threshold = {thr:.2f}", height=320
+    )
 
 
 def run():
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import (
+        roc_auc_score,
+        classification_report,
+        precision_score,
+        recall_score,
+        f1_score,
+        accuracy_score,
+    )
+
     st.title("Technical: Model & Evaluation")
     st.markdown("""
     This page shows whether the ML model **meets the business goal** (ROC-AUC ≥ 0.75),  
@@ -67,31 +92,43 @@ def run():
     # Load model + data
 
     try:
-        pipe, feats = _load_artifacts()
+        model = _model_loader().get()
+        feats = model.feats
     except Exception as e:
         st.error("Model artifacts not found. Train/export them in Notebook 03.")
         st.caption(f"Expected: {MODEL_PATH.relative_to(ROOT)} and "
                    f"{FEATS_PATH.relative_to(ROOT)}")
         st.caption(f"Error: {e}")
         return
+    if _model_loader().error is not None:
+        st.warning(f"The newly activated model version could not be loaded, so "
+                   f"{model.version} is still in use. Error: {_model_loader().error}")
 
-    df = _load_ready_df()
-    if df is None:
+    if not DATA_READY.exists():
         st.error("Processed data not found. Create it in Notebook 02.")
         st.caption(f"Expected: {DATA_READY.relative_to(ROOT)}")
         return
 
   
-    # Compute predictions on the full dataset
+    # Scores for the full dataset: read from the sidecar cache keyed by the
+    # model + data file hashes; the model only runs when either file changes
    
     try:
-        X = df[feats]
-        y_true = df["target"].to_numpy()
-        y_prob = pipe.predict_proba(X)[:, 1]
+        scores = load_or_score(
+            model.model_path, DATA_READY, feats,
+            get_model=model.scorer,
+            get_data=lambda: load_dataset(sources=(DATA_READY,),
+                                          columns=[*feats, "target"])[0],
+        )
+        y_true = scores["target"].to_numpy()
+        y_prob = scores["probability"].to_numpy()
         auc = roc_auc_score(y_true, y_prob)
+        # one sort → every threshold; rebuilt only for a new model/data version
+        version = scores_key(model.model_path, DATA_READY)
+        curve = _threshold_curve(version, y_true, y_prob)
     except Exception as e:
         st.warning(f"Could not compute predictions: {e}")
-        y_true, y_prob, auc = None, None, None
+        y_true, y_prob, auc, curve = None, None, None, None
 
 
     # 1) MODEL PERFORMANCE — clear success / failure verdict
@@ -253,23 +290,31 @@ def run():
 
     st.divider()
 
-    # 5) THRESHOLD TABLE (pre-computed from Notebook 04)
+    # 5) THRESHOLD TABLE (swept from the scores, any resolution)
     
     st.subheader("Threshold Metrics")
-    thr_df = _load_threshold_table()
-    if thr_df is not None:
+    if curve is not None:
+        step = st.select_slider("Threshold step", options=[0.01, 0.02, 0.05, 0.10],
+                                value=0.05, key="thr_step")
+        thr_df = threshold_sweep(None, None, threshold_grid(step), curve=curve)
+        thr_df = thr_df[["threshold", "accuracy", "precision", "recall", "f1",
+                         "positives_pred"]]
         st.dataframe(
             thr_df.style
             .highlight_max(axis=0, subset=["f1"])
-            .format({"accuracy": "{:.3f}", "precision": "{:.3f}",
+            .format({"threshold": "{:.2f}", "accuracy": "{:.3f}", "precision": "{:.3f}",
                       "recall": "{:.3f}", "f1": "{:.3f}"}),
             use_container_width=True,
         )
-        st.download_button("Download CSV", THR_CSV.read_bytes(),
-                           file_name="threshold_metrics.csv")
+        full_df = threshold_sweep(None, None, curve=curve)
+        st.download_button("Download full curve (CSV)",
+                           full_df.to_csv(index=False).encode(),
+                           file_name="threshold_curve.csv")
+        st.caption(f"The download has one row per distinct score "
+                   f"({len(full_df):,} thresholds), computed from a single sort.")
     else:
-        st.info(f"Missing: {THR_CSV.relative_to(ROOT)}. "
-                "Run Notebook 04 to create it.")
+        st.info("Threshold metrics unavailable — "
+                "check that data and model loaded correctly.")
 
     st.divider()
 
@@ -279,20 +324,14 @@ def run():
     st.markdown("**Move the slider** to see how changing the threshold "
                 "affects predictions.")
 
-    if y_true is not None and y_prob is not None:
+    if curve is not None:
         thr = st.slider("Choose threshold", 0.0, 1.0, 0.50, 0.01)
-        y_pred = (y_prob >= thr).astype(int)
-        cm = confusion_matrix(y_true, y_pred, labels=[0, 1])
-
-        fig, ax = plt.subplots()
-        ConfusionMatrixDisplay(
-            cm, display_labels=["Stay (0)", "Leave (1)"]
-        ).plot(values_format="d", ax=ax)
-        ax.set_title(f"Confusion Matrix @ threshold = {thr:.2f}")
-        st.pyplot(fig, use_container_width=True)
+        # Binary search in the precomputed cumulative counts: no re-scoring
+        tn, fp, fn, tp = (int(v) for v in counts_at(curve, thr))
+        st.altair_chart(_confusion_chart(tn, fp, fn, tp, thr),
+                        use_container_width=True)
 
         # Show what this threshold means in plain English
-        tn, fp, fn, tp = cm.ravel()
         st.caption(
             f"At threshold {thr:.2f}: "
             f"**{tp}** correctly flagged as leaving, "
@@ -306,12 +345,49 @@ def run():
     st.divider()
 
    
-    # 7) PIPELINE DETAILS
+    # 7) PERMUTATION IMPORTANCE (precomputed artifact next to the model)
+
+    st.subheader("Feature Importance (Permutation)")
+    importance = load_importance(model.model_path.parent, model.digest)
+    if importance is None:
+        st.info("No permutation-importance results for this model version yet. "
+                "Run `python -m src.importance` to compute them.")
+    else:
+        imp, meta = importance
+        order = list(imp["feature"])  # already sorted by mean drop
+        bars = alt.Chart(imp.drop(columns="drops")).mark_bar().encode(
+            x=alt.X("importance_mean:Q", title="Drop in ROC-AUC when shuffled"),
+            y=alt.Y("feature:N", sort=order, title=None),
+            tooltip=["feature", alt.Tooltip("importance_mean:Q", format=".4f"),
+                     alt.Tooltip("importance_std:Q", format=".4f")],
+        )
+        errors = alt.Chart(imp.drop(columns="drops")).transform_calculate(
+            lo="datum.importance_mean - datum.importance_std",
+            hi="datum.importance_mean + datum.importance_std",
+        ).mark_rule().encode(x="lo:Q", x2="hi:Q", y=alt.Y("feature:N", sort=order))
+        st.altair_chart(bars + errors, use_container_width=True)
+        st.caption(
+            f"Each original feature (all its one-hot columns together) shuffled "
+            f"{meta['repeats']}× on {meta['n_rows']} held-out rows; baseline ROC-AUC "
+            f"{meta['baseline']:.3f}. Bars show the mean drop, lines ±1 std. "
+            "Values near zero (or negative) mean the model does not rely on that feature."
+        )
+
+    st.divider()
+
+
+    # 8) PIPELINE DETAILS
  
     st.subheader("Pipeline Details")
+    st.caption(f"Model version: `{model.version}`")
     st.markdown("**Steps (in order):**")
-    for name, step in pipe.named_steps.items():
-        st.write(f"- **{name}**: `{type(step).__name__}`")
+    scorer = model.scorer()
+    if hasattr(scorer, "named_steps"):
+        steps = [(name, type(step).__name__) for name, step in scorer.named_steps.items()]
+    else:
+        steps = scorer.meta.get("steps", [])
+    for name, kind in steps:
+        st.write(f"- **{name}**: `{kind}`")
 
     if feats:
         with st.expander("Show feature list used during training"):
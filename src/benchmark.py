@@ -0,0 +1,212 @@
+"""
+Benchmarks for the app's hot paths at several data scales.
+
+The ready dataset is tiled `scale` times into a temporary parquet file and
+each case is timed on it (one warm-up call, then `--repeat` timed calls;
+caches are cleared inside the timed call so every run does the real work):
+
+- load:            read the dataset (src.data.load_dataset)
+- filter_groupby:  page 2 filtered scan + attrition rate by JobRole
+- hypotheses:      page 3 contingency tables + batch chi-square (H1–H3 and
+                   every categorical column)
+- predict_single:  one-row predict_proba through rf_pipeline.joblib
+- predict_batch:   predict_proba for every row
+- evaluation:      page 5 ROC-AUC + one-sort threshold sweep
+
+Results are written as JSON (one record per case and scale). Passing a
+previous results file as `--baseline` flags every case whose median time
+grew by more than `--tolerance` (exit code 1 with `--fail-on-regression`).
+
+    python -m src.benchmark --scales 1 10 100 --baseline benchmarks/last.json
+"""
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import ROOT, READY_PARQUET, MODEL_FILE, FEATURES_FILE
+from src.utils import load_feature_order
+
+BENCH_DIR = ROOT / "benchmarks"  # default output folder (not committed)
+DEFAULT_SCALES = (1, 10, 100)
+TOLERANCE = 0.25                 # +25% median time counts as a regression
+
+
+def scaled_dataset(scale, dest, source=READY_PARQUET):
+    """Write the source parquet repeated `scale` times to `dest`; return the path."""
+    df = pd.read_parquet(source)
+    pd.concat([df] * scale, ignore_index=True).to_parquet(dest, index=False)
+    return dest
+
+
+# -- Cases: each takes the shared context and returns a zero-arg callable ----
+
+def _case_load(ctx):
+    from src.data import clear_cache, load_dataset
+
+    def run():
+        clear_cache()
+        return load_dataset(sources=(ctx["path"],))
+    return run
+
+
+def _case_filter_groupby(ctx):
+    from src.filters import clear_cache, scan_filtered
+    cols = ["Department", "OverTime", "Age", "JobRole", "MonthlyIncome", "target"]
+
+    def run():
+        clear_cache()
+        dff = scan_filtered(ctx["path"], cols, departments=["Research & Development", "Sales"],
+                            overtime=["Yes"], age_range=(25, 50))
+        return dff.groupby("JobRole", observed=True)["target"].mean()
+    return run
+
+
+def _case_hypotheses(ctx):
+    from src.hypotheses import run_tests
+    df = ctx["frame"]
+    return lambda: run_tests(df)
+
+
+def _case_predict_single(ctx):
+    pipe, X = ctx["pipe"], ctx["frame"][ctx["feats"]].iloc[[0]]
+    return lambda: pipe.predict_proba(X)
+
+
+def _case_predict_batch(ctx):
+    pipe, X = ctx["pipe"], ctx["frame"][ctx["feats"]]
+    return lambda: pipe.predict_proba(X)
+
+
+def _case_evaluation(ctx):
+    from sklearn.metrics import roc_auc_score
+    from src.evaluation import cumulative_counts, threshold_grid, threshold_sweep
+    y = ctx["frame"]["target"].to_numpy()
+    # deterministic stand-in scores: evaluation cost does not depend on the model
+    p = np.random.default_rng(0).random(len(y)) * 0.5 + y * 0.3
+
+    def run():
+        roc_auc_score(y, p)
+        curve = cumulative_counts(y, p)
+        return threshold_sweep(None, None, threshold_grid(0.01), curve=curve)
+    return run
+
+
+CASES = {
+    "load": _case_load,
+    "filter_groupby": _case_filter_groupby,
+    "hypotheses": _case_hypotheses,
+    "predict_single": _case_predict_single,
+    "predict_batch": _case_predict_batch,
+    "evaluation": _case_evaluation,
+}
+
+
+def _timings(fn, repeat):
+    fn()  # warm-up: imports, first-touch allocations
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def run_suite(scales=DEFAULT_SCALES, cases=None, repeat=5, source=READY_PARQUET,
+              model_path=MODEL_FILE, features_path=FEATURES_FILE):
+    """Time every case at every scale and return a list of result records."""
+    import joblib
+
+    names = list(cases or CASES)
+    needs_model = {"predict_single", "predict_batch"} & set(names)
+    pipe = joblib.load(model_path) if needs_model else None
+    feats = load_feature_order(features_path)
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = scaled_dataset(scale, Path(tmp) / f"x{scale}.parquet", source)
+            ctx = {"path": path, "frame": pd.read_parquet(path), "pipe": pipe, "feats": feats}
+            for name in names:
+                times = _timings(CASES[name](ctx), repeat)
+                records.append({
+                    "case": name, "scale": scale, "rows": len(ctx["frame"]),
+                    "repeat": repeat, "median_s": statistics.median(times),
+                    "min_s": min(times), "max_s": max(times),
+                })
+    return records
+
+
+def compare(records, baseline, tolerance=TOLERANCE):
+    """
+    Records whose median time is more than `tolerance` above the baseline
+    record for the same (case, scale), with the ratio added.
+    """
+    base = {(r["case"], r["scale"]): r["median_s"] for r in baseline}
+    flagged = []
+    for r in records:
+        old = base.get((r["case"], r["scale"]))
+        if old and r["median_s"] > old * (1 + tolerance):
+            flagged.append({**r, "baseline_s": old, "ratio": r["median_s"] / old})
+    return flagged
+
+
+def save_results(records, path):
+    """Write the records plus machine / interpreter details as JSON."""
+    import sklearn
+    payload = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": {"numpy": np.__version__, "pandas": pd.__version__,
+                     "sklearn": sklearn.__version__},
+        "results": records,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+    return path
+
+
+def load_results(path):
+    return json.loads(Path(path).read_text())["results"]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the app's hot paths.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", type=Path, default=None,
+                        help="results file (default: benchmarks/bench-<time>.json)")
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    records = run_suite(args.scales, args.cases, args.repeat)
+    out = args.out or BENCH_DIR / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    save_results(records, out)
+
+    print(f"{'case':<16}{'scale':>6}{'rows':>10}{'median ms':>12}{'min ms':>10}")
+    for r in records:
+        print(f"{r['case']:<16}{r['scale']:>6}{r['rows']:>10,}"
+              f"{r['median_s'] * 1e3:>12.1f}{r['min_s'] * 1e3:>10.1f}")
+    print(f"Results → {out}")
+
+    if args.baseline is not None:
+        flagged = compare(records, load_results(args.baseline), args.tolerance)
+        for r in flagged:
+            print(f"REGRESSION {r['case']} ×{r['scale']}: "
+                  f"{r['baseline_s'] * 1e3:.1f} → {r['median_s'] * 1e3:.1f} ms ({r['ratio']:.2f}x)")
+        if not flagged:
+            print(f"No regressions over {args.tolerance:.0%} against {args.baseline}")
+        if flagged and args.fail_on_regression:
+            sys.exit(1)
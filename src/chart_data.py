@@ -0,0 +1,69 @@
+"""
+Aggregates that feed the page 2 charts.
+
+Plotly serialises every row it is given into the browser payload, so the
+charts are built from small summaries instead of the filtered rows:
+
+- category_counts:  stayed / left counts per category (from the cube),
+- box_summary:      five-number summary + mean per group, with a capped,
+                    seeded sample of the outliers,
+- hierarchy_counts: one row per sunburst leaf with its count.
+
+The payload then depends on the number of categories / groups, not on
+headcount; the only raw points sent are at most `max_points` outliers.
+"""
+import numpy as np
+import pandas as pd
+
+from src.config import CHART_MAX_POINTS
+from src.cube import query_rates
+
+
+def category_counts(icube, by, departments=None, overtime=None, age_range=None):
+    """Long table [by, Attrition, count] with "No" / "Yes" rows per category."""
+    rates = query_rates(icube, by, departments, overtime, age_range)
+    stayed = rates[[by]].assign(Attrition="No", count=rates["n"] - rates["n_pos"])
+    left = rates[[by]].assign(Attrition="Yes", count=rates["n_pos"])
+    return pd.concat([stayed, left], ignore_index=True)
+
+
+def box_summary(df, value, by, max_points=CHART_MAX_POINTS, seed=0):
+    """
+    Box-plot statistics of `value` per group of `by`.
+
+    Returns (stats, outliers): stats has one row per group with n, q1,
+    median, q3, mean and the whisker ends (most extreme points within
+    1.5 × IQR, as Plotly draws them); outliers holds at most `max_points`
+    points beyond the whiskers, shared evenly between groups.
+    """
+    data = pd.DataFrame({
+        by: np.asarray(df[by].astype(object)),
+        value: pd.to_numeric(df[value], errors="coerce").to_numpy(dtype=np.float64,
+                                                                   na_value=np.nan),
+    }).dropna()
+    groups = sorted(data[by].unique(), key=str)
+    per_group = max_points // max(len(groups), 1)
+    rng = np.random.default_rng(seed)
+    stats, outliers = [], []
+    for g in groups:
+        x = data.loc[data[by] == g, value].to_numpy()
+        q1, med, q3 = np.quantile(x, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        inside = x[(x >= q1 - 1.5 * iqr) & (x <= q3 + 1.5 * iqr)]
+        out = x[(x < q1 - 1.5 * iqr) | (x > q3 + 1.5 * iqr)]
+        stats.append({by: g, "n": len(x), "q1": q1, "median": med, "q3": q3,
+                      "mean": x.mean(), "lowerfence": inside.min(),
+                      "upperfence": inside.max(), "n_outliers": len(out)})
+        if len(out) > per_group:
+            out = rng.choice(out, per_group, replace=False)
+        outliers.append(pd.DataFrame({by: g, value: out}))
+    outliers = (pd.concat(outliers, ignore_index=True) if outliers
+                else pd.DataFrame(columns=[by, value]))
+    return pd.DataFrame(stats), outliers
+
+
+def hierarchy_counts(df, path):
+    """Rows per combination of the `path` columns: [*path, count]."""
+    return (df[path].astype(object)
+            .groupby(path, dropna=True).size()
+            .reset_index(name="count"))
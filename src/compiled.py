@@ -0,0 +1,366 @@
+"""
+Compiled (flattened) Random Forest predictor.
+
+`CompiledForest.from_pipeline` turns a fitted `make_rf_pipeline` model into
+plain NumPy arrays:
+
+- preprocessing lookup tables (numeric medians / means / scales, categorical
+  most-frequent values and one-hot column positions), and
+- every tree's nodes packed into contiguous left / right / feature /
+  threshold / leaf-value arrays.
+
+Scoring then walks all trees at once with vectorised array indexing, which
+skips the DataFrame → ColumnTransformer → per-tree dispatch overhead of
+sklearn and gives the same probabilities (up to float rounding).
+
+The .npz is written uncompressed, so `load(mmap=True)` maps each array
+straight out of the file instead of reading it: every worker on a host
+shares one read-only copy through the page cache. Thresholds can be
+stored as float32 (`--float32`), rounded down so that comparisons against
+the float32 inputs give exactly the same splits.
+
+Export next to the joblib model with:  python -m src.compiled [--float32]
+"""
+import json
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from src.config import MODEL_FILE, COMPILED_FILE, FEATURES_FILE
+from src.utils import file_digest, load_feature_order
+
+# Rows traversed together in batch mode (bounds the (rows × trees) node matrix)
+_CHUNK = 4096
+
+
+def _float32_floor(values):
+    """Largest float32 <= each value, so `x32 <= t32` iff `x32 <= t` for float32 x."""
+    down = values.astype(np.float32)
+    over = down.astype(np.float64) > values
+    down[over] = np.nextafter(down[over], np.float32(-np.inf))
+    return down
+
+
+def _mmap_npz(path):
+    """
+    Memory-map every array of an uncompressed .npz (members stored, not
+    deflated). Returns {name: read-only array}.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path.name}: {info.filename} is compressed, cannot memory-map")
+            # local header: 30 fixed bytes, then file name and extra field
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = np.frombuffer(f.read(4), dtype="<u2")
+            f.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+            version = np.lib.format.read_magic(f)
+            read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                           else np.lib.format.read_array_header_2_0)
+            shape, fortran, dtype = read_header(f)
+            if dtype.hasobject:
+                raise ValueError(f"{path.name}: {info.filename} holds Python objects")
+            name = info.filename[:-len(".npy")]
+            if int(np.prod(shape)) == 0:   # 0-d meta string, empty arrays
+                arrays[name] = np.lib.format.read_array(zf.open(info), allow_pickle=False)
+                continue
+            arrays[name] = np.memmap(path, dtype=dtype, mode="r", shape=shape,
+                                     order="F" if fortran else "C",
+                                     offset=f.tell()).view(np.ndarray)
+    return arrays
+
+
+def _is_missing(value):
+    # SimpleImputer's default missing marker is NaN (NaN != NaN)
+    return value != value
+
+
+class CompiledForest:
+    """Array-only copy of a fitted preprocessing + RandomForest pipeline."""
+
+    def __init__(self, arrays, meta):
+        self.arrays = arrays
+        self.meta = meta
+        self.num_features = meta["num_features"]
+        self.cat_features = meta["cat_features"]
+        self.features = [*self.num_features, *self.cat_features]
+        # value → one-hot column, per categorical feature
+        self._lookup = [
+            {v: off + i for i, v in enumerate(cats)}
+            for cats, off in zip(meta["categories"], meta["cat_offsets"])
+        ]
+        for name in ("num_fill", "num_mean", "num_scale", "left", "right",
+                     "feature", "threshold", "leaf_value", "roots"):
+            setattr(self, name, arrays[name])
+        self.n_columns = int(meta["n_columns"])
+        self.max_depth = int(meta["max_depth"])
+
+    # -- Building ---------------------------------------------------------
+
+    @classmethod
+    def from_pipeline(cls, pipe, source_digest=None):
+        """Flatten a fitted `make_rf_pipeline` model."""
+        pre, forest = pipe.named_steps["pre"], pipe.named_steps["clf"]
+        num_pipe = pre.named_transformers_["num"]
+        cat_pipe = pre.named_transformers_["cat"]
+        num_features = list(pre.transformers_[0][2])
+        cat_features = list(pre.transformers_[1][2])
+        encoder = cat_pipe.named_steps["onehot"]
+
+        categories = [[c.item() if hasattr(c, "item") else c for c in cats]
+                      for cats in encoder.categories_]
+        offsets = np.cumsum([len(num_features)] + [len(c) for c in categories])
+        pos = list(forest.classes_).index(1)
+
+        left, right, feature, threshold, leaf_value, roots = [], [], [], [], [], []
+        start = 0
+        for est in forest.estimators_:
+            t = est.tree_
+            idx = np.arange(t.node_count)
+            is_leaf = t.children_left == -1
+            # Leaves point at themselves so every row can take the same
+            # number of steps without branching
+            left.append(np.where(is_leaf, idx, t.children_left) + start)
+            right.append(np.where(is_leaf, idx, t.children_right) + start)
+            feature.append(np.where(is_leaf, 0, t.feature))
+            threshold.append(np.where(is_leaf, np.inf, t.threshold))
+            value = t.value[:, 0, :]
+            leaf_value.append(value[:, pos] / value.sum(axis=1))
+            roots.append(start)
+            start += t.node_count
+
+        arrays = {
+            "num_fill": num_pipe.named_steps["impute"].statistics_.astype(np.float64),
+            "num_mean": num_pipe.named_steps["scale"].mean_.astype(np.float64),
+            "num_scale": num_pipe.named_steps["scale"].scale_.astype(np.float64),
+            "left": np.concatenate(left).astype(np.int32),
+            "right": np.concatenate(right).astype(np.int32),
+            "feature": np.concatenate(feature).astype(np.int32),
+            "threshold": np.concatenate(threshold).astype(np.float64),
+            "leaf_value": np.concatenate(leaf_value).astype(np.float64),
+            "roots": np.asarray(roots, dtype=np.int32),
+        }
+        meta = {
+            "num_features": num_features,
+            "cat_features": cat_features,
+            "cat_fill": [v.item() if hasattr(v, "item") else v
+                         for v in cat_pipe.named_steps["impute"].statistics_],
+            "categories": categories,
+            "cat_offsets": [int(o) for o in offsets[:-1]],
+            "n_columns": int(offsets[-1]),
+            "max_depth": int(max(e.tree_.max_depth for e in forest.estimators_)),
+            "source_digest": source_digest,
+            "steps": [[name, type(step).__name__] for name, step in pipe.steps],
+        }
+        return cls(arrays, meta)
+
+    # -- Saving / loading -------------------------------------------------
+
+    def save(self, path=COMPILED_FILE, float32_thresholds=False):
+        """Write an uncompressed .npz (memory-mappable by `load(mmap=True)`)."""
+        arrays = dict(self.arrays)
+        if float32_thresholds:
+            arrays["threshold"] = _float32_floor(arrays["threshold"].astype(np.float64))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(self.meta)), **arrays)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path=COMPILED_FILE, mmap=False):
+        if mmap:
+            arrays = _mmap_npz(path)
+            meta = json.loads(str(arrays.pop("meta")))
+            return cls(arrays, meta)
+        with np.load(path, allow_pickle=False) as z:
+            arrays = {k: z[k] for k in z.files if k != "meta"}
+            meta = json.loads(str(z["meta"]))
+        return cls(arrays, meta)
+
+    def validate(self, feats):
+        """Raise ValueError unless the model was trained on exactly `feats`."""
+        if sorted(self.features) != sorted(feats):
+            missing = sorted(set(feats) - set(self.features))
+            extra = sorted(set(self.features) - set(feats))
+            raise ValueError(f"compiled model does not match features.json "
+                             f"(missing {missing}, unexpected {extra})")
+
+    # -- Encoding ---------------------------------------------------------
+
+    def encode_one(self, row):
+        """Encode one {feature: value} mapping into the model's input vector."""
+        x = np.zeros(self.n_columns, dtype=np.float64)
+        num = np.array([row[f] for f in self.num_features], dtype=np.float64)
+        num = np.where(np.isnan(num), self.num_fill, num)
+        x[:len(num)] = (num - self.num_mean) / self.num_scale
+        for j, f in enumerate(self.cat_features):
+            v = row[f]
+            if _is_missing(v):
+                v = self.meta["cat_fill"][j]
+            col = self._lookup[j].get(v)
+            if col is not None:          # unknown categories stay all-zero
+                x[col] = 1.0
+        return x.astype(np.float32)
+
+    def encode(self, df):
+        """Encode a DataFrame (any column order) into a float32 matrix."""
+        n = len(df)
+        X = np.zeros((n, self.n_columns), dtype=np.float64)
+        num = df[self.num_features].to_numpy(dtype=np.float64)
+        num = np.where(np.isnan(num), self.num_fill, num)
+        X[:, :num.shape[1]] = (num - self.num_mean) / self.num_scale
+        rows = np.arange(n)
+        for j, f in enumerate(self.cat_features):
+            ser = df[f].astype(object)
+            ser = ser.where(~ser.map(_is_missing), self.meta["cat_fill"][j])
+            cols = ser.map(self._lookup[j]).to_numpy(dtype=np.float64)
+            known = ~np.isnan(cols)
+            X[rows[known], cols[known].astype(np.intp)] = 1.0
+        return X.astype(np.float32)
+
+    # -- Scoring ----------------------------------------------------------
+
+    def _traverse(self, X):
+        """Leaf-value mean over all trees for each row of the encoded X."""
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        rows = np.arange(len(X))[:, None]
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.leaf_value[node].mean(axis=1)
+
+    # -- Explaining --------------------------------------------------------
+
+    def _column_features(self):
+        """Original-feature index of every encoded column (one-hot → its feature)."""
+        n_num = len(self.num_features)
+        owner = np.empty(self.n_columns, dtype=np.intp)
+        owner[:n_num] = np.arange(n_num)
+        for j, (cats, off) in enumerate(zip(self.meta["categories"], self.meta["cat_offsets"])):
+            owner[off:off + len(cats)] = n_num + j
+        return owner
+
+    def _contributions(self, X):
+        """Per-row contribution of each original feature (Saabas decomposition)."""
+        n_rows, n_trees = len(X), len(self.roots)
+        n_feats = len(self.features)
+        owner = self._column_features()
+        node = np.broadcast_to(self.roots, (n_rows, n_trees)).copy()
+        rows = np.arange(n_rows)[:, None]
+        contrib = np.zeros(n_rows * n_feats)
+        flat_rows = np.repeat(np.arange(n_rows), n_trees) * n_feats
+        for _ in range(self.max_depth):
+            split = self.feature[node]
+            go_left = X[rows, split] <= self.threshold[node]
+            child = np.where(go_left, self.left[node], self.right[node])
+            # a step's change in P(leave) is credited to the feature it split on;
+            # leaves point at themselves, so finished trees add exactly 0
+            delta = self.leaf_value[child] - self.leaf_value[node]
+            contrib += np.bincount(flat_rows + owner[split].ravel(), weights=delta.ravel(),
+                                   minlength=n_rows * n_feats)
+            node = child
+        return contrib.reshape(n_rows, n_feats) / n_trees
+
+    def explain(self, df):
+        """
+        Feature contributions for every row of `df`.
+
+        Returns (bias, contributions): `bias` is the forest's average
+        P(leave) at the root (the training base rate) and `contributions`
+        a DataFrame with one column per original feature, such that
+        bias + contributions.sum(axis=1) equals predict_proba(df)[:, 1].
+        One-hot columns are summed back into their categorical feature.
+        """
+        if isinstance(df, dict):
+            df = pd.DataFrame([df])
+        X = self.encode(df)
+        parts = [self._contributions(X[i:i + _CHUNK]) for i in range(0, len(X), _CHUNK)]
+        values = np.concatenate(parts) if parts else np.empty((0, len(self.features)))
+        bias = float(self.leaf_value[self.roots].mean())
+        return bias, pd.DataFrame(values, columns=self.features, index=df.index)
+
+    def predict_one(self, row):
+        """Probability of leaving for one {feature: value} mapping."""
+        x = self.encode_one(row)
+        node = self.roots.copy()
+        for _ in range(self.max_depth):
+            node = np.where(x[self.feature[node]] <= self.threshold[node],
+                            self.left[node], self.right[node])
+        return float(self.leaf_value[node].mean())
+
+    def predict_proba(self, df):
+        """Same shape as sklearn: column 0 = stay, column 1 = leave."""
+        if isinstance(df, dict):
+            df = pd.DataFrame([df])
+        X = self.encode(df)
+        p1 = np.concatenate([self._traverse(X[i:i + _CHUNK])
+                             for i in range(0, len(X), _CHUNK)]) if len(X) else np.empty(0)
+        return np.column_stack([1.0 - p1, p1])
+
+
+def load_compiled(path=COMPILED_FILE, model_path=MODEL_FILE,
+                  features_path=FEATURES_FILE, mmap=True):
+    """
+    Load the compiled predictor (memory-mapped by default), or return None
+    if it is missing or was exported from a different rf_pipeline.joblib
+    than the one on disk. Raises ValueError if its features disagree with
+    features.json.
+    """
+    if not path.exists():
+        return None
+    forest = CompiledForest.load(path, mmap=mmap)
+    if model_path.exists() and forest.meta.get("source_digest") != file_digest(model_path):
+        return None
+    if features_path is not None and features_path.exists():
+        forest.validate(load_feature_order(features_path))
+    return forest
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    import joblib
+
+    from src.config import DATA_READY
+
+    parser = argparse.ArgumentParser(description="Export the compiled forest.")
+    parser.add_argument("--float32", action="store_true",
+                        help="store split thresholds as float32 (exact, smaller file)")
+    args = parser.parse_args()
+
+    import sklearn.ensemble  # noqa: F401  (time the unpickling, not the import)
+
+    t0 = time.perf_counter()
+    pipe = joblib.load(MODEL_FILE)
+    pickle_load = time.perf_counter() - t0
+    forest = CompiledForest.from_pipeline(pipe, source_digest=file_digest(MODEL_FILE))
+    forest.save(COMPILED_FILE, float32_thresholds=args.float32)
+    print(f"Saved compiled forest ({len(forest.left):,} nodes) → {COMPILED_FILE}")
+
+    t0 = time.perf_counter()
+    for _ in range(20):
+        CompiledForest.load(COMPILED_FILE, mmap=True)
+    mmap_load = (time.perf_counter() - t0) / 20
+    print(f"Size: joblib {MODEL_FILE.stat().st_size / 1e6:.2f} MB · "
+          f"compiled {COMPILED_FILE.stat().st_size / 1e6:.2f} MB")
+    print(f"Load: joblib {pickle_load * 1e3:.1f} ms · compiled (mmap) {mmap_load * 1e3:.2f} ms")
+
+    forest = load_compiled(COMPILED_FILE)
+    if DATA_READY.exists():
+        feats = load_feature_order(FEATURES_FILE)
+        X = pd.read_parquet(DATA_READY, columns=feats)
+        diff = np.abs(forest.predict_proba(X)[:, 1] - pipe.predict_proba(X)[:, 1]).max()
+        row = X.iloc[0].to_dict()
+        t0 = time.perf_counter()
+        for _ in range(200):
+            forest.predict_one(row)
+        fast = (time.perf_counter() - t0) / 200
+        t0 = time.perf_counter()
+        for _ in range(20):
+            pipe.predict_proba(X.iloc[[0]])
+        slow = (time.perf_counter() - t0) / 20
+        print(f"Max |diff| vs sklearn: {diff:.2e}")
+        print(f"Single row: compiled {fast * 1e3:.3f} ms vs sklearn {slow * 1e3:.1f} ms")
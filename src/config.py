@@ -12,13 +12,31 @@ DATA_PROCESSED  = DATA_DIR / "processed"
 RAW_CSV           = DATA_RAW / "WA_Fn-UseC_-HR-Employee-Attrition.csv"
 PROCESSED_PARQUET = DATA_PROCESSED / "hr_attrition.parquet"
 READY_PARQUET     = DATA_PROCESSED / "hr_attrition_ready.parquet"
+CUBE_PARQUET      = DATA_PROCESSED / "attrition_cube.parquet"
+CORR_PARQUET      = DATA_PROCESSED / "corr_stats.parquet"
+SNAPSHOT_DIR      = DATA_DIR / "snapshots"  # partitioned monthly snapshots (not committed)
 
 # Artifacts and assets
-ARTIFACTS_DIR = ROOT / "artifacts" / "v1"
-ASSETS_DIR   = ROOT / "assets"
+ARTIFACTS_ROOT = ROOT / "artifacts"
+ARTIFACTS_DIR  = ARTIFACTS_ROOT / "v1"
+ASSETS_DIR     = ROOT / "assets"
+REGISTRY_FILE  = ARTIFACTS_ROOT / "registry.json"  # model versions + active pointer
 
-# Model files
+# Model files of the first exported version (v1). The app, the scoring
+# service and batch scoring use the registry's active version instead
+# (src.registry.active_dir); these are where notebook 03 exports to.
 MODEL_FILE    = ARTIFACTS_DIR / "rf_pipeline.joblib"
 FEATURES_FILE = ARTIFACTS_DIR / "features.json"
+COMPILED_FILE = ARTIFACTS_DIR / "rf_compiled.npz"
+SCHEMA_FILE   = ARTIFACTS_DIR / "feature_schema.json"  # dtypes, ranges, vocabularies
+SCORES_DIR    = ARTIFACTS_DIR / "scores"  # cached model scores (not committed)
 
 DATA_READY = READY_PARQUET
+
+# Most raw data points a chart may send to the browser (page 2 outliers)
+CHART_MAX_POINTS = 2000
+
+# Risk bands for predicted probabilities: Low < 0.35 <= Medium < 0.60 <= High
+LOW_RISK_MAX  = 0.35
+HIGH_RISK_MIN = 0.60
+
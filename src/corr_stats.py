@@ -0,0 +1,169 @@
+"""
+Correlation matrices from per-segment sufficient statistics.
+
+For every (Department, OverTime, Age) segment the table stores the row
+count `n`, the column means and the co-moments
+C[a, b] = Σ (x_a - mean_a)(x_b - mean_b) of NUM_FEATURES + target.
+Segments combine exactly (Chan et al.'s parallel update), so the Pearson
+correlation matrix for any page filter is a sum over a few hundred
+segments, and appending new employees only merges their segment
+statistics into the table instead of re-reading every row.
+
+Rows with a missing value in any of the columns are left out (the ready
+dataset has none); pandas' `corr` drops them pair by pair instead.
+
+Built alongside the cube with:  python -m src.cube
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.config import CORR_PARQUET, READY_PARQUET
+from src.cube import FILTER_DIMS, is_fresh, segment_mask
+from src.data import load_dataset
+from src.features import NUM_FEATURES
+from src.utils import content_digest, file_signature, write_artifact
+
+CORR_COLUMNS = [*NUM_FEATURES, "target"]
+
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def _pairs(columns):
+    return [(i, j) for i in range(len(columns)) for j in range(i, len(columns))]
+
+
+def _names(columns):
+    means = [f"mean:{c}" for c in columns]
+    comoments = [f"cm:{columns[i]}:{columns[j]}" for i, j in _pairs(columns)]
+    return means, comoments
+
+
+def build_corr_stats(df, columns=CORR_COLUMNS):
+    """One row per filter segment: dims, n, means and upper-triangle co-moments."""
+    columns = [c for c in columns if c in df.columns]
+    dims = [d for d in FILTER_DIMS if d in df.columns]
+    data = df[list(dict.fromkeys([*dims, *columns]))].dropna(subset=columns)  # Age is in both
+    X = data[columns].to_numpy(dtype=np.float64)
+    if dims:
+        # dropna=False: a missing Department / OverTime is its own segment
+        # (as in the cube) instead of an ngroup() code of -1
+        grouped = data.groupby(dims, sort=True, observed=True, dropna=False)
+        codes = grouped.ngroup().to_numpy()
+        keys = grouped.size().reset_index(name="n")
+    else:
+        codes = np.zeros(len(data), dtype=np.intp)
+        keys = pd.DataFrame({"n": [len(data)]})
+    n = keys["n"].to_numpy(dtype=np.float64)
+    k = len(keys)
+    means = np.column_stack([np.bincount(codes, X[:, c], minlength=k) / n
+                             for c in range(len(columns))])
+    D = X - means[codes]
+    comoments = np.column_stack([np.bincount(codes, D[:, i] * D[:, j], minlength=k)
+                                 for i, j in _pairs(columns)])
+    mean_names, cm_names = _names(columns)
+    out = pd.concat([keys, pd.DataFrame(means, columns=mean_names),
+                     pd.DataFrame(comoments, columns=cm_names)], axis=1)
+    out["n"] = out["n"].astype("int64")
+    return out
+
+
+def _columns_of(stats):
+    return [c[len("mean:"):] for c in stats.columns if c.startswith("mean:")]
+
+
+def _combine(n, means, comoments, columns):
+    """Pool segments: total n, mean vector and full co-moment matrix."""
+    total = n.sum()
+    p = len(columns)
+    if total == 0:
+        return 0, np.full(p, np.nan), np.full((p, p), np.nan)
+    mean = (n[:, None] * means).sum(axis=0) / total
+    d = means - mean
+    C = np.zeros((p, p))
+    for col, (i, j) in enumerate(_pairs(columns)):
+        C[i, j] = C[j, i] = comoments[:, col].sum() + (n * d[:, i] * d[:, j]).sum()
+    return int(total), mean, C
+
+
+def append_rows(stats, new_df):
+    """
+    Stats table for the old rows plus `new_df`: only the segments that
+    received rows change, merged with the same pooling formula.
+    """
+    columns = _columns_of(stats)
+    dims = [d for d in FILTER_DIMS if d in stats.columns]
+    both = pd.concat([stats, build_corr_stats(new_df, columns)], ignore_index=True)
+    mean_names, cm_names = _names(columns)
+    rows = []
+    for key, g in both.groupby(dims, sort=True, observed=True, dropna=False):
+        if len(g) == 1:
+            rows.append(g.iloc[0])
+            continue
+        n, mean, C = _combine(g["n"].to_numpy(dtype=np.float64),
+                              g[mean_names].to_numpy(), g[cm_names].to_numpy(), columns)
+        rows.append(pd.Series({
+            **dict(zip(dims, key if isinstance(key, tuple) else (key,))), "n": n,
+            **dict(zip(mean_names, mean)),
+            **{name: C[i, j] for name, (i, j) in zip(cm_names, _pairs(columns))},
+        }))
+    out = pd.DataFrame(rows).reset_index(drop=True)[stats.columns]
+    return out.astype(stats.dtypes.to_dict())
+
+
+def index_corr_stats(stats):
+    """NumPy arrays of the stats table for fast filtered queries."""
+    columns = _columns_of(stats)
+    mean_names, cm_names = _names(columns)
+    return {
+        "columns": columns,
+        "n": stats["n"].to_numpy(dtype=np.float64),
+        "means": stats[mean_names].to_numpy(),
+        "comoments": stats[cm_names].to_numpy(),
+        **{d: stats[d].to_numpy() for d in FILTER_DIMS if d in stats.columns},
+    }
+
+
+def query_corr(istats, departments=None, overtime=None, age_range=None):
+    """Pearson correlation matrix (DataFrame) of the rows inside the filters."""
+    keep = segment_mask(istats, departments, overtime, age_range)
+    columns = istats["columns"]
+    _, _, C = _combine(istats["n"][keep], istats["means"][keep],
+                       istats["comoments"][keep], columns)
+    sd = np.sqrt(np.diag(C))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = C / np.outer(sd, sd)
+    corr[~np.isfinite(corr)] = np.nan  # constant columns, like pandas
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+def save_corr_stats(stats, path=CORR_PARQUET, source=READY_PARQUET):
+    """Save the stats with the digest of their `source` file and their columns."""
+    write_artifact(stats, path, {"source_sha256": content_digest(source),
+                                 "features": _columns_of(stats)})
+
+
+def get_corr_stats(source):
+    """
+    Indexed stats for the dataset at `source`: the saved artifact when it
+    was built from `source`'s current contents with CORR_COLUMNS, else
+    built from the cached dataset. Kept per process until either file
+    changes.
+    """
+    fresh = is_fresh(CORR_PARQUET, source, CORR_COLUMNS)
+    key = (file_signature(source), file_signature(CORR_PARQUET) if fresh else None)
+    with _LOCK:
+        hit = _CACHE.get(source)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+    if fresh:
+        stats = pd.read_parquet(CORR_PARQUET)
+    else:
+        df, _ = load_dataset(sources=(source,))
+        stats = build_corr_stats(df)
+    istats = index_corr_stats(stats)
+    with _LOCK:
+        _CACHE[source] = (key, istats)
+    return istats
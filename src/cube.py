@@ -0,0 +1,172 @@
+"""
+Pre-materialised attrition rollups ("cube").
+
+For every category feature the cube stores, per (value, Department,
+OverTime, Age) cell, the head-count `n` and the number of leavers
+`n_pos`. Any "attrition rate by category under a filter" question is then
+a sum over a few hundred cells instead of a group-by over every employee.
+Age is kept per year so the page's integer age slider maps onto whole cells.
+
+The saved artifact records the SHA-256 of the dataset it was built from
+and the feature list, and is only used while both still match (file
+times are not trusted: a checkout or copy can make a stale cube look new).
+
+Build the artifact (and the correlation statistics of src.corr_stats) with:
+python -m src.cube
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.config import CUBE_PARQUET, READY_PARQUET
+from src.data import load_dataset
+from src.features import CAT_FEATURES
+from src.utils import artifact_meta, content_digest, file_signature, write_artifact
+
+FILTER_DIMS = ["Department", "OverTime", "Age"]
+CUBE_FEATURES = list(CAT_FEATURES)
+
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def build_cube(df, features=CUBE_FEATURES):
+    """Roll `df` up into the long cube table (one block of rows per feature)."""
+    dims = [d for d in FILTER_DIMS if d in df.columns]
+    blocks = []
+    for feat in features:
+        if feat not in df.columns:
+            continue
+        # Department/OverTime are both a feature and a filter dimension
+        keys = dims if feat in dims else [feat, *dims]
+        g = (df.groupby(keys, dropna=False, observed=True)["target"]
+             .agg(n="size", n_pos="sum")
+             .reset_index())
+        g.insert(0, "value", g[feat].astype(str))
+        if feat not in dims:
+            g = g.drop(columns=feat)
+        g.insert(0, "feature", feat)
+        blocks.append(g)
+    cube = pd.concat(blocks, ignore_index=True)
+    cube["n"] = cube["n"].astype("int64")
+    cube["n_pos"] = cube["n_pos"].astype("int64")
+    return cube
+
+
+def index_cube(cube):
+    """Split the cube into per-feature NumPy arrays for fast queries."""
+    out = {}
+    for feat, block in cube.groupby("feature", sort=False):
+        labels, codes = np.unique(block["value"].to_numpy(), return_inverse=True)
+        labels = _numeric_labels(labels)
+        out[feat] = {
+            "labels": labels,
+            "order": np.argsort(labels, kind="stable"),
+            "codes": codes,
+            "n": block["n"].to_numpy(),
+            "n_pos": block["n_pos"].to_numpy(),
+            **{d: block[d].to_numpy() for d in FILTER_DIMS if d in block.columns},
+        }
+    return out
+
+
+def segment_mask(block, departments=None, overtime=None, age_range=None):
+    """Boolean mask of the cells (rows of `block`) inside the page filters."""
+    keep = np.ones(len(block["n"]), dtype=bool)
+    if departments and "Department" in block:
+        keep &= np.isin(block["Department"], list(departments))
+    if overtime and "OverTime" in block:
+        keep &= np.isin(block["OverTime"], list(overtime))
+    if age_range is not None and "Age" in block:
+        keep &= (block["Age"] >= age_range[0]) & (block["Age"] <= age_range[1])
+    return keep
+
+
+def _numeric_labels(labels):
+    """Give integer-coded features (JobLevel) their ints back."""
+    try:
+        return labels.astype(int)
+    except ValueError:
+        return labels
+
+
+def query_rates(icube, by, departments=None, overtime=None, age_range=None):
+    """
+    Attrition rate by `by` under the page filters, answered from the cube.
+
+    `by` is a cube feature or one of the filter dimensions. Returns a
+    DataFrame with columns [by, rate, n, n_pos]; empty filter selections
+    mean "keep everything".
+    """
+    if by in icube:
+        block = icube[by]
+        labels, codes, order = block["labels"], block["codes"], block["order"]
+    else:
+        # A filter dimension: every feature block covers each row once
+        block = next(iter(icube.values()))
+        labels, codes = np.unique(block[by], return_inverse=True)
+        order = np.arange(len(labels))
+    keep = segment_mask(block, departments, overtime, age_range)
+    n = np.bincount(codes[keep], weights=block["n"][keep], minlength=len(labels))[order]
+    n_pos = np.bincount(codes[keep], weights=block["n_pos"][keep], minlength=len(labels))[order]
+    seen = n > 0
+    return pd.DataFrame({
+        by: labels[order][seen],
+        "rate": n_pos[seen] / n[seen],
+        "n": n[seen].astype(int),
+        "n_pos": n_pos[seen].astype(int),
+    })
+
+
+def save_cube(cube, path=CUBE_PARQUET, source=READY_PARQUET, features=CUBE_FEATURES):
+    """Save the cube with the digest of its `source` file and its feature list."""
+    write_artifact(cube, path, {"source_sha256": content_digest(source),
+                                "features": list(features)})
+
+
+def is_fresh(path, source, features=CUBE_FEATURES):
+    """True when the artifact at `path` was built from `source`'s current contents."""
+    meta = artifact_meta(path)
+    return (meta is not None and meta.get("features") == list(features)
+            and meta.get("source_sha256") == content_digest(source))
+
+
+def get_cube(source):
+    """
+    Indexed cube for the dataset at `source`.
+
+    Uses the saved artifact when it was built from `source`'s current
+    contents with the current CUBE_FEATURES, otherwise rolls the cached
+    dataset up in memory. Kept per process until either file changes.
+    """
+    fresh = is_fresh(CUBE_PARQUET, source)
+    key = (file_signature(source), file_signature(CUBE_PARQUET) if fresh else None)
+    with _LOCK:
+        hit = _CACHE.get(source)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+    if fresh:
+        cube = pd.read_parquet(CUBE_PARQUET)
+    else:
+        df, _ = load_dataset(sources=(source,))
+        cube = build_cube(df)
+    icube = index_cube(cube)
+    with _LOCK:
+        _CACHE[source] = (key, icube)
+    return icube
+
+
+if __name__ == "__main__":
+    df, src = load_dataset(sources=(READY_PARQUET,))
+    if df is None:
+        raise SystemExit(f"Missing {READY_PARQUET}. Run Notebook 02 first.")
+    cube = build_cube(df)
+    save_cube(cube, source=src)
+    print(f"Saved {len(cube):,} cube cells from {len(df):,} rows → {CUBE_PARQUET}")
+
+    from src.config import CORR_PARQUET
+    from src.corr_stats import build_corr_stats, save_corr_stats
+    stats = build_corr_stats(df)
+    save_corr_stats(stats, source=src)
+    print(f"Saved {len(stats):,} correlation segments → {CORR_PARQUET}")
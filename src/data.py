@@ -0,0 +1,70 @@
+import threading
+import pandas as pd
+
+from src.config import READY_PARQUET, PROCESSED_PARQUET, RAW_CSV
+from src.utils import yes_no_to_binary, file_signature
+
+# Preferred load order: ready parquet → processed parquet → raw CSV
+DEFAULT_SOURCES = (READY_PARQUET, PROCESSED_PARQUET, RAW_CSV)
+
+# One in-memory copy per file for the whole process: {path: (signature, df)}
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def _read(path):
+    """Read one file from disk and add the 0/1 target once."""
+    if path.suffix == ".parquet" or path.is_dir():
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    if "target" not in df.columns and "Attrition" in df.columns:
+        df["target"] = yes_no_to_binary(df["Attrition"])
+    return df
+
+
+def _cached_frame(path):
+    """Return the cached frame for `path`, re-reading it if the file changed."""
+    sig = file_signature(path)
+    with _LOCK:
+        hit = _CACHE.get(path)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+    df = _read(path)
+    with _LOCK:
+        _CACHE[path] = (sig, df)
+    return df
+
+
+def first_existing(sources=DEFAULT_SOURCES):
+    """Return the first path in `sources` that exists, or None."""
+    for p in sources:
+        if p.exists():
+            return p
+    return None
+
+
+def load_dataset(sources=DEFAULT_SOURCES, columns=None):
+    """
+    Load the first dataset that exists in `sources` and return (DataFrame, path),
+    or (None, None) if nothing is found.
+
+    The frame is shared by every caller in the process, so treat it as
+    read-only (copy before adding columns). Pass `columns` to get only
+    those columns back; names missing from the file are skipped.
+    """
+    p = first_existing(sources)
+    if p is None:
+        return None, None
+    # A file that exists but cannot be read raises: falling back to another
+    # source would quietly run every page on the wrong data
+    df = _cached_frame(p)
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df, p
+
+
+def clear_cache():
+    """Drop every cached dataset (mainly for tests)."""
+    with _LOCK:
+        _CACHE.clear()
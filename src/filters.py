@@ -0,0 +1,132 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from src.utils import file_signature
+
+# Filtered results kept in memory: {(path, signature, columns, filters): df},
+# plus the widget options: {("options", path, signature): dict}
+_MAX_CACHED = 32
+_CACHE = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _dataset(path):
+    """Open a parquet file/folder or a CSV as an Arrow dataset (no data read yet)."""
+    fmt = "csv" if path.suffix == ".csv" else "parquet"
+    return ds.dataset(path, format=fmt, partitioning="hive")
+
+
+def available_columns(path):
+    """Column names in the file (plus 'target' when it can be derived)."""
+    names = list(_dataset(path).schema.names)
+    if "target" not in names and "Attrition" in names:
+        names.append("target")
+    return names
+
+
+def build_filter(departments=None, overtime=None, age_range=None):
+    """
+    Turn the page filters into one Arrow expression (or None for "no filter").
+    Empty selections mean "keep everything", like the multiselects on page 2.
+    """
+    expr = None
+    parts = []
+    if departments:
+        parts.append(ds.field("Department").isin(list(departments)))
+    if overtime:
+        parts.append(ds.field("OverTime").isin(list(overtime)))
+    if age_range is not None:
+        lo, hi = age_range
+        parts.append((ds.field("Age") >= lo) & (ds.field("Age") <= hi))
+    for p in parts:
+        expr = p if expr is None else expr & p
+    return expr
+
+
+def _options(path):
+    data = _dataset(path)
+    names = data.schema.names
+    cols = [c for c in ("Department", "OverTime", "Age") if c in names]
+    table = data.to_table(columns=cols)
+    opts = {"rows": table.num_rows, "departments": [], "overtime": [],
+            "age_min": 18, "age_max": 70}
+    if "Department" in cols:
+        opts["departments"] = pc.unique(table["Department"]).drop_null().to_pylist()
+    if "OverTime" in cols:
+        opts["overtime"] = pc.unique(table["OverTime"]).drop_null().to_pylist()
+    if "Age" in cols and table.num_rows:
+        mm = pc.min_max(table["Age"]).as_py()
+        opts["age_min"], opts["age_max"] = int(mm["min"]), int(mm["max"])
+    return opts
+
+
+def filter_options(path):
+    """
+    Values for the filter widgets, read from the three filter columns only.
+    Cached per file version like `scan_filtered`; treat the result as read-only.
+    """
+    key = ("options", path, file_signature(path))
+    with _LOCK:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            return _CACHE[key]
+    opts = _options(path)
+    with _LOCK:
+        _CACHE[key] = opts
+        while len(_CACHE) > _MAX_CACHED:
+            _CACHE.popitem(last=False)
+    return opts
+
+
+def _scan(path, columns, expr):
+    data = _dataset(path)
+    names = data.schema.names
+    want = [c for c in columns if c in names]
+    derive_target = "target" in columns and "target" not in names and "Attrition" in names
+    if derive_target and "Attrition" not in want:
+        want.append("Attrition")
+    table = data.to_table(columns=want, filter=expr)
+    if derive_target:
+        target = pc.cast(pc.equal(table["Attrition"], "Yes"), "int64")
+        table = table.append_column("target", target)
+        if "Attrition" not in columns:
+            table = table.drop(["Attrition"])
+    # Arrow-backed columns: no conversion to NumPy/object and no extra copy
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def scan_filtered(path, columns, departments=None, overtime=None, age_range=None):
+    """
+    Read only `columns` from `path`, keeping rows that match the
+    Department / OverTime / Age filters.
+
+    The filters are pushed down to the Arrow scan, so parquet row groups
+    whose statistics cannot match are skipped without being decoded.
+    Results are cached per file version and filter combination; treat the
+    returned frame as read-only.
+    """
+    key = (
+        path, file_signature(path), tuple(columns),
+        tuple(sorted(departments or ())), tuple(sorted(overtime or ())),
+        tuple(age_range) if age_range is not None else None,
+    )
+    with _LOCK:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            return _CACHE[key]
+    df = _scan(path, columns, build_filter(departments, overtime, age_range))
+    with _LOCK:
+        _CACHE[key] = df
+        while len(_CACHE) > _MAX_CACHED:
+            _CACHE.popitem(last=False)
+    return df
+
+
+def clear_cache():
+    """Drop every cached filter result (mainly for tests and benchmarks)."""
+    with _LOCK:
+        _CACHE.clear()
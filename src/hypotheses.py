@@ -0,0 +1,181 @@
+"""
+Declarative hypothesis tests against attrition.
+
+Each entry of HYPOTHESES names the column to test (optionally cut into two
+groups) and the two groups whose attrition rates the verdict compares.
+`contingency_tables` builds the (level × stayed/left) table of every
+requested column with a single `np.bincount` over all columns at once,
+and `chi_square` tests a whole list of tables in one vectorised step
+(same statistic and p-value as `scipy.stats.chi2_contingency`, including
+Yates' continuity correction for 2×2 tables).
+
+`screen` runs the test for every categorical column of the dataset, so
+the page can show more than the three hand-picked hypotheses; results
+are cached per dataset file version.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.data import load_dataset
+from src.utils import file_signature
+
+HYPOTHESES = [
+    {"id": "H1", "column": "OverTime", "label": "H1 (OverTime)",
+     "title": "Overtime workers have higher attrition",
+     "statement": "Employees who work overtime are more likely to leave than those who do not.",
+     "high": "Yes", "low": "No",
+     "high_label": "Overtime workers", "low_label": "non-overtime workers",
+     "action": "Review overtime policies and workload distribution."},
+    {"id": "H2", "column": "JobSatisfaction", "label": "H2 (JobSatisfaction)",
+     "title": "Lower job satisfaction increases attrition",
+     "statement": "Employees with lower job satisfaction levels leave at higher rates "
+                  "than those with higher satisfaction.",
+     "high": 1, "low": 4,
+     "high_label": "Employees with the lowest satisfaction (level 1)",
+     "low_label": "the highest satisfaction (level 4)",
+     "action": "Run regular satisfaction surveys and target low-scoring teams."},
+    {"id": "H3", "column": "Age", "cut": 30, "group": "AgeGroup",
+     "label": "H3 (Age ≤30 vs >30)",
+     "title": "Younger employees (≤30) leave more often",
+     "statement": "Employees aged 30 or under have a higher attrition rate than employees over 30.",
+     "high": "<=30", "low": ">30",
+     "high_label": "Employees aged ≤30", "low_label": "those over 30",
+     "action": "Build early-career retention programmes (mentorship, progression paths)."},
+]
+
+ALPHA = 0.05
+MAX_LEVELS = 10           # integer columns with more values are not categorical
+_SKIP = {"target", "Attrition", "EmployeeNumber"}
+
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def grouping(df, spec):
+    """The values a hypothesis groups by (the column, or its two-way cut)."""
+    col = df[spec["column"]]
+    if "cut" in spec:
+        cut = spec["cut"]
+        return pd.Series(np.where(col <= cut, f"<={cut}", f">{cut}"), index=df.index)
+    return col
+
+
+def categorical_columns(df, max_levels=MAX_LEVELS):
+    """Text columns plus low-cardinality integer columns, minus constants."""
+    out = []
+    for c in df.columns:
+        if c in _SKIP:
+            continue
+        kind = df[c].dtype.kind
+        levels = df[c].nunique()
+        if levels < 2:
+            continue
+        if kind in "OSUb" or isinstance(df[c].dtype, pd.CategoricalDtype) \
+                or (kind in "iu" and levels <= max_levels):
+            out.append(c)
+    return out
+
+
+def contingency_tables(columns, target):
+    """
+    {name: DataFrame(index=level, columns=[0, 1])} for every Series in
+    `columns` ({name: values}) against the 0/1 `target`, from one bincount.
+    """
+    y = np.asarray(target, dtype=np.int64)
+    names, uniques, offsets, codes = [], [], [0], []
+    for name, values in columns.items():
+        c, u = pd.factorize(values, sort=True)
+        names.append(name)
+        uniques.append(u)
+        codes.append(np.where(c < 0, -1, c + offsets[-1]))  # -1: missing value
+        offsets.append(offsets[-1] + len(u))
+    stacked = np.concatenate(codes)
+    ys = np.tile(y, len(names))
+    ok = stacked >= 0
+    counts = np.bincount(stacked[ok] * 2 + ys[ok], minlength=2 * offsets[-1]).reshape(-1, 2)
+    return {name: pd.DataFrame(counts[offsets[i]:offsets[i + 1]], index=uniques[i],
+                               columns=[0, 1])
+            for i, name in enumerate(names)}
+
+
+def chi_square(tables, correction=True):
+    """
+    Chi-square test of independence for many (k × 2) tables at once.
+    Returns a DataFrame [chi2, dof, p_value, cramers_v, n] indexed by name.
+    """
+    from scipy.stats import chi2 as chi2_dist
+    names = list(tables)
+    kmax = max(len(t) for t in tables.values())
+    obs = np.zeros((len(names), kmax, 2))
+    for i, name in enumerate(names):
+        obs[i, :len(tables[name])] = tables[name].to_numpy()
+    rows, cols, n = obs.sum(axis=2), obs.sum(axis=1), obs.sum(axis=(1, 2))
+    expected = rows[:, :, None] * cols[:, None, :] / n[:, None, None]
+    levels = (rows > 0).sum(axis=1)
+    dof = (levels - 1) * ((cols > 0).sum(axis=1) - 1)
+
+    def statistic(observed):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            terms = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0)
+        return terms.sum(axis=(1, 2))
+
+    plain = statistic(obs)
+    stat = plain
+    if correction:
+        # Yates: move each count up to 0.5 towards its expected value (dof 1 only)
+        diff = expected - obs
+        adjusted = obs + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+        stat = np.where(dof == 1, statistic(adjusted), plain)
+    p = np.where(dof > 0, chi2_dist.sf(stat, np.maximum(dof, 1)), 1.0)
+    # Cramér's V (k × 2 tables: min(r - 1, c - 1) = 1), from the uncorrected statistic
+    v = np.sqrt(np.where(dof > 0, plain / n, 0.0))
+    return pd.DataFrame({"chi2": stat, "dof": dof.astype(int), "p_value": p,
+                         "cramers_v": v, "n": n.astype(int)}, index=names)
+
+
+def rates(table, name="level"):
+    """Evidence table [name, rate, n] from one contingency table."""
+    n = table.sum(axis=1)
+    return pd.DataFrame({name: table.index, "rate": (table[1] / n).to_numpy(),
+                         "n": n.to_numpy()})
+
+
+def run_tests(df, specs=HYPOTHESES, screen_columns=None):
+    """
+    Contingency tables for the hypotheses (keyed by id) and for every
+    screened column (keyed by column name), plus one batch of chi-square
+    tests over all of them.
+    """
+    specs = [s for s in specs if s["column"] in df.columns]
+    if screen_columns is None:
+        screen_columns = categorical_columns(df)
+    columns = {s["id"]: grouping(df, s) for s in specs}
+    columns.update({c: df[c] for c in screen_columns})
+    tables = contingency_tables(columns, df["target"])
+    return {"tables": tables, "tests": chi_square(tables)}
+
+
+def verdict(spec, tables, tests, alpha=ALPHA):
+    """(supported, high_rate, low_rate, p_value) for one registry entry."""
+    tab = tables[spec["id"]]
+    rate = tab[1] / tab.sum(axis=1)
+    high, low = rate.get(spec["high"]), rate.get(spec["low"])
+    p = float(tests.loc[spec["id"], "p_value"])
+    supported = high is not None and low is not None and high > low and p < alpha
+    return supported, high, low, p
+
+
+def get_results(source):
+    """`run_tests` on the dataset at `source`, cached until the file changes."""
+    key = file_signature(source)
+    with _LOCK:
+        hit = _CACHE.get(source)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+    df, _ = load_dataset(sources=(source,))
+    results = run_tests(df)
+    with _LOCK:
+        _CACHE[source] = (key, results)
+    return results
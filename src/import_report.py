@@ -0,0 +1,59 @@
+"""
+Cold-start import-time report for the app pages.
+
+Each page module is imported in a fresh interpreter with `python -X importtime`
+(after streamlit, which app.py always needs), and the report shows the
+page's own cumulative import time plus its heaviest direct imports.
+
+    python -m src.import_report
+"""
+import subprocess
+import sys
+
+from app_pages import PAGES
+from src.config import ROOT
+
+
+def measure(module, baseline="streamlit"):
+    """
+    Import `module` in a new process and return (total_ms, [(name, ms), ...])
+    where the list holds the modules it imported directly, heaviest first.
+    """
+    code = f"import {baseline}; import {module}" if baseline else f"import {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    total, children = 0.0, []
+    lines = [ln for ln in proc.stderr.splitlines() if ln.startswith("import time:")]
+    # -X importtime prints children before their parent, indented two more spaces
+    for ln in reversed(lines):
+        _, cumulative, name = ln[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if name == module:
+            total = int(cumulative) / 1000
+            continue
+        if total and depth == 1:
+            children.append((name, int(cumulative) / 1000))
+        elif total and depth == 0:
+            break
+    children.sort(key=lambda c: c[1], reverse=True)
+    return total, children
+
+
+def report(top=3):
+    rows = []
+    for label, module in PAGES.items():
+        total, children = measure(module)
+        heavy = ", ".join(f"{n} {ms:.0f}ms" for n, ms in children[:top])
+        rows.append((label, total, heavy))
+    width = max(len(r[0]) for r in rows)
+    lines = [f"{'Page':<{width}}  {'import ms':>9}  heaviest direct imports"]
+    for label, total, heavy in rows:
+        lines.append(f"{label:<{width}}  {total:>9.0f}  {heavy}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(report())
@@ -0,0 +1,177 @@
+"""
+Grouped permutation importance per original feature.
+
+For each of NUM_FEATURES + CAT_FEATURES the job shuffles that feature's
+values across the held-out rows and records how much ROC-AUC drops,
+`repeats` times. Unlike impurity importances this does not favour
+features that were split into many one-hot columns: a categorical
+feature's whole one-hot block is shuffled together.
+
+The held-out rows are encoded once with the compiled forest and placed
+in shared memory; worker processes attach to it instead of receiving a
+copy, and each (feature, repeat) uses the generator seeded with
+(seed, feature, repeat), so the numbers do not depend on the pool size.
+The result is written next to the model as permutation_importance.json
+for the Technical page to display.
+
+    python -m src.importance --repeats 10 --n-jobs 4
+"""
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+IMPORTANCE_NAME = "permutation_importance.json"
+REPEATS = 10
+
+# Set in each worker by _attach: (forest, X, y, shm handles)
+_WORKER = {}
+
+
+def feature_blocks(forest):
+    """{original feature: encoded column indices} (a one-hot block for categories)."""
+    owner = forest._column_features()
+    return {f: np.flatnonzero(owner == i) for i, f in enumerate(forest.features)}
+
+
+def _auc(y, p):
+    from sklearn.metrics import roc_auc_score
+    return roc_auc_score(y, p)
+
+
+def _drops(forest, X, y, baseline, cols, repeats, seed, feature_index):
+    """AUC drop below `baseline` for each repeat of shuffling the rows of X[:, cols]."""
+    out = []
+    Xp = X.copy()
+    for r in range(repeats):
+        perm = np.random.default_rng((seed, feature_index, r)).permutation(len(X))
+        Xp[:, cols] = X[perm[:, None], cols]  # gather only the shuffled block
+        out.append(baseline - _auc(y, forest._traverse(Xp)))
+    return out
+
+
+def _attach(compiled_path, x_name, x_shape, y_name, y_shape):
+    from src.compiled import CompiledForest
+    x_shm = shared_memory.SharedMemory(name=x_name)
+    y_shm = shared_memory.SharedMemory(name=y_name)
+    _WORKER.update(
+        forest=CompiledForest.load(compiled_path, mmap=True),
+        X=np.ndarray(x_shape, dtype=np.float32, buffer=x_shm.buf),
+        y=np.ndarray(y_shape, dtype=np.int64, buffer=y_shm.buf),
+        shm=(x_shm, y_shm),
+    )
+
+
+def _worker_drops(baseline, cols, repeats, seed, feature_index):
+    return _drops(_WORKER["forest"], _WORKER["X"], _WORKER["y"], baseline,
+                  cols, repeats, seed, feature_index)
+
+
+def permutation_importance(forest, df, y, repeats=REPEATS, seed=0, n_jobs=1,
+                           compiled_path=None):
+    """
+    DataFrame [feature, importance_mean, importance_std, drops] sorted by
+    importance, plus the baseline AUC. n_jobs > 1 needs `compiled_path`
+    (workers memory-map the forest from it).
+    """
+    X = forest.encode(df)
+    y = np.asarray(y, dtype=np.int64)
+    blocks = feature_blocks(forest)
+    names = list(blocks)
+    baseline = _auc(y, forest._traverse(X))
+
+    if n_jobs == 1 or compiled_path is None:
+        drops = [_drops(forest, X, y, baseline, blocks[f], repeats, seed, i)
+                 for i, f in enumerate(names)]
+    else:
+        x_shm = shared_memory.SharedMemory(create=True, size=X.nbytes)
+        y_shm = shared_memory.SharedMemory(create=True, size=y.nbytes)
+        try:
+            np.ndarray(X.shape, dtype=X.dtype, buffer=x_shm.buf)[:] = X
+            np.ndarray(y.shape, dtype=y.dtype, buffer=y_shm.buf)[:] = y
+            workers = n_jobs if n_jobs > 0 else (os.cpu_count() or 1)
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(names)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_attach,
+                initargs=(compiled_path, x_shm.name, X.shape, y_shm.name, y.shape),
+            ) as pool:
+                drops = list(pool.map(_worker_drops, [baseline] * len(names),
+                                      [blocks[f] for f in names],
+                                      [repeats] * len(names), [seed] * len(names),
+                                      range(len(names))))
+        finally:
+            for shm in (x_shm, y_shm):
+                shm.close()
+                shm.unlink()
+
+    table = pd.DataFrame({
+        "feature": names,
+        "importance_mean": [float(np.mean(d)) for d in drops],
+        "importance_std": [float(np.std(d)) for d in drops],
+        "drops": drops,
+    }).sort_values("importance_mean", ascending=False, ignore_index=True)
+    return table, baseline
+
+
+def save_importance(table, baseline, path, model_digest, repeats, n_rows, seed):
+    payload = {
+        "model_sha256": model_digest, "metric": "roc_auc", "baseline": baseline,
+        "repeats": repeats, "n_rows": n_rows, "seed": seed,
+        "features": table.to_dict(orient="records"),
+    }
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, indent=2) + "\n")
+    tmp.replace(path)
+
+
+def load_importance(model_dir, model_digest=None):
+    """
+    (table, meta) from the artifact next to the model, or None when it is
+    missing or was computed for a different model file.
+    """
+    path = model_dir / IMPORTANCE_NAME
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text())
+    if model_digest is not None and payload.get("model_sha256") != model_digest:
+        return None
+    table = pd.DataFrame(payload.pop("features"))
+    return table, payload
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from sklearn.model_selection import train_test_split
+
+    from src.config import READY_PARQUET
+    from src.registry import COMPILED_NAME, LoadedModel, active_version
+
+    parser = argparse.ArgumentParser(description="Grouped permutation importance.")
+    parser.add_argument("--version", default=None, help="model version (default: active)")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = LoadedModel(args.version or active_version())
+    if model.compiled is None:
+        raise SystemExit("No compiled forest for this version; run python -m src.compiled first.")
+    df = pd.read_parquet(READY_PARQUET)
+    # Same held-out split as notebook 03
+    _, X_test, _, y_test = train_test_split(df[model.feats], df["target"], test_size=0.2,
+                                            stratify=df["target"], random_state=42)
+    t0 = time.perf_counter()
+    table, baseline = permutation_importance(
+        model.compiled, X_test, y_test, args.repeats, args.seed, args.n_jobs,
+        compiled_path=model.model_path.parent / COMPILED_NAME)
+    out = model.model_path.parent / IMPORTANCE_NAME
+    save_importance(table, baseline, out, model.digest, args.repeats, len(X_test), args.seed)
+    print(table[["feature", "importance_mean", "importance_std"]].round(4).to_string(index=False))
+    print(f"Baseline AUC {baseline:.3f} · {time.perf_counter() - t0:.1f}s → {out}")
@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+from numbers import Number
+
+
+def normalise_row(row, feats):
+    """Hashable, order-fixed key for one input profile (2 and 2.0 are the same)."""
+    out = []
+    for f in feats:
+        v = row.get(f)
+        if isinstance(v, Number) and not isinstance(v, bool):
+            v = float(v)
+        elif isinstance(v, str):
+            v = v.strip()
+        out.append(v)
+    return tuple(out)
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predicted probabilities.
+
+    Keys combine the model artifact's hash with the normalised feature
+    tuple, so a retrained model never serves stale answers. Safe to share
+    between Streamlit sessions (one lock around the dict).
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, model_digest, row, feats, compute):
+        """
+        Return the cached probability for `row`. On a miss `compute` gets the
+        normalised row ({feature: value} built from the cache key), so every
+        input that shares an entry is scored as the same profile.
+        """
+        values = normalise_row(row, feats)
+        key = (model_digest, values)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute(dict(zip(feats, values)))
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._data), "maxsize": self.maxsize}
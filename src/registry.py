@@ -0,0 +1,276 @@
+"""
+Versioned model registry and hot-swapping loader.
+
+Each model version lives in its own folder under `artifacts/` (v1, v2, ...)
+with the files the app needs: rf_pipeline.joblib, features.json,
+feature_schema.json (when exported) and rf_compiled.npz. `artifacts/registry.json` lists the versions with their
+metadata and names the active one:
+
+    {"active": "v2",
+     "versions": {"v1": {"created": "...", "model_sha256": "...", ...},
+                  "v2": {...}}}
+
+`ModelLoader` is what the app holds on to. It re-reads the registry file
+when it changes, loads and warms a newly activated version on a background
+thread, and only then swaps it in, so users keep being served by the old
+model until the new one is ready. Without a registry file, v1 is active.
+
+    python -m src.registry list
+    python -m src.registry register MODEL.joblib FEATURES.json [--activate]
+    python -m src.registry activate v2
+"""
+import hashlib
+import json
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import ARTIFACTS_ROOT, MODEL_FILE, FEATURES_FILE, COMPILED_FILE, SCHEMA_FILE
+from src.utils import file_digest, load_feature_order
+
+MODEL_NAME = MODEL_FILE.name
+FEATURES_NAME = FEATURES_FILE.name
+COMPILED_NAME = COMPILED_FILE.name
+SCHEMA_NAME = SCHEMA_FILE.name
+
+
+# -- Registry file ----------------------------------------------------------
+
+def _registry_file(root):
+    return root / "registry.json"
+
+
+def read_registry(root=ARTIFACTS_ROOT):
+    """The registry dict; v1 only (and active) if no registry file exists."""
+    path = _registry_file(root)
+    if path.exists():
+        return json.loads(path.read_text())
+    versions = {"v1": {}} if (root / "v1" / MODEL_NAME).exists() else {}
+    return {"active": "v1" if versions else None, "versions": versions}
+
+
+def _write_registry(registry, root):
+    path = _registry_file(root)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(registry, indent=2) + "\n")
+    tmp.replace(path)  # readers see the old or the new file, never half of one
+
+
+def version_dir(version, root=ARTIFACTS_ROOT):
+    return root / version
+
+
+def active_version(root=ARTIFACTS_ROOT):
+    return read_registry(root)["active"]
+
+
+def active_dir(root=ARTIFACTS_ROOT):
+    """Folder of the active version (its model, features.json and schema)."""
+    version = active_version(root)
+    if version is None:
+        raise FileNotFoundError(f"No model version registered under {root}")
+    return version_dir(version, root)
+
+
+def activate(version, root=ARTIFACTS_ROOT):
+    registry = read_registry(root)
+    if version not in registry["versions"]:
+        raise KeyError(f"unknown model version {version!r}")
+    registry["active"] = version
+    _write_registry(registry, root)
+
+
+def register(model_path, features_path, metadata=None, activate_now=False,
+             root=ARTIFACTS_ROOT):
+    """
+    Copy a trained model + feature list (and the feature schema saved next
+    to the feature list, if any) into the next version folder, export its
+    compiled forest, record it in the registry and return the version.
+    """
+    import joblib
+    from src.compiled import CompiledForest
+
+    registry = read_registry(root)
+    numbers = [int(v[1:]) for v in registry["versions"] if v[1:].isdigit()]
+    version = f"v{max(numbers, default=0) + 1}"
+    dest = version_dir(version, root)
+    dest.mkdir(parents=True, exist_ok=False)
+    shutil.copy2(model_path, dest / MODEL_NAME)
+    shutil.copy2(features_path, dest / FEATURES_NAME)
+    schema_path = Path(features_path).parent / SCHEMA_NAME
+    if schema_path.exists():
+        shutil.copy2(schema_path, dest / SCHEMA_NAME)
+
+    digest = file_digest(dest / MODEL_NAME)
+    forest = CompiledForest.from_pipeline(joblib.load(dest / MODEL_NAME), source_digest=digest)
+    forest.validate(load_feature_order(dest / FEATURES_NAME))
+    forest.save(dest / COMPILED_NAME, float32_thresholds=True)
+
+    registry["versions"][version] = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "model_sha256": digest,
+        "n_features": len(load_feature_order(dest / FEATURES_NAME)),
+        **(metadata or {}),
+    }
+    if activate_now or registry["active"] is None:
+        registry["active"] = version
+    _write_registry(registry, root)
+    return version
+
+
+# -- Loaded model -------------------------------------------------------------
+
+class LoadedModel:
+    """One registry version, loaded: feature list and schema, scorer and cache key."""
+
+    def __init__(self, version, root=ARTIFACTS_ROOT):
+        from src.compiled import load_compiled
+        from src.schema import load_schema
+
+        folder = version_dir(version, root)
+        self.version = version
+        self.model_path = folder / MODEL_NAME
+        self.features_path = folder / FEATURES_NAME
+        if not self.model_path.exists():
+            raise FileNotFoundError(self.model_path)
+        self.feats = load_feature_order(self.features_path)
+        self.schema = load_schema(folder / SCHEMA_NAME)  # None for older exports
+        self.digest = file_digest(self.model_path)
+        self.compiled = load_compiled(folder / COMPILED_NAME, self.model_path,
+                                      self.features_path)
+        self._pipeline = None
+
+    def pipeline(self):
+        """The sklearn pipeline (unpickled on first use only)."""
+        if self._pipeline is None:
+            import joblib
+            self._pipeline = joblib.load(self.model_path)
+        return self._pipeline
+
+    def scorer(self):
+        """Object with sklearn's predict_proba: the compiled forest if present."""
+        return self.compiled if self.compiled is not None else self.pipeline()
+
+    def predict_one(self, row):
+        if self.compiled is not None:
+            return self.compiled.predict_one(row)
+        X = pd.DataFrame([row])[self.feats]
+        return float(self.pipeline().predict_proba(X)[0, 1])
+
+    def explain(self, df):
+        """(bias, per-feature contributions) for the rows of `df`; see CompiledForest.explain."""
+        if self.compiled is None:
+            from src.compiled import CompiledForest
+            self.compiled = CompiledForest.from_pipeline(self.pipeline(), self.digest)
+        bias, contrib = self.compiled.explain(df)
+        return bias, contrib[self.feats]
+
+    def warm(self):
+        """Score one all-missing row so first requests hit warm code paths."""
+        self.predict_one({f: np.nan for f in self.feats})
+        return self
+
+
+class ModelLoader:
+    """
+    Serves the active model and swaps in a newly activated one without a
+    restart. `get()` never blocks on a new version after the first load:
+    it starts a background load + warm-up and keeps returning the current
+    model until the new one is ready.
+    """
+
+    def __init__(self, root=ARTIFACTS_ROOT, poll_interval=2.0):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.error = None       # why the active version could not be loaded, if it failed
+        self._current = None
+        self._loading = None    # version being loaded in the background
+        self._thread = None
+        self._checked = 0.0
+        self._registry_sig = None
+        self._lock = threading.Lock()
+
+    def _registry_signature(self):
+        # The file's contents, not its (mtime, size): "v1" → "v2" keeps the
+        # size and can land within the filesystem's mtime resolution
+        path = _registry_file(self.root)
+        return hashlib.sha256(path.read_bytes()).hexdigest() if path.exists() else None
+
+    def _load(self, version, sig):
+        try:
+            model = LoadedModel(version, self.root).warm()
+        except Exception as e:  # keep serving the old version; retried on the next poll
+            with self._lock:
+                self.error, self._loading = e, None
+            return
+        with self._lock:
+            self._current, self._loading, self.error = model, None, None
+            self._registry_sig = sig
+
+    def get(self):
+        """The model to score with right now."""
+        if self._current is None:
+            with self._lock:
+                if self._current is None:
+                    self._current = LoadedModel(active_version(self.root), self.root).warm()
+                    self._registry_sig = self._registry_signature()
+                    self._checked = time.monotonic()
+            return self._current
+
+        now = time.monotonic()
+        if now - self._checked >= self.poll_interval:
+            self._checked = now
+            sig = self._registry_signature()
+            # The signature is only recorded once the active version is the one
+            # being served, so a failed load is retried on the next poll
+            if sig != self._registry_sig:
+                wanted = active_version(self.root)
+                with self._lock:
+                    if wanted == self._current.version:
+                        self._registry_sig, self.error = sig, None
+                    start = wanted not in (self._current.version, self._loading)
+                    if start:
+                        self._loading = wanted
+                if start:
+                    self._thread = threading.Thread(target=self._load, args=(wanted, sig),
+                                                    daemon=True)
+                    self._thread.start()
+        return self._current
+
+    def join(self, timeout=None):
+        """Wait for a background load to finish (used by tests and scripts)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Model version registry.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list")
+    reg = sub.add_parser("register")
+    reg.add_argument("model", type=Path)
+    reg.add_argument("features", type=Path)
+    reg.add_argument("--note", default=None)
+    reg.add_argument("--activate", action="store_true")
+    act = sub.add_parser("activate")
+    act.add_argument("version")
+    args = parser.parse_args()
+
+    if args.cmd == "register":
+        meta = {"note": args.note} if args.note else None
+        print(register(args.model, args.features, meta, activate_now=args.activate))
+    elif args.cmd == "activate":
+        activate(args.version)
+        print(f"Active → {args.version}")
+    else:
+        registry = read_registry()
+        for version, meta in registry["versions"].items():
+            mark = "*" if version == registry["active"] else " "
+            print(f"{mark} {version}  {meta.get('created', '')}  {meta.get('note', '')}")
@@ -0,0 +1,136 @@
+"""
+Bootstrap and permutation intervals for attrition-rate comparisons.
+
+Bootstrap: each group is resampled with replacement on its own (group
+sizes stay fixed). Resamples are drawn as NumPy index matrices, a batch
+of rows at a time so memory stays bounded. Labels are 0/1, so with the
+group's leavers placed first, index i is a leaver exactly when
+i < n_pos: a resampled rate is `(idx < n_pos).mean(axis=1)` and workers
+only need each group's two counts, never the rows themselves. Batch k
+of group g always uses the generator seeded with (seed, g, k), so the
+result does not depend on how many processes share the work; large jobs
+(n × resamples above PARALLEL_MIN_DRAWS) are spread over a process pool.
+
+Permutation: shuffling the labels of two pooled groups leaves the number
+of leavers landing in the first group hypergeometric, so the null
+distribution of the rate gap is drawn exactly with one
+`Generator.hypergeometric` call instead of shuffling index matrices.
+
+Results are cached per dataset content hash.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.utils import content_digest
+
+RESAMPLES = 10_000
+LEVEL = 0.95
+BATCH_ELEMENTS = 4_000_000          # indices per batch (~16 MB as int32)
+PARALLEL_MIN_DRAWS = 50_000_000     # n × resamples above this → process pool
+_PERM_STREAM = 2**32 - 1            # seed key of the permutation draws
+
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def _boot_batch(n, n_pos, size, key):
+    """Bootstrap rates for one batch of `size` resamples of an (n, n_pos) group."""
+    rng = np.random.default_rng(key)
+    idx = rng.integers(0, n, size=(size, n), dtype=np.int32)
+    return (idx < n_pos).mean(axis=1)
+
+
+def bootstrap_rates(n, n_pos, resamples=RESAMPLES, seed=0, n_jobs=None):
+    """
+    Bootstrap draws of each group's rate: array (resamples, groups).
+    `n`, `n_pos`: per-group head-counts and leavers.
+    """
+    n = np.asarray(n, dtype=np.int64)
+    n_pos = np.asarray(n_pos, dtype=np.int64)
+    jobs = []
+    for g, (ng, pg) in enumerate(zip(n, n_pos)):
+        step = max(1, BATCH_ELEMENTS // max(int(ng), 1))
+        for k, start in enumerate(range(0, resamples, step)):
+            jobs.append((g, int(ng), int(pg), min(step, resamples - start), (seed, g, k)))
+
+    parallel = int(n.sum()) * resamples >= PARALLEL_MIN_DRAWS and len(jobs) > 1
+    if parallel:
+        workers = n_jobs or min(len(jobs), os.cpu_count() or 1)
+        # spawn, not fork: the app process is multi-threaded
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            parts = list(pool.map(_boot_batch, *zip(*[j[1:] for j in jobs])))
+    else:
+        parts = [_boot_batch(*j[1:]) for j in jobs]
+
+    out = np.empty((resamples, len(n)))
+    for g in range(len(n)):
+        out[:, g] = np.concatenate([p for j, p in zip(jobs, parts) if j[0] == g])
+    return out
+
+
+def permutation_gaps(n_a, pos_a, n_b, pos_b, resamples=RESAMPLES, seed=0):
+    """Null draws of rate_a - rate_b when group labels carry no information."""
+    rng = np.random.default_rng((seed, _PERM_STREAM))
+    total_pos, total = pos_a + pos_b, n_a + n_b
+    in_a = rng.hypergeometric(total_pos, total - total_pos, n_a, size=resamples)
+    return in_a / n_a - (total_pos - in_a) / n_b
+
+
+def rate_intervals(table, high, low, resamples=RESAMPLES, level=LEVEL, seed=0):
+    """
+    Intervals for one contingency table (index = group, columns 0 / 1).
+
+    Returns (groups, gap): `groups` is a DataFrame [level, rate, ci_low,
+    ci_high] with a percentile bootstrap interval per group; `gap` is a
+    dict for rate[high] - rate[low] with its bootstrap interval, the
+    permutation p-value (two-sided) and the central `level` range of the
+    gap under the null hypothesis. None when `high` or `low` is not a
+    group of the table.
+    """
+    if high not in table.index or low not in table.index:
+        return None
+    n = table.sum(axis=1).to_numpy()
+    n_pos = table[1].to_numpy()
+    draws = bootstrap_rates(n, n_pos, resamples, seed)
+    tail = (1 - level) / 2 * 100
+    lo, hi = np.percentile(draws, [tail, 100 - tail], axis=0)
+    groups = pd.DataFrame({"level": table.index, "rate": n_pos / n,
+                           "ci_low": lo, "ci_high": hi})
+
+    a, b = list(table.index).index(high), list(table.index).index(low)
+    observed = n_pos[a] / n[a] - n_pos[b] / n[b]
+    boot_gap = draws[:, a] - draws[:, b]
+    null = permutation_gaps(n[a], n_pos[a], n[b], n_pos[b], resamples, seed)
+    gap = {
+        "gap": observed,
+        "ci_low": float(np.percentile(boot_gap, tail)),
+        "ci_high": float(np.percentile(boot_gap, 100 - tail)),
+        # add-one estimate: a permutation p-value is never exactly zero
+        "perm_p": (1 + np.sum(np.abs(null) >= abs(observed) - 1e-12)) / (resamples + 1),
+        "null_low": float(np.percentile(null, tail)),
+        "null_high": float(np.percentile(null, 100 - tail)),
+    }
+    return groups, gap
+
+
+def get_intervals(source, tables, specs, resamples=RESAMPLES, level=LEVEL, seed=0):
+    """
+    {hypothesis id: (groups, gap) or None} for every spec with a table
+    (None when one of its two groups is missing from the data), cached by
+    the dataset's content hash (and the resampling settings).
+    """
+    key = (content_digest(source), resamples, level, seed)
+    with _LOCK:
+        if key in _CACHE:
+            return _CACHE[key]
+    out = {s["id"]: rate_intervals(tables[s["id"]], s["high"], s["low"], resamples, level, seed)
+           for s in specs if s["id"] in tables}
+    with _LOCK:
+        _CACHE[key] = out
+    return out
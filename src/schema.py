@@ -0,0 +1,106 @@
+"""
+Typed feature schema exported next to the model at training time.
+
+`features.json` only lists column names; `feature_schema.json` also
+records, for every feature, what the model saw in training:
+
+    {"features": {
+        "Age":      {"kind": "numeric", "dtype": "int64",
+                     "min": 18, "max": 60, "median": 36.0},
+        "JobLevel": {"kind": "categorical", "dtype": "int64",
+                     "categories": [1, 2, 3, 4, 5], "mode": 1},
+        ...}}
+
+The Attrition Predictor builds its form from it without reading the
+dataset, and batch scoring checks each record batch against it with a
+few vectorised comparisons per column.
+
+    python -m src.schema    # rebuild artifacts/v1/feature_schema.json
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.config import SCHEMA_FILE
+
+PROBLEMS = ["missing", "not_numeric", "unknown_category", "below_min", "above_max"]
+
+
+def _plain(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def build_schema(df, num_features, cat_features):
+    """Schema of the training frame `df` (features in num + cat order)."""
+    features = {}
+    for f in num_features:
+        ser = pd.to_numeric(df[f], errors="coerce")
+        features[f] = {
+            "kind": "numeric", "dtype": str(df[f].dtype),
+            "min": _plain(ser.min()), "max": _plain(ser.max()),
+            "median": float(ser.median()),
+        }
+    for f in cat_features:
+        ser = df[f].dropna()
+        features[f] = {
+            "kind": "categorical", "dtype": str(df[f].dtype),
+            "categories": sorted(_plain(v) for v in ser.unique()),
+            "mode": _plain(ser.mode().iloc[0]) if len(ser) else None,
+        }
+    return {"features": features}
+
+
+def save_schema(schema, path=SCHEMA_FILE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(schema, indent=2) + "\n")
+
+
+def load_schema(path=SCHEMA_FILE):
+    """The schema dict, or None when the model was exported without one."""
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def is_integer(spec):
+    return spec["dtype"].startswith(("int", "uint"))
+
+
+def validate_frame(df, schema):
+    """
+    Count invalid values per feature: DataFrame [feature, problem, rows],
+    one row per (feature, problem) that occurs. `not_numeric` and
+    `unknown_category` values are ones the model cannot use as given
+    (the pipeline would impute or ignore them); `below_min` / `above_max`
+    are outside the training range, and `missing` values get imputed.
+    """
+    rows = []
+    for f, spec in schema["features"].items():
+        ser = df[f]
+        counts = {"missing": int(ser.isna().sum())}
+        if spec["kind"] == "numeric":
+            num = pd.to_numeric(ser, errors="coerce")
+            counts["not_numeric"] = int((num.isna() & ser.notna()).sum())
+            values = num.to_numpy(dtype=np.float64)
+            with np.errstate(invalid="ignore"):
+                counts["below_min"] = int((values < spec["min"]).sum())
+                counts["above_max"] = int((values > spec["max"]).sum())
+        else:
+            counts["unknown_category"] = int((~ser.isin(spec["categories"]) & ser.notna()).sum())
+        rows += [(f, p, n) for p, n in counts.items() if n]
+    return pd.DataFrame(rows, columns=["feature", "problem", "rows"])
+
+
+if __name__ == "__main__":
+    from sklearn.model_selection import train_test_split
+
+    from src.config import READY_PARQUET
+    from src.features import CAT_FEATURES, NUM_FEATURES
+
+    df = pd.read_parquet(READY_PARQUET)
+    # The training split of notebook 03
+    Xtr, _, _, _ = train_test_split(df[NUM_FEATURES + CAT_FEATURES], df["target"],
+                                    test_size=0.2, stratify=df["target"], random_state=42)
+    save_schema(build_schema(Xtr, NUM_FEATURES, CAT_FEATURES))
+    print(f"Saved schema for {Xtr.shape[1]} features ({len(Xtr):,} training rows) → {SCHEMA_FILE}")
@@ -0,0 +1,95 @@
+"""
+Persisted model scores for the evaluation page.
+
+Scores for the whole ready dataset are written once to a sidecar parquet
+named after a hash of the model file plus the dataset file, e.g.
+`artifacts/v1/scores/scores-<key>.parquet`. Any process (or a restarted
+one) reuses it; a new model or a new dataset simply gets a new key.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+
+import pandas as pd
+
+from src.config import SCORES_DIR
+from src.utils import content_digest
+
+KEEP_FILES = 3  # older sidecars beyond this are pruned
+
+_MEMORY = {}    # key → scores frame already read in this process
+_LOCK = threading.Lock()
+
+
+def scores_key(model_path, data_path):
+    """Content hash of the (model, dataset) pair."""
+    h = hashlib.sha256()
+    h.update(content_digest(model_path).encode())
+    h.update(content_digest(data_path).encode())
+    return h.hexdigest()[:20]
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:  # pruned by another process meanwhile
+        return -1
+
+
+def _prune(scores_dir, keep):
+    # In-flight writes are ".scores-*.tmp" files, which this glob never matches
+    files = sorted(scores_dir.glob("scores-*.parquet"), key=_mtime, reverse=True)
+    for old in files[keep:]:
+        old.unlink(missing_ok=True)
+
+
+def _write(path, scores):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A temp name unique to this writer, so processes scoring the same pair
+    # never write into the same file
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".scores-", suffix=".tmp",
+                                     delete=False) as f:
+        tmp = f.name
+    try:
+        scores.to_parquet(tmp, index=False)
+        os.replace(tmp, path)  # atomic: readers never see a half-written file
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    _prune(path.parent, KEEP_FILES)
+
+
+def store_scores(model_path, data_path, scores, scores_dir=SCORES_DIR):
+    """
+    Save scores computed elsewhere (e.g. assembled from snapshot
+    partitions) as the sidecar for this (model, dataset) pair.
+    """
+    _write(scores_dir / f"scores-{scores_key(model_path, data_path)}.parquet", scores)
+
+
+def load_or_score(model_path, data_path, feats, get_model, get_data,
+                  scores_dir=SCORES_DIR):
+    """
+    Return a DataFrame with `probability` (and `target` when the data has it).
+
+    `get_model()` / `get_data()` are only called when no sidecar exists
+    for the current (model, dataset) contents.
+    """
+    key = scores_key(model_path, data_path)
+    with _LOCK:
+        if key in _MEMORY:
+            return _MEMORY[key]
+    path = scores_dir / f"scores-{key}.parquet"
+    try:
+        scores = pd.read_parquet(path)
+    except FileNotFoundError:  # never written, or pruned by another process
+        df = get_data()
+        scores = pd.DataFrame({"probability": get_model().predict_proba(df[feats])[:, 1]})
+        if "target" in df.columns:
+            scores.insert(0, "target", df["target"].to_numpy())
+        _write(path, scores)
+    with _LOCK:
+        _MEMORY.clear()
+        _MEMORY[key] = scores
+    return scores
@@ -0,0 +1,168 @@
+"""
+Batch scoring for whole-workforce files.
+
+Streams a CSV / parquet file (or a folder of parquet files) through the
+trained pipeline one record batch at a time and appends the results to a
+parquet file, so memory stays bounded by the batch size, not the file size.
+Each batch is checked against the model's feature schema (unknown
+categories, non-numeric or out-of-range values) with vectorised
+comparisons; problems are counted and reported, or raise with --strict.
+
+    python -m src.scoring employees.parquet scored.parquet --keep EmployeeNumber
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.config import LOW_RISK_MAX, HIGH_RISK_MIN
+from src.registry import FEATURES_NAME, MODEL_NAME, SCHEMA_NAME, active_dir
+from src.schema import load_schema, validate_frame
+from src.utils import load_feature_order
+
+BATCH_SIZE = 65_536
+# Values the model cannot use as given; --strict stops on these
+BLOCKING = ("not_numeric", "unknown_category")
+
+
+def risk_band(prob):
+    """Label one probability Low / Medium / High (same cut-offs as the app)."""
+    if prob < LOW_RISK_MAX:
+        return "Low"
+    elif prob < HIGH_RISK_MIN:
+        return "Medium"
+    return "High"
+
+
+def risk_bands(probs):
+    """Vectorised `risk_band` for an array of probabilities."""
+    probs = np.asarray(probs)
+    return np.where(probs < LOW_RISK_MAX, "Low",
+                    np.where(probs < HIGH_RISK_MIN, "Medium", "High"))
+
+
+def _open(path):
+    fmt = "csv" if path.suffix == ".csv" else "parquet"
+    return ds.dataset(path, format=fmt)
+
+
+def _check(X, schema, issues, strict):
+    report = validate_frame(X, schema)
+    for feat, problem, n in report.itertuples(index=False):
+        issues[(feat, problem)] = issues.get((feat, problem), 0) + n
+    blocking = report[report["problem"].isin(BLOCKING)]
+    if strict and len(blocking):
+        raise ValueError("Invalid input values: " + ", ".join(
+            f"{f} {p} ×{n}" for f, p, n in blocking.itertuples(index=False)))
+
+
+def score_batches(pipe, feats, source, keep=(), batch_size=BATCH_SIZE,
+                  schema=None, issues=None, strict=False):
+    """
+    Yield one Arrow table of [keep..., probability, risk_band] per input batch.
+
+    With a feature `schema`, every batch is validated first: problem counts
+    are added to the `issues` dict ({(feature, problem): rows}), and with
+    `strict` unusable values raise ValueError.
+    """
+    data = _open(source)
+    missing = [c for c in feats if c not in data.schema.names]
+    if missing:
+        raise ValueError(f"Missing feature columns in {source}: {missing}")
+    keep = [c for c in keep if c in data.schema.names and c not in feats]
+    scanner = data.scanner(columns=[*feats, *keep], batch_size=batch_size,
+                           batch_readahead=1, fragment_readahead=1)
+    for batch in scanner.to_batches():
+        if batch.num_rows == 0:
+            continue
+        X = batch.select(feats).to_pandas()
+        if schema is not None:
+            _check(X, schema, {} if issues is None else issues, strict)
+        probs = pipe.predict_proba(X)[:, 1]
+        cols = {c: batch.column(c) for c in keep}
+        cols["probability"] = pa.array(probs, type=pa.float64())
+        cols["risk_band"] = pa.array(risk_bands(probs))
+        yield pa.table(cols)
+
+
+def score_file(source, dest, model_path=None, features_path=None,
+               keep=(), batch_size=BATCH_SIZE, schema_path=None, issues=None,
+               strict=False):
+    """
+    Score every row of `source` into the parquet file `dest`; returns the row
+    count. The model defaults to the registry's active version and the
+    feature list and schema to the ones next to the model. Input is
+    validated against the schema when that file exists (see
+    `score_batches` for `issues` and `strict`).
+    """
+    if model_path is None:
+        model_path = active_dir() / MODEL_NAME
+    if features_path is None:
+        features_path = model_path.parent / FEATURES_NAME
+    if schema_path is None:
+        schema_path = model_path.parent / SCHEMA_NAME
+    pipe = joblib.load(model_path)
+    feats = load_feature_order(features_path)
+    schema = load_schema(schema_path)
+    if schema is not None:
+        schema = {"features": {f: schema["features"][f] for f in feats
+                               if f in schema["features"]}}
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    # Batches go to a temp file that replaces `dest` only once every batch
+    # is written, so a failure partway never leaves a truncated score file
+    with tempfile.NamedTemporaryFile(dir=dest.parent, prefix=f".{dest.name}-", suffix=".tmp",
+                                     delete=False) as f:
+        tmp = f.name
+    writer, rows = None, 0
+    try:
+        try:
+            for table in score_batches(pipe, feats, source, keep, batch_size,
+                                       schema, issues, strict):
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp, table.schema)
+                writer.write_table(table)
+                rows += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is not None:
+            os.replace(tmp, dest)  # atomic: readers never see a half-written file
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return rows
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Score a workforce file in batches.")
+    parser.add_argument("source", type=Path, help="CSV / parquet file or parquet folder")
+    parser.add_argument("dest", type=Path, help="output parquet file")
+    parser.add_argument("--keep", nargs="*", default=["EmployeeNumber"],
+                        help="columns copied through to the output (e.g. an ID)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--model", type=Path, default=None,
+                        help="pipeline file (default: the registry's active version)")
+    parser.add_argument("--features", type=Path, default=None,
+                        help="feature list (default: features.json next to the model)")
+    parser.add_argument("--schema", type=Path, default=None,
+                        help="feature schema (default: feature_schema.json next to the model)")
+    parser.add_argument("--strict", action="store_true",
+                        help="stop on non-numeric values or unknown categories")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    issues = {}
+    n = score_file(args.source, args.dest, args.model, args.features,
+                   keep=args.keep, batch_size=args.batch_size,
+                   schema_path=args.schema, issues=issues, strict=args.strict)
+    print(f"Scored {n:,} rows → {args.dest} in {time.perf_counter() - t0:.1f}s")
+    for (feat, problem), rows in sorted(issues.items()):
+        print(f"  {feat}: {rows:,} rows {problem.replace('_', ' ')}")
@@ -0,0 +1,413 @@
+"""
+HTTP scoring service for other internal systems (standard library only).
+
+Concurrent requests are not scored one by one: each validated row goes
+onto a queue, and a single batcher task collects whatever arrives within
+`max_wait_ms` (or up to `max_batch` rows) and scores the lot with one
+predict_proba call in a worker thread. While a batch is being scored the
+next one keeps filling, so batches grow with load instead of requests
+queueing behind each other.
+
+The model is the registry's active version (compiled forest when
+available, otherwise the pipeline), loaded once; activating a new
+version swaps it in without a restart.
+
+    POST /predict   {"Age": 35, "OverTime": "Yes", ...}
+                    or {"rows": [{...}, {...}]}
+                    → {"model_version": "v1", "predictions": [{"probability", "risk_band"}]}
+    GET  /metrics   Prometheus text: latency / batch-size histograms, queue depth
+    GET  /health    {"status": "ok", "model_version": ..., "queue_depth": ...}
+                    ("degraded" plus "load_error" while a newly activated
+                    version fails to load)
+
+    python -m src.serve --port 8080 --max-batch 256 --max-wait-ms 5
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from numbers import Number
+
+import pandas as pd
+
+from src.config import ARTIFACTS_ROOT
+from src.scoring import risk_bands
+
+MAX_BATCH = 256
+MAX_WAIT_MS = 5.0
+MAX_QUEUE = 10_000
+MAX_BODY = 1 << 20  # bytes
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 422: "Unprocessable Entity",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class ValidationError(ValueError):
+    """Payload that cannot be scored; `problems` lists every reason."""
+
+    def __init__(self, problems):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition format."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def render(self, name, help_text):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        total = 0
+        for bound, n in zip(self.buckets, self.counts):
+            total += n
+            lines.append(f'{name}_bucket{{le="{bound}"}} {total}')
+        lines += [f'{name}_bucket{{le="+Inf"}} {self.count}',
+                  f"{name}_sum {self.sum:.6f}", f"{name}_count {self.count}"]
+        return lines
+
+
+def vocabulary(model):
+    """{categorical feature: known values} from the feature schema or the one-hot encoder."""
+    if model.schema is not None:
+        return {f: spec["categories"] for f, spec in model.schema["features"].items()
+                if spec["kind"] == "categorical"}
+    if model.compiled is not None:
+        meta = model.compiled.meta
+        return dict(zip(meta["cat_features"], meta["categories"]))
+    pre = model.pipeline().named_steps["pre"]
+    encoder = pre.named_transformers_["cat"].named_steps["onehot"]
+    return {f: [c.item() if hasattr(c, "item") else c for c in cats]
+            for f, cats in zip(pre.transformers_[1][2], encoder.categories_)}
+
+
+def validate_row(payload, feats, categories):
+    """
+    Check one JSON object and return {feature: value} in `feats` order.
+
+    Numeric features take a finite number or null (imputed like in
+    training); categorical features must be one of the values the model
+    was trained on, with the same type (JobLevel is 2, not "2"), or null.
+    Unknown keys are rejected so typos do not silently fall back to
+    imputation.
+    """
+    if not isinstance(payload, dict):
+        raise ValidationError(["each row must be a JSON object"])
+    problems = [f"unknown field '{k}'" for k in payload if k not in feats]
+    row = {}
+    for f in feats:
+        if f not in payload:
+            problems.append(f"missing field '{f}'")
+            continue
+        v = payload[f]
+        if v is None:
+            row[f] = math.nan
+        elif f in categories:
+            known = categories[f]
+            if isinstance(v, bool) or v not in known or type(v) is not type(known[0]):
+                problems.append(f"'{f}' must be one of {known}, got {v!r}")
+            row[f] = v
+        elif isinstance(v, Number) and not isinstance(v, bool) and math.isfinite(v):
+            row[f] = float(v)
+        else:
+            problems.append(f"'{f}' must be a finite number, got {v!r}")
+    if problems:
+        raise ValidationError(problems)
+    return row
+
+
+def parse_payload(body, feats, categories):
+    """Rows from a /predict body: one object, or {"rows": [objects]}."""
+    try:
+        payload = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValidationError([f"invalid JSON: {e}"])
+    if isinstance(payload, dict) and "rows" in payload:
+        rows = payload["rows"]
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError(["'rows' must be a non-empty list"])
+    else:
+        rows = [payload]
+    out, problems = [], []
+    for i, r in enumerate(rows):
+        try:
+            out.append(validate_row(r, feats, categories))
+        except ValidationError as e:
+            problems += [f"row {i}: {p}" for p in e.problems] if len(rows) > 1 else e.problems
+    if problems:
+        raise ValidationError(problems)
+    return out
+
+
+class MicroBatcher:
+    """
+    Merge rows submitted concurrently into one predict_proba call.
+
+    `submit(row)` awaits the row's probability. The batcher task takes the
+    first waiting row, then keeps collecting until `max_batch` rows or
+    `max_wait_ms` have passed, and scores them in a worker thread.
+    """
+
+    def __init__(self, loader, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS,
+                 max_queue=MAX_QUEUE):
+        self.loader = loader
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue(max_queue)
+        self.batch_sizes = Histogram(BATCH_BUCKETS)
+        self.predict_seconds = Histogram(LATENCY_BUCKETS)
+        self.max_depth = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def submit(self, rows):
+        """Futures for `rows`; raises asyncio.QueueFull when the queue is full."""
+        if self.queue.qsize() + len(rows) > self.queue.maxsize:
+            raise asyncio.QueueFull
+        loop = asyncio.get_running_loop()
+        futures = []
+        for row in rows:
+            fut = loop.create_future()
+            self.queue.put_nowait((row, fut))
+            futures.append(fut)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return futures
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch:
+            # drain what is already waiting without yielding
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            remaining = deadline - asyncio.get_running_loop().time()
+            if len(batch) >= self.max_batch or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _predict(self, rows):
+        model = self.loader.get()
+        X = pd.DataFrame(rows, columns=model.feats)
+        return model.version, model.scorer().predict_proba(X)[:, 1]
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            live = [(row, fut) for row, fut in batch if not fut.done()]
+            if not live:
+                continue
+            t0 = time.perf_counter()
+            try:
+                version, probs = await asyncio.to_thread(self._predict, [r for r, _ in live])
+            except Exception as e:
+                for _, fut in live:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            self.predict_seconds.observe(time.perf_counter() - t0)
+            self.batch_sizes.observe(len(live))
+            for (_, fut), p in zip(live, probs):
+                if not fut.done():
+                    fut.set_result((version, float(p)))
+
+
+class ScoringService:
+    """Routes, request parsing and metrics around a `MicroBatcher`."""
+
+    def __init__(self, loader, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS,
+                 max_queue=MAX_QUEUE):
+        self.loader = loader
+        self.batcher = MicroBatcher(loader, max_batch, max_wait_ms, max_queue)
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.responses = {}
+        self._vocab = (None, None)  # (model digest, vocabulary)
+
+    def _categories(self, model):
+        if self._vocab[0] != model.digest:
+            self._vocab = (model.digest, vocabulary(model))
+        return self._vocab[1]
+
+    async def predict(self, body):
+        model = self.loader.get()
+        rows = parse_payload(body, model.feats, self._categories(model))
+        results = await asyncio.gather(*self.batcher.submit(rows))
+        probs = [p for _, p in results]
+        return {
+            "model_version": results[0][0],
+            "predictions": [{"probability": p, "risk_band": str(b)}
+                            for p, b in zip(probs, risk_bands(probs))],
+        }
+
+    def health(self):
+        model = self.loader.get()
+        out = {"status": "ok", "model_version": model.version,
+               "queue_depth": self.batcher.queue.qsize()}
+        if self.loader.error is not None:  # still serving the previous version
+            out.update(status="degraded", load_error=str(self.loader.error))
+        return out
+
+    def metrics(self):
+        b = self.batcher
+        lines = self.latency.render("scoring_request_seconds",
+                                    "End-to-end /predict latency.")
+        lines += b.predict_seconds.render("scoring_batch_predict_seconds",
+                                          "predict_proba time per micro-batch.")
+        lines += b.batch_sizes.render("scoring_batch_rows", "Rows per micro-batch.")
+        lines += ["# HELP scoring_queue_depth Rows waiting for a batch.",
+                  "# TYPE scoring_queue_depth gauge",
+                  f"scoring_queue_depth {b.queue.qsize()}",
+                  "# HELP scoring_queue_depth_max Highest queue depth seen.",
+                  "# TYPE scoring_queue_depth_max gauge",
+                  f"scoring_queue_depth_max {b.max_depth}",
+                  "# HELP scoring_responses_total Responses by status code.",
+                  "# TYPE scoring_responses_total counter"]
+        lines += [f'scoring_responses_total{{code="{c}"}} {n}'
+                  for c, n in sorted(self.responses.items())]
+        return "\n".join(lines) + "\n"
+
+    async def route(self, method, path, body):
+        """(status, content type, payload bytes) for one request."""
+        path = path.split("?", 1)[0]
+        routes = {"/predict": "POST", "/metrics": "GET", "/health": "GET"}
+        if path not in routes:
+            return _json(404, {"error": f"no route {path}"})
+        if method != routes[path]:
+            return _json(405, {"error": f"{path} only accepts {routes[path]}"})
+        if path == "/health":
+            return _json(200, self.health())
+        if path == "/metrics":
+            return 200, "text/plain; version=0.0.4", self.metrics().encode()
+        t0 = time.perf_counter()
+        try:
+            out = _json(200, await self.predict(body))
+        except ValidationError as e:
+            return _json(422, {"error": "invalid payload", "problems": e.problems})
+        except asyncio.QueueFull:
+            return _json(503, {"error": "scoring queue is full, retry later"})
+        self.latency.observe(time.perf_counter() - t0)
+        return out
+
+    async def handle(self, reader, writer):
+        """One connection; HTTP/1.1 keep-alive until the client closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, *_json(400, {"error": "bad request line"}), False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._send(writer, *_json(400, {"error": "bad content-length"}), False)
+                    break
+                if length > MAX_BODY:
+                    await self._send(writer, *_json(413, {"error": "body too large"}), False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    response = await self.route(method, path, body)
+                except Exception as e:  # keep the server up; report the failure
+                    response = _json(500, {"error": str(e)})
+                await self._send(writer, *response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, status, content_type, payload, keep_alive):
+        self.responses[status] = self.responses.get(status, 0) + 1
+        head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+
+def _json(status, obj):
+    return status, "application/json", json.dumps(obj).encode()
+
+
+async def start_service(host="127.0.0.1", port=8080, root=ARTIFACTS_ROOT,
+                        max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, max_queue=MAX_QUEUE):
+    """Load the active model, start the batcher and listen; returns (service, server)."""
+    from src.registry import ModelLoader
+
+    loader = ModelLoader(root)
+    await asyncio.to_thread(loader.get)  # load + warm before accepting traffic
+    service = ScoringService(loader, max_batch, max_wait_ms, max_queue)
+    service.batcher.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    return service, server
+
+
+async def _main(args):
+    service, server = await start_service(args.host, args.port, max_batch=args.max_batch,
+                                          max_wait_ms=args.max_wait_ms,
+                                          max_queue=args.max_queue)
+    model = service.loader.get()
+    print(f"Serving model {model.version} on http://{args.host}:{args.port} "
+          f"(batches ≤ {args.max_batch} rows, ≤ {args.max_wait_ms} ms wait)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching HTTP scoring service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--max-queue", type=int, default=MAX_QUEUE)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
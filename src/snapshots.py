@@ -0,0 +1,274 @@
+"""
+Append-only store of monthly HR snapshots, partitioned by date and Department.
+
+Each ingested snapshot is split into one parquet file per
+(snapshot_date, Department) under
+`data/snapshots/snapshot_date=<date>/Department=<name>/part-r<rev>.parquet`,
+and `manifest.json` lists the current revision of every partition with
+its row count and a content hash. Files are never rewritten: re-ingesting
+a month only writes the departments whose rows changed (as a new
+revision), and identical partitions are skipped.
+
+Everything derived from a partition — its cube cells, correlation
+segment statistics and model scores — is stored under
+`_derived/<content hash>/`, so it is computed once per distinct partition
+and reused by every later refresh. Department is a filter dimension of
+both the cube and the correlation statistics, so a snapshot's cells are
+exactly the union of its partitions' cells: publishing a month
+concatenates the pieces instead of re-aggregating every row.
+
+    python -m src.snapshots ingest employees-2026-09.parquet --date 2026-09-30
+    python -m src.snapshots refresh --publish
+    python -m src.snapshots list
+"""
+import argparse
+import hashlib
+import json
+from datetime import date, datetime, timezone
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from src.config import CORR_PARQUET, CUBE_PARQUET, READY_PARQUET, SCORES_DIR, SNAPSHOT_DIR
+from src.corr_stats import build_corr_stats, save_corr_stats
+from src.cube import CUBE_FEATURES, FILTER_DIMS, build_cube, save_cube
+from src.utils import yes_no_to_binary
+
+MANIFEST_NAME = "manifest.json"
+DERIVED_DIR = "_derived"
+
+
+# -- Manifest -----------------------------------------------------------------
+
+def read_manifest(store=SNAPSHOT_DIR):
+    path = store / MANIFEST_NAME
+    if not path.exists():
+        return {"partitions": []}
+    return json.loads(path.read_text())
+
+
+def _write_manifest(manifest, store):
+    store.mkdir(parents=True, exist_ok=True)
+    tmp = store / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2) + "\n")
+    tmp.replace(store / MANIFEST_NAME)  # atomic swap
+
+
+def snapshot_dates(store=SNAPSHOT_DIR):
+    """Ingested snapshot dates, oldest first."""
+    return sorted({p["snapshot_date"] for p in read_manifest(store)["partitions"]})
+
+
+def partitions(snapshot_date, store=SNAPSHOT_DIR):
+    """Manifest entries of one snapshot, sorted by Department."""
+    parts = [p for p in read_manifest(store)["partitions"]
+             if p["snapshot_date"] == snapshot_date]
+    return sorted(parts, key=lambda p: p["Department"])
+
+
+# -- Ingestion ----------------------------------------------------------------
+
+def prepare(df):
+    """
+    Notebook 02's transform: add the 0/1 `target` when only Attrition is
+    present. Rows without a Department are rejected, not silently dropped.
+    """
+    if "Department" not in df.columns:
+        raise ValueError("Snapshot has no 'Department' column to partition by.")
+    missing = int(df["Department"].isna().sum())
+    if missing:
+        raise ValueError(f"{missing:,} snapshot rows have no Department; every row "
+                         "needs one to be stored in a partition.")
+    if "target" not in df.columns:
+        if "Attrition" not in df.columns:
+            raise ValueError("Snapshot needs an 'Attrition' or 'target' column.")
+        df = df.assign(target=yes_no_to_binary(df["Attrition"]))
+    return df
+
+
+def partition_digest(df):
+    """Content hash of a partition's rows (column names, order and values)."""
+    h = hashlib.sha256()
+    h.update(json.dumps(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def ingest(df, snapshot_date, store=SNAPSHOT_DIR, replace=False):
+    """
+    Append one snapshot; returns {"added": [...], "replaced": [...], "unchanged": [...]}
+    (lists of Department names).
+
+    A Department already ingested for this date with different rows is an
+    error unless `replace=True`, which writes a new revision and points the
+    manifest at it (the old file stays on disk). Departments missing from
+    `df` keep their existing partitions.
+    """
+    snapshot_date = date.fromisoformat(str(snapshot_date)).isoformat()
+    df = prepare(df).reset_index(drop=True)
+    manifest = read_manifest(store)
+    current = {(p["snapshot_date"], p["Department"]): p for p in manifest["partitions"]}
+    result = {"added": [], "replaced": [], "unchanged": []}
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    for dept, part in df.groupby("Department", sort=True):
+        part = part.reset_index(drop=True)
+        digest = partition_digest(part)
+        old = current.get((snapshot_date, dept))
+        if old is not None and old["sha256"] == digest:
+            result["unchanged"].append(dept)
+            continue
+        if old is not None and not replace:
+            raise ValueError(f"{snapshot_date} / {dept} was already ingested with different "
+                             "rows; pass replace=True to add a new revision.")
+        revision = 1 if old is None else old["revision"] + 1
+        rel = (f"snapshot_date={snapshot_date}/Department={quote(dept, safe='')}"
+               f"/part-r{revision}.parquet")
+        (store / rel).parent.mkdir(parents=True, exist_ok=True)
+        part.to_parquet(store / rel, index=False)
+        current[(snapshot_date, dept)] = {
+            "snapshot_date": snapshot_date, "Department": dept, "revision": revision,
+            "path": rel, "rows": len(part), "sha256": digest, "ingested": now,
+        }
+        result["replaced" if old is not None else "added"].append(dept)
+    manifest["partitions"] = sorted(current.values(),
+                                    key=lambda p: (p["snapshot_date"], p["Department"]))
+    _write_manifest(manifest, store)
+    return result
+
+
+# -- Derived data, one partition at a time ------------------------------------
+
+def _derived(entry, store):
+    return store / DERIVED_DIR / entry["sha256"][:20]
+
+
+def _scores_name(model):
+    return f"scores-{model.digest[:16]}.parquet"
+
+
+def refresh(snapshot_date=None, store=SNAPSHOT_DIR, model=None):
+    """
+    Build the cube cells, correlation statistics and (with `model`) scores
+    of every partition that does not have them yet. Returns
+    {"computed": n, "reused": m} counted in partitions.
+    """
+    entries = (partitions(snapshot_date, store) if snapshot_date is not None
+               else read_manifest(store)["partitions"])
+    counts = {"computed": 0, "reused": 0}
+    for entry in entries:
+        out = _derived(entry, store)
+        wanted = {"cube.parquet", "corr.parquet"}
+        if model is not None:
+            wanted.add(_scores_name(model))
+        missing = {name for name in wanted if not (out / name).exists()}
+        if not missing:
+            counts["reused"] += 1
+            continue
+        df = pd.read_parquet(store / entry["path"])
+        out.mkdir(parents=True, exist_ok=True)
+        if "cube.parquet" in missing:
+            build_cube(df).to_parquet(out / "cube.parquet", index=False)
+        if "corr.parquet" in missing:
+            build_corr_stats(df).to_parquet(out / "corr.parquet", index=False)
+        if model is not None and _scores_name(model) in missing:
+            scores = pd.DataFrame({
+                "target": df["target"].to_numpy(),
+                "probability": model.scorer().predict_proba(df[model.feats])[:, 1],
+            })
+            scores.to_parquet(out / _scores_name(model), index=False)
+        counts["computed"] += 1
+    return counts
+
+
+def load_snapshot(snapshot_date, store=SNAPSHOT_DIR):
+    """All rows of one snapshot (partitions in Department order)."""
+    parts = [pd.read_parquet(store / p["path"]) for p in partitions(snapshot_date, store)]
+    if not parts:
+        raise KeyError(f"No snapshot {snapshot_date} in {store}")
+    return pd.concat(parts, ignore_index=True)
+
+
+def snapshot_aggregates(snapshot_date, store=SNAPSHOT_DIR):
+    """
+    (cube, corr_stats) of one snapshot assembled from its partitions'
+    pieces; call `refresh` first. Each partition holds one Department, so
+    no cell appears twice and concatenation is exact.
+    """
+    entries = partitions(snapshot_date, store)
+    cube = pd.concat([pd.read_parquet(_derived(e, store) / "cube.parquet") for e in entries],
+                     ignore_index=True)
+    block = cube["feature"].map({f: i for i, f in enumerate(CUBE_FEATURES)})
+    cube = cube.iloc[np.argsort(block.to_numpy(), kind="stable")].reset_index(drop=True)
+    corr = pd.concat([pd.read_parquet(_derived(e, store) / "corr.parquet") for e in entries],
+                     ignore_index=True)
+    dims = [d for d in FILTER_DIMS if d in corr.columns]
+    corr = corr.sort_values(dims, kind="stable", ignore_index=True)
+    return cube, corr
+
+
+def snapshot_scores(snapshot_date, model, store=SNAPSHOT_DIR):
+    """[target, probability] for every row of `load_snapshot`, in the same order."""
+    return pd.concat([pd.read_parquet(_derived(e, store) / _scores_name(model))
+                      for e in partitions(snapshot_date, store)], ignore_index=True)
+
+
+def publish(snapshot_date=None, store=SNAPSHOT_DIR, model=None, ready_path=READY_PARQUET,
+            cube_path=CUBE_PARQUET, corr_path=CORR_PARQUET, scores_dir=SCORES_DIR):
+    """
+    Make a snapshot (default: the latest) the app's dataset: write the
+    ready parquet, then the cube and correlation statistics assembled from
+    the partitions, and with `model` the page 5 score sidecar, so the app
+    reuses all of them instead of recomputing. Returns the date published.
+    """
+    snapshot_date = snapshot_date or snapshot_dates(store)[-1]
+    refresh(snapshot_date, store, model)
+    df = load_snapshot(snapshot_date, store)
+    cube, corr = snapshot_aggregates(snapshot_date, store)
+    # ready file first: the aggregates record its digest
+    ready_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ready_path.with_suffix(".tmp")
+    df.to_parquet(tmp, index=False)
+    tmp.replace(ready_path)
+    save_cube(cube, cube_path, source=ready_path)
+    save_corr_stats(corr, corr_path, source=ready_path)
+    if model is not None:
+        from src.score_cache import store_scores
+        store_scores(model.model_path, ready_path,
+                     snapshot_scores(snapshot_date, model, store), scores_dir)
+    return snapshot_date
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partitioned HR snapshot store.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_ing = sub.add_parser("ingest", help="append a snapshot file (CSV or parquet)")
+    p_ing.add_argument("path")
+    p_ing.add_argument("--date", required=True, help="snapshot date, YYYY-MM-DD")
+    p_ing.add_argument("--replace", action="store_true",
+                       help="add new revisions for departments whose rows changed")
+    p_ref = sub.add_parser("refresh", help="build derived data for new partitions")
+    p_ref.add_argument("--date", default=None)
+    p_ref.add_argument("--publish", action="store_true",
+                       help="also make the snapshot (default: latest) the app's dataset")
+    sub.add_parser("list", help="show the manifest")
+    args = parser.parse_args()
+
+    if args.cmd == "ingest":
+        from pathlib import Path
+        path = Path(args.path)
+        frame = pd.read_csv(path) if path.suffix == ".csv" else pd.read_parquet(path)
+        result = ingest(frame, args.date, replace=args.replace)
+        for kind, depts in result.items():
+            print(f"{kind:>9}: {', '.join(depts) or '-'}")
+    elif args.cmd == "refresh":
+        from src.registry import LoadedModel, active_version
+        model = LoadedModel(active_version())
+        counts = refresh(args.date, model=model)
+        print(f"Partitions computed: {counts['computed']}, reused: {counts['reused']}")
+        if args.publish:
+            print(f"Published {publish(args.date, model=model)} → {READY_PARQUET}")
+    else:
+        for p in read_manifest()["partitions"]:
+            print(f"{p['snapshot_date']}  {p['Department']:<24} r{p['revision']}  "
+                  f"{p['rows']:>7,} rows  {p['sha256'][:12]}")
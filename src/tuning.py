@@ -0,0 +1,226 @@
+"""
+Budgeted hyperparameter search for the Random Forest pipeline.
+
+Successive halving over a random sample of the notebook-03 grid:
+every candidate is first scored (k-fold ROC-AUC) with a small forest,
+the best 1/eta survive to a forest eta times bigger, and so on until one
+candidate is left at full size. n_estimators is the resource, so it is
+not part of the sampled space.
+
+The search stops early when the fit-count or wall-clock budget would be
+exceeded and returns the best candidate of the largest rung it finished.
+Every evaluation (rung, candidate, forest size, fold AUCs summary, fit
+time) is written to a CSV log.
+
+By default the preprocessing step is fitted once per fold and the encoded
+fold matrices are shared by every candidate, so only the classifier is
+refit. This needs every searched parameter to be a `clf__` parameter;
+pass cache_preprocessing=False to search preprocessing settings too.
+
+    python -m src.tuning --max-fits 600 --time-budget 900
+"""
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterSampler, StratifiedKFold
+
+from src.config import ARTIFACTS_DIR
+from src.features import NUM_FEATURES, CAT_FEATURES
+from src.pipeline import make_rf_pipeline
+
+# Same space as the exhaustive grid in notebook 03 (minus n_estimators)
+PARAM_SPACE = {
+    "clf__max_depth": [None, 8, 16],
+    "clf__min_samples_split": [2, 5, 10],
+    "clf__min_samples_leaf": [1, 2, 4],
+    "clf__max_features": ["sqrt", "log2", None],
+    "clf__criterion": ["gini", "entropy", "log_loss"],
+}
+
+SEARCH_LOG = ARTIFACTS_DIR / "search_log.csv"
+
+
+def rung_sizes(n_candidates, min_estimators, max_estimators, eta):
+    """[(n_candidates, n_estimators), ...] for each rung, smallest forest first."""
+    n_rungs = int(math.floor(math.log(n_candidates, eta))) + 1
+    rungs = []
+    for k in range(n_rungs):
+        n = max(1, n_candidates // eta ** k)
+        r = max_estimators / eta ** (n_rungs - 1 - k)
+        rungs.append((n, int(max(min_estimators, round(r)))))
+    return rungs
+
+
+def _fit_score(pipe, params, X, y, train, test):
+    est = clone(pipe).set_params(**params)
+    t0 = time.perf_counter()
+    est.fit(X.iloc[train], y.iloc[train])
+    auc = roc_auc_score(y.iloc[test], est.predict_proba(X.iloc[test])[:, 1])
+    return auc, time.perf_counter() - t0
+
+
+def encode_folds(pipe, X, y, folds):
+    """
+    Fit the pipeline's preprocessing on each training fold once and return
+    [(X_train_enc, y_train, X_test_enc, y_test), ...]. Encoded matrices are
+    plain arrays, so joblib shares them with the workers by memory-mapping.
+    """
+    encoded = []
+    for train, test in folds:
+        pre = clone(pipe.named_steps["pre"])
+        Xtr = pre.fit_transform(X.iloc[train], y.iloc[train])
+        encoded.append((Xtr, y.iloc[train].to_numpy(),
+                        pre.transform(X.iloc[test]), y.iloc[test].to_numpy()))
+    return encoded
+
+
+def _strip(params):
+    return {k[len("clf__"):]: v for k, v in params.items()}
+
+
+def _fit_score_encoded(clf, params, Xtr, ytr, Xte, yte):
+    est = clone(clf).set_params(**params)
+    t0 = time.perf_counter()
+    est.fit(Xtr, ytr)
+    auc = roc_auc_score(yte, est.predict_proba(Xte)[:, 1])
+    return auc, time.perf_counter() - t0
+
+
+def successive_halving(X, y, param_space=PARAM_SPACE, n_candidates=81, eta=3,
+                       min_estimators=25, max_estimators=500, cv=5,
+                       max_fits=None, time_budget=None, n_jobs=-1,
+                       random_state=42, log_path=SEARCH_LOG, cache_preprocessing=True):
+    """
+    Run the search and return (best_params, log DataFrame).
+
+    max_fits:    stop before a rung that would push the total number of
+                 model fits (candidates × folds) above this. When even the
+                 first rung would, fewer candidates are sampled.
+    time_budget: seconds; no new rung starts once it is used up.
+    cache_preprocessing: encode each fold once and refit only the classifier.
+
+    The returned parameters always use `max_estimators` trees, also when
+    the budget stopped the search on a rung of smaller forests.
+    """
+    pipe = make_rf_pipeline(NUM_FEATURES, CAT_FEATURES)
+    X = X.reset_index(drop=True)
+    y = pd.Series(np.asarray(y)).reset_index(drop=True)
+    folds = list(StratifiedKFold(cv, shuffle=True, random_state=random_state).split(X, y))
+    if max_fits is not None:
+        if max_fits < cv:
+            raise ValueError(f"max_fits={max_fits} cannot cover one candidate ({cv} folds)")
+        n_candidates = min(n_candidates, max_fits // cv)
+    candidates = list(ParameterSampler(param_space, n_candidates, random_state=random_state))
+    if cache_preprocessing:
+        not_clf = sorted(k for k in param_space if not k.startswith("clf__"))
+        if not_clf:
+            raise ValueError(f"cache_preprocessing only searches clf__ parameters, got {not_clf}")
+        encoded = encode_folds(pipe, X, y, folds)
+        clf = pipe.named_steps["clf"]
+
+    log, fits, start = [], 0, time.perf_counter()
+    alive = list(range(len(candidates)))
+    best = None
+    for rung, (n_keep, n_est) in enumerate(rung_sizes(len(candidates), min_estimators,
+                                                        max_estimators, eta)):
+        alive = alive[:n_keep]
+        cost = len(alive) * cv
+        if best is not None:
+            if max_fits is not None and fits + cost > max_fits:
+                break
+            if time_budget is not None and time.perf_counter() - start > time_budget:
+                break
+        jobs = [(c, f) for c in alive for f in range(cv)]
+        params = {c: {**candidates[c], "clf__n_estimators": n_est,
+                      "clf__random_state": random_state} for c in alive}
+        if cache_preprocessing:
+            out = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_score_encoded)(clf, _strip(params[c]), *encoded[f]) for c, f in jobs
+            )
+        else:
+            out = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_score)(pipe, params[c], X, y, *folds[f]) for c, f in jobs
+            )
+        fits += cost
+        scores = {c: [] for c in alive}
+        seconds = {c: 0.0 for c in alive}
+        for (c, _), (auc, sec) in zip(jobs, out):
+            scores[c].append(auc)
+            seconds[c] += sec
+        for c in alive:
+            log.append({
+                "rung": rung, "candidate": c, "n_estimators": n_est,
+                "mean_auc": float(np.mean(scores[c])), "std_auc": float(np.std(scores[c])),
+                "fit_seconds": seconds[c], "elapsed": time.perf_counter() - start,
+                "params": json.dumps(candidates[c]),
+            })
+        alive.sort(key=lambda c: np.mean(scores[c]), reverse=True)
+        best = {**candidates[alive[0]], "clf__n_estimators": max_estimators}
+
+    log_df = pd.DataFrame(log)
+    if log_path is not None:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log_df.to_csv(log_path, index=False)
+    return best, log_df
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    import joblib
+
+    from src.config import READY_PARQUET
+    from src.registry import FEATURES_NAME, MODEL_NAME, SCHEMA_NAME, register, version_dir
+    from src.schema import build_schema, save_schema
+    from src.utils import save_feature_order
+    from sklearn.model_selection import train_test_split
+
+    parser = argparse.ArgumentParser(description="Budgeted RF hyperparameter search.")
+    parser.add_argument("--candidates", type=int, default=81)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--max-fits", type=int, default=None)
+    parser.add_argument("--time-budget", type=float, default=None, help="seconds")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--export", action="store_true",
+                        help="refit the best model and register it as a new, active"
+                             " model version (model, features and feature schema)")
+    args = parser.parse_args()
+
+    df = pd.read_parquet(READY_PARQUET)
+    feats = NUM_FEATURES + CAT_FEATURES
+    Xtr, Xte, ytr, yte = train_test_split(df[feats], df["target"], test_size=0.2,
+                                          stratify=df["target"], random_state=42)
+    t0 = time.perf_counter()
+    best, log_df = successive_halving(Xtr, ytr, n_candidates=args.candidates, eta=args.eta,
+                                      cv=args.cv, max_fits=args.max_fits,
+                                      time_budget=args.time_budget, n_jobs=args.n_jobs)
+    final = make_rf_pipeline(NUM_FEATURES, CAT_FEATURES).set_params(
+        **best, clf__random_state=42).fit(Xtr, ytr)
+    test_auc = roc_auc_score(yte, final.predict_proba(Xte)[:, 1])
+    last = log_df[log_df["rung"] == log_df["rung"].max()]
+    print(f"Fits: {len(log_df) * args.cv} in {time.perf_counter() - t0:.0f}s · log → {SEARCH_LOG}")
+    print("Best params:", best)
+    print("Best CV ROC-AUC:", round(last["mean_auc"].max(), 3),
+          "· Test ROC-AUC:", round(test_auc, 3))
+    if args.export:
+        # Stage the files, then let the registry copy them into the next
+        # version folder; a running app picks the new version up by itself
+        with tempfile.TemporaryDirectory() as staging:
+            staging = Path(staging)
+            joblib.dump(final, staging / MODEL_NAME)
+            save_feature_order(staging / FEATURES_NAME, feats)
+            save_schema(build_schema(Xtr, NUM_FEATURES, CAT_FEATURES), staging / SCHEMA_NAME)
+            version = register(staging / MODEL_NAME, staging / FEATURES_NAME,
+                               {"note": "src.tuning --export",
+                                "test_roc_auc": round(float(test_auc), 4)},
+                               activate_now=True)
+        print(f"Registered {version} (active) → {version_dir(version)}")
@@ -1,4 +1,7 @@
+import hashlib
 import json
+import os
+import threading
 
 def yes_no_to_binary(series):
     return series.map({"Yes": 1, "No": 0})
@@ -7,4 +10,54 @@ def save_feature_order(path, columns):
     path.write_text(json.dumps(columns))
 
 def load_feature_order(path):
-    return json.loads(path.read_text())
\ No newline at end of file
+    return json.loads(path.read_text())
+
+def file_signature(path):
+    """Cheap change marker for a file: (mtime in ns, size in bytes)."""
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents (hex), read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+_DIGESTS = {}   # path → (signature, sha256), so files are hashed once per change
+_DIGEST_LOCK = threading.Lock()
+
+def content_digest(path):
+    """file_digest, recomputed only when the file's signature changes."""
+    sig = file_signature(path)
+    with _DIGEST_LOCK:
+        hit = _DIGESTS.get(path)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+    digest = file_digest(path)
+    with _DIGEST_LOCK:
+        _DIGESTS[path] = (sig, digest)
+    return digest
+
+_META_KEY = b"artifact"
+
+def write_artifact(df, path, meta):
+    """Write `df` to parquet with a JSON `meta` dict in the file's schema metadata."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), _META_KEY: json.dumps(meta).encode()})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+
+def artifact_meta(path):
+    """The `meta` dict stored by write_artifact (reads the footer only), or None."""
+    import pyarrow.parquet as pq
+    if not path.exists():
+        return None
+    raw = (pq.read_schema(path).metadata or {}).get(_META_KEY)
+    return json.loads(raw) if raw else None
@@ -0,0 +1,25 @@
+import pytest
+
+from src.benchmark import compare, load_results, run_suite, save_results
+from src.config import READY_PARQUET
+
+pytestmark = pytest.mark.skipif(not READY_PARQUET.exists(), reason="ready parquet not found")
+
+
+def test_run_suite_records(tmp_path):
+    records = run_suite(scales=[1, 2], cases=["load", "evaluation"], repeat=1)
+    assert [(r["case"], r["scale"]) for r in records] == [
+        ("load", 1), ("evaluation", 1), ("load", 2), ("evaluation", 2)]
+    assert records[2]["rows"] == 2 * records[0]["rows"]
+    path = save_results(records, tmp_path / "bench.json")
+    assert load_results(path) == records
+
+
+def test_compare_flags_slowdowns_only():
+    base = [{"case": "load", "scale": 1, "median_s": 1.0},
+            {"case": "evaluation", "scale": 1, "median_s": 1.0}]
+    new = [{"case": "load", "scale": 1, "median_s": 1.5},
+           {"case": "evaluation", "scale": 1, "median_s": 1.1},
+           {"case": "load", "scale": 10, "median_s": 9.0}]   # no baseline → ignored
+    flagged = compare(new, base, tolerance=0.25)
+    assert [(r["case"], r["ratio"]) for r in flagged] == [("load", 1.5)]
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.chart_data import box_summary, category_counts, hierarchy_counts
+from src.cube import build_cube, index_cube
+
+
+def _df(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Department": rng.choice(["Sales", "R&D", "HR"], n),
+        "OverTime": rng.choice(["Yes", "No"], n),
+        "Age": rng.integers(18, 60, n),
+        "JobLevel": rng.integers(1, 6, n),
+        "Attrition": rng.choice(["Yes", "No"], n, p=[0.2, 0.8]),
+        "MonthlyIncome": np.round(rng.lognormal(8.5, 0.6, n)),
+    }).assign(target=lambda d: (d["Attrition"] == "Yes").astype(int))
+
+
+def test_category_counts_match_rows():
+    df = _df()
+    icube = index_cube(build_cube(df, features=["JobLevel"]))
+    got = category_counts(icube, "JobLevel", departments=["Sales"])
+    want = (df[df["Department"] == "Sales"]
+            .groupby(["JobLevel", "Attrition"]).size())
+    for row in got.itertuples(index=False):
+        assert row.count == want[(row.JobLevel, row.Attrition)]
+
+
+def test_box_summary_stats_and_cap():
+    df = _df()
+    stats, outliers = box_summary(df, "MonthlyIncome", "Attrition", max_points=20)
+    for row in stats.itertuples(index=False):
+        x = df.loc[df["Attrition"] == row.Attrition, "MonthlyIncome"]
+        assert row.n == len(x)
+        assert row.median == pytest.approx(x.median())
+        assert row.q1 == pytest.approx(x.quantile(0.25))
+        assert row.upperfence <= row.q3 + 1.5 * (row.q3 - row.q1)
+    assert stats["n_outliers"].sum() > 20
+    assert len(outliers) <= 20
+    fences = outliers.merge(stats, on="Attrition")
+    assert ((fences["MonthlyIncome"] > fences["upperfence"])
+            | (fences["MonthlyIncome"] < fences["lowerfence"])).all()
+
+
+def test_hierarchy_counts():
+    df = _df()
+    leaves = hierarchy_counts(df, ["Department", "OverTime", "Attrition"])
+    assert leaves["count"].sum() == len(df)
+    assert len(leaves) == len(df[["Department", "OverTime", "Attrition"]].drop_duplicates())
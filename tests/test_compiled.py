@@ -0,0 +1,80 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.compiled import CompiledForest
+from src.config import MODEL_FILE, FEATURES_FILE, DATA_READY
+from src.utils import load_feature_order
+
+pytestmark = pytest.mark.skipif(not (MODEL_FILE.exists() and DATA_READY.exists()),
+                                reason="model or ready parquet not found")
+
+
+def test_compiled_matches_sklearn(tmp_path):
+    pipe = joblib.load(MODEL_FILE)
+    feats = load_feature_order(FEATURES_FILE)
+    X = pd.read_parquet(DATA_READY, columns=feats).head(300)
+    # Exercise imputation and unknown categories too
+    X.loc[X.index[0], "MonthlyIncome"] = np.nan
+    X.loc[X.index[1], "JobRole"] = "Astronaut"
+
+    path = tmp_path / "rf.npz"
+    CompiledForest.from_pipeline(pipe).save(path)
+    forest = CompiledForest.load(path)
+
+    want = pipe.predict_proba(X)
+    assert forest.predict_proba(X) == pytest.approx(want, abs=1e-12)
+    for i in range(3):
+        row = X.iloc[i].to_dict()
+        assert forest.predict_one(row) == pytest.approx(want[i, 1], abs=1e-12)
+
+
+def test_memory_mapped_float32_export(tmp_path):
+    pipe = joblib.load(MODEL_FILE)
+    feats = load_feature_order(FEATURES_FILE)
+    X = pd.read_parquet(DATA_READY, columns=feats)
+
+    path = tmp_path / "rf.npz"
+    CompiledForest.from_pipeline(pipe).save(path, float32_thresholds=True)
+    forest = CompiledForest.load(path, mmap=True)
+
+    assert forest.threshold.dtype == np.float32
+    assert not forest.left.flags.writeable  # read-only view of the file
+    # rounding thresholds down keeps every split decision unchanged
+    assert forest.predict_proba(X) == pytest.approx(pipe.predict_proba(X), abs=1e-12)
+
+
+def test_validate_against_features(tmp_path):
+    forest = CompiledForest.from_pipeline(joblib.load(MODEL_FILE))
+    forest.validate(load_feature_order(FEATURES_FILE))
+    with pytest.raises(ValueError):
+        forest.validate(load_feature_order(FEATURES_FILE)[:-1])
+
+
+def test_explain_matches_decision_path():
+    pipe = joblib.load(MODEL_FILE)
+    feats = load_feature_order(FEATURES_FILE)
+    X = pd.read_parquet(DATA_READY, columns=feats).head(5)
+    forest = CompiledForest.from_pipeline(pipe)
+    bias, contrib = forest.explain(X)
+
+    # Reference: walk each tree's decision_path in sklearn and credit every
+    # step's change in P(leave) to the split feature's original column
+    pre, rf = pipe.named_steps["pre"], pipe.named_steps["clf"]
+    Xt = pre.transform(X)
+    owner = forest._column_features()
+    want = np.zeros((len(X), len(forest.features)))
+    for est in rf.estimators_:
+        t = est.tree_
+        value = t.value[:, 0, 1] / t.value[:, 0, :].sum(axis=1)
+        paths = est.decision_path(Xt)
+        for i in range(len(X)):
+            nodes = paths.indices[paths.indptr[i]:paths.indptr[i + 1]]
+            for parent, child in zip(nodes[:-1], nodes[1:]):
+                want[i, owner[t.feature[parent]]] += value[child] - value[parent]
+    want /= len(rf.estimators_)
+
+    assert contrib.to_numpy() == pytest.approx(want, abs=1e-12)
+    proba = pipe.predict_proba(X)[:, 1]
+    assert bias + contrib.sum(axis=1).to_numpy() == pytest.approx(proba, abs=1e-12)
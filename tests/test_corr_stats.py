@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from src.corr_stats import (append_rows, build_corr_stats, index_corr_stats, query_corr,
+                             save_corr_stats)
+from src.cube import is_fresh
+
+COLS = ["Age", "MonthlyIncome", "target"]
+
+
+def _df(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    age = rng.integers(18, 60, n)
+    return pd.DataFrame({
+        "Department": rng.choice(["Sales", "R&D", "HR"], n),
+        "OverTime": rng.choice(["Yes", "No"], n),
+        "Age": age,
+        "MonthlyIncome": 1000 + 150 * age + rng.normal(0, 2000, n),
+        "target": rng.integers(0, 2, n),
+    })
+
+
+def test_filtered_corr_matches_pandas():
+    df = _df()
+    istats = index_corr_stats(build_corr_stats(df, COLS))
+    got = query_corr(istats, departments=["Sales", "HR"], overtime=["Yes"], age_range=(25, 50))
+    sub = df[df["Department"].isin(["Sales", "HR"]) & (df["OverTime"] == "Yes")
+             & df["Age"].between(25, 50)]
+    np.testing.assert_allclose(got.to_numpy(), sub[COLS].corr().to_numpy(), atol=1e-12)
+
+
+def test_append_equals_rebuild():
+    df = _df()
+    grown = append_rows(build_corr_stats(df.iloc[:400], COLS), df.iloc[400:])
+    rebuilt = build_corr_stats(df, COLS)
+    assert len(grown) == len(rebuilt)
+    np.testing.assert_allclose(query_corr(index_corr_stats(grown)).to_numpy(),
+                               query_corr(index_corr_stats(rebuilt)).to_numpy(), atol=1e-12)
+    np.testing.assert_allclose(query_corr(index_corr_stats(grown)).to_numpy(),
+                               df[COLS].corr().to_numpy(), atol=1e-12)
+
+
+def test_missing_dimension_values_form_their_own_segment():
+    df = _df()
+    df.loc[:19, "Department"] = None
+    df.loc[10:29, "OverTime"] = np.nan
+    stats = build_corr_stats(df, COLS)
+    assert stats["n"].sum() == len(df)
+    np.testing.assert_allclose(query_corr(index_corr_stats(stats)).to_numpy(),
+                               df[COLS].corr().to_numpy(), atol=1e-12)
+    grown = append_rows(build_corr_stats(df.iloc[:300], COLS), df.iloc[300:])
+    assert grown["n"].sum() == len(df)
+    got = query_corr(index_corr_stats(grown), departments=["Sales"])
+    np.testing.assert_allclose(got.to_numpy(),
+                               df[df["Department"] == "Sales"][COLS].corr().to_numpy(), atol=1e-12)
+
+
+def test_saved_stats_are_tied_to_source_contents(tmp_path):
+    source, path = tmp_path / "ready.parquet", tmp_path / "corr.parquet"
+    df = _df()
+    df.to_parquet(source, index=False)
+    save_corr_stats(build_corr_stats(df, COLS), path, source)
+    assert is_fresh(path, source, COLS)
+    assert not is_fresh(path, source, ["Age", "target"])
+    df.head(100).to_parquet(source, index=False)
+    assert not is_fresh(path, source, COLS)
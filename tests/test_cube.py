@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+
+from src.cube import build_cube, index_cube, is_fresh, query_rates, save_cube
+
+
+def _df():
+    return pd.DataFrame({
+        "Department": ["Sales", "Sales", "R&D", "R&D", "HR"],
+        "OverTime":   ["Yes", "No", "Yes", "No", "No"],
+        "Age":        [25, 35, 28, 45, 50],
+        "JobLevel":   [1, 2, 1, 3, 2],
+        "target":     [1, 0, 1, 0, 1],
+    })
+
+
+def test_query_matches_groupby_under_filters():
+    df = _df()
+    icube = index_cube(build_cube(df, features=["JobLevel", "OverTime"]))
+    got = query_rates(icube, "JobLevel", departments=["Sales", "R&D"], age_range=(20, 40))
+
+    sub = df[df["Department"].isin(["Sales", "R&D"]) & df["Age"].between(20, 40)]
+    want = sub.groupby("JobLevel")["target"].agg(rate="mean", n="size").reset_index()
+    assert got["JobLevel"].tolist() == want["JobLevel"].tolist()
+    assert got["rate"].tolist() == want["rate"].tolist()
+    assert got["n"].tolist() == want["n"].tolist()
+
+
+def test_query_by_filter_dimension():
+    icube = index_cube(build_cube(_df(), features=["JobLevel", "OverTime"]))
+    ot = query_rates(icube, "OverTime")
+    assert ot.set_index("OverTime")["n"].to_dict() == {"No": 3, "Yes": 2}
+
+
+def test_artifact_freshness_follows_source_contents(tmp_path):
+    source, path = tmp_path / "ready.parquet", tmp_path / "cube.parquet"
+    _df().to_parquet(source, index=False)
+    save_cube(build_cube(_df(), features=["JobLevel"]), path, source, features=["JobLevel"])
+    assert is_fresh(path, source, features=["JobLevel"])
+    assert not is_fresh(path, source, features=["JobLevel", "OverTime"])
+
+    # new source contents, with the cube file still looking newer
+    _df().head(3).to_parquet(source, index=False)
+    os.utime(path, ns=(source.stat().st_mtime_ns + 10**9,) * 2)
+    assert not is_fresh(path, source, features=["JobLevel"])
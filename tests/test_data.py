@@ -0,0 +1,51 @@
+import os
+import pandas as pd
+import pytest
+
+from src.data import load_dataset, clear_cache
+
+
+def test_load_dataset_caches_and_derives_target(tmp_path):
+    clear_cache()
+    csv = tmp_path / "hr.csv"
+    pd.DataFrame({"Age": [30, 40], "Attrition": ["Yes", "No"]}).to_csv(csv, index=False)
+
+    df1, src = load_dataset(sources=(tmp_path / "missing.parquet", csv))
+    df2, _ = load_dataset(sources=(csv,))
+    assert src == csv
+    assert df1 is df2                      # same in-memory copy
+    assert list(df1["target"]) == [1, 0]
+
+
+def test_load_dataset_reloads_when_file_changes(tmp_path):
+    clear_cache()
+    csv = tmp_path / "hr.csv"
+    pd.DataFrame({"Age": [30], "Attrition": ["No"]}).to_csv(csv, index=False)
+    df1, _ = load_dataset(sources=(csv,))
+
+    pd.DataFrame({"Age": [30, 50], "Attrition": ["No", "Yes"]}).to_csv(csv, index=False)
+    st = csv.stat()
+    os.utime(csv, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    df2, _ = load_dataset(sources=(csv,))
+    assert len(df1) == 1 and len(df2) == 2
+
+
+def test_load_dataset_projects_columns(tmp_path):
+    clear_cache()
+    csv = tmp_path / "hr.csv"
+    pd.DataFrame({"Age": [30], "Gender": ["Male"], "Attrition": ["No"]}).to_csv(csv, index=False)
+    df, _ = load_dataset(sources=(csv,), columns=["Age", "target", "Nope"])
+    assert list(df.columns) == ["Age", "target"]
+
+
+def test_load_dataset_nothing_found(tmp_path):
+    assert load_dataset(sources=(tmp_path / "a.parquet",)) == (None, None)
+
+
+def test_load_dataset_raises_on_unreadable_file(tmp_path):
+    clear_cache()
+    bad, csv = tmp_path / "ready.parquet", tmp_path / "hr.csv"
+    bad.write_bytes(b"half-written")
+    pd.DataFrame({"Age": [30], "Attrition": ["Yes"]}).to_csv(csv, index=False)
+    with pytest.raises(ValueError):
+        load_dataset(sources=(bad, csv))
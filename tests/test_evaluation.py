@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from sklearn.metrics import (accuracy_score, confusion_matrix, f1_score,
+                             precision_score, recall_score)
+
+from src.evaluation import counts_at, cumulative_counts, threshold_grid, threshold_sweep
+
+
+def _data(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    # rounded scores so there are plenty of ties
+    p = np.round(np.clip(0.3 * y + rng.random(n) * 0.7, 0, 1), 2)
+    return y, p
+
+
+def test_sweep_matches_sklearn_per_threshold():
+    y, p = _data()
+    grid = [0.0, 0.3, 0.35, 0.5, 0.555, 0.7, 1.0, 1.1]
+    table = threshold_sweep(y, p, grid)
+    for row in table.itertuples():
+        pred = (p >= row.threshold).astype(int)
+        assert row.accuracy == pytest.approx(accuracy_score(y, pred))
+        assert row.precision == pytest.approx(precision_score(y, pred, zero_division=0))
+        assert row.recall == pytest.approx(recall_score(y, pred, zero_division=0))
+        assert row.f1 == pytest.approx(f1_score(y, pred, zero_division=0))
+        assert row.positives_pred == pred.sum()
+
+
+def test_full_curve_and_counts_at():
+    y, p = _data()
+    curve = cumulative_counts(y, p)
+    full = threshold_sweep(y, p)
+    assert len(full) == len(np.unique(p))
+    tn, fp, fn, tp = counts_at(curve, 0.42)
+    assert [tn, fp, fn, tp] == confusion_matrix(y, (p >= 0.42).astype(int)).ravel().tolist()
+
+
+def test_threshold_grid():
+    assert threshold_grid(0.05)[7] == 0.35
+    assert len(threshold_grid(0.01)) == 101
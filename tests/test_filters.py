@@ -0,0 +1,46 @@
+import pandas as pd
+
+from src.filters import available_columns, filter_options, scan_filtered
+
+
+def _write(tmp_path):
+    path = tmp_path / "hr.parquet"
+    pd.DataFrame({
+        "Age": [25, 35, 45, 55],
+        "Department": ["Sales", "Sales", "R&D", "HR"],
+        "OverTime": ["Yes", "No", "Yes", "No"],
+        "MonthlyIncome": [1000, 2000, 3000, 4000],
+        "Attrition": ["Yes", "No", "No", "Yes"],
+    }).to_parquet(path, index=False)
+    return path
+
+
+def test_scan_filtered_pushes_filters_and_projects(tmp_path):
+    path = _write(tmp_path)
+    df = scan_filtered(path, ["Age", "target"], departments=["Sales", "R&D"],
+                       overtime=["Yes"], age_range=(20, 50))
+    assert list(df.columns) == ["Age", "target"]
+    assert df["Age"].tolist() == [25, 45]
+    assert df["target"].tolist() == [1, 0]
+
+
+def test_scan_filtered_empty_selection_keeps_all(tmp_path):
+    path = _write(tmp_path)
+    df = scan_filtered(path, ["Department"], departments=[], overtime=[])
+    assert len(df) == 4
+
+
+def test_filter_options(tmp_path):
+    path = _write(tmp_path)
+    opts = filter_options(path)
+    assert opts["rows"] == 4
+    assert sorted(opts["departments"]) == ["HR", "R&D", "Sales"]
+    assert (opts["age_min"], opts["age_max"]) == (25, 55)
+    assert "target" in available_columns(path)
+
+
+def test_filter_options_cached_per_file_version(tmp_path):
+    path = _write(tmp_path)
+    assert filter_options(path) is filter_options(path)
+    pd.DataFrame({"Age": [30], "Department": ["Sales"], "OverTime": ["No"]}).to_parquet(path, index=False)
+    assert filter_options(path)["rows"] == 1
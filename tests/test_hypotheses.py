@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import chi2_contingency
+
+from src.hypotheses import (HYPOTHESES, categorical_columns, chi_square,
+                            contingency_tables, run_tests, verdict)
+
+
+def _df(n=800, seed=0):
+    rng = np.random.default_rng(seed)
+    overtime = rng.choice(["Yes", "No"], n, p=[0.3, 0.7])
+    return pd.DataFrame({
+        "OverTime": overtime,
+        "JobSatisfaction": rng.integers(1, 5, n),
+        "Age": rng.integers(18, 60, n),
+        "Department": rng.choice(["Sales", "R&D", "HR"], n),
+        "EmployeeCount": 1,                       # constant: not screened
+        "MonthlyIncome": rng.integers(1000, 20000, n),  # too many levels
+        "target": (rng.random(n) < np.where(overtime == "Yes", 0.35, 0.1)).astype(int),
+    })
+
+
+def test_tables_match_crosstab():
+    df = _df()
+    tables = contingency_tables({"OverTime": df["OverTime"], "Department": df["Department"]},
+                                df["target"])
+    for name, table in tables.items():
+        want = pd.crosstab(df[name], df["target"])
+        assert table.to_numpy().tolist() == want.to_numpy().tolist()
+        assert list(table.index) == list(want.index)
+
+
+def test_batch_chi_square_matches_scipy():
+    df = _df()
+    tables = contingency_tables({c: df[c] for c in ["OverTime", "JobSatisfaction",
+                                                    "Department"]}, df["target"])
+    tests = chi_square(tables)
+    for name, table in tables.items():
+        stat, p, dof, _ = chi2_contingency(table.to_numpy())  # Yates for the 2×2
+        assert tests.loc[name, "chi2"] == pytest.approx(stat, rel=1e-10)
+        assert tests.loc[name, "p_value"] == pytest.approx(p, rel=1e-8)
+        assert tests.loc[name, "dof"] == dof
+
+
+def test_screen_and_verdicts():
+    df = _df()
+    assert categorical_columns(df) == ["OverTime", "JobSatisfaction", "Department"]
+    results = run_tests(df)
+    assert {"H1", "H2", "H3", "OverTime", "Department"} <= set(results["tests"].index)
+    supported, high, low, p = verdict(HYPOTHESES[0], results["tables"], results["tests"])
+    assert supported and high > low and p < 0.05
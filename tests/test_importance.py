@@ -0,0 +1,45 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.compiled import CompiledForest
+from src.config import MODEL_FILE, FEATURES_FILE, DATA_READY
+from src.importance import feature_blocks, load_importance, permutation_importance, save_importance
+from src.utils import load_feature_order
+
+pytestmark = pytest.mark.skipif(not (MODEL_FILE.exists() and DATA_READY.exists()),
+                                reason="model or ready parquet not found")
+
+
+@pytest.fixture(scope="module")
+def setup(tmp_path_factory):
+    path = tmp_path_factory.mktemp("imp") / "rf.npz"
+    CompiledForest.from_pipeline(joblib.load(MODEL_FILE)).save(path)
+    feats = load_feature_order(FEATURES_FILE)
+    df = pd.read_parquet(DATA_READY, columns=feats + ["target"]).sample(300, random_state=0)
+    return path, CompiledForest.load(path), df[feats], df["target"]
+
+
+def test_blocks_cover_every_encoded_column(setup):
+    _, forest, _, _ = setup
+    blocks = feature_blocks(forest)
+    assert list(blocks) == forest.features
+    cols = np.sort(np.concatenate(list(blocks.values())))
+    np.testing.assert_array_equal(cols, np.arange(len(cols)))
+    assert len(blocks["Department"]) > 1  # one-hot block shuffled as a group
+
+
+def test_pool_matches_serial_and_round_trips(setup, tmp_path):
+    path, forest, X, y = setup
+    serial, base = permutation_importance(forest, X, y, repeats=3, seed=1)
+    pooled, base2 = permutation_importance(forest, X, y, repeats=3, seed=1, n_jobs=2,
+                                           compiled_path=path)
+    assert base == base2
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert serial["importance_mean"].is_monotonic_decreasing
+
+    save_importance(serial, base, tmp_path / "permutation_importance.json", "abc", 3, len(X), 1)
+    table, meta = load_importance(tmp_path, "abc")
+    assert meta["baseline"] == base and list(table["feature"]) == list(serial["feature"])
+    assert load_importance(tmp_path, "other-model") is None
@@ -27,4 +27,23 @@ def test_import_page_4():
 def test_import_page_5():
     """Page 5 (Technical) imports without error."""
     from app_pages.page_5_technical import run
-    assert callable(run)
\ No newline at end of file
+    assert callable(run)
+
+def test_page_registry_loads_every_page():
+    """Every registry entry resolves to a callable run()."""
+    from app_pages import PAGES, load_page
+    assert len(PAGES) == 5
+    for label in PAGES:
+        assert callable(load_page(label))
+
+
+def test_heavy_libraries_are_deferred():
+    """Importing the Technical page does not pull in matplotlib or joblib."""
+    import subprocess
+    import sys
+    from src.config import ROOT
+    code = ("import sys, app_pages.page_5_technical; "
+            "print(any(m in sys.modules for m in ('matplotlib.pyplot', 'joblib')))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,33 @@
+from src.predict_cache import PredictionCache, normalise_row
+
+FEATS = ["Age", "OverTime"]
+
+
+def test_repeat_profiles_hit_the_cache():
+    cache = PredictionCache(maxsize=10)
+    calls = []
+
+    def compute(row):
+        calls.append(row)
+        return 0.5
+
+    cache.get_or_compute("m1", {"Age": 30, "OverTime": "Yes"}, FEATS, compute)
+    cache.get_or_compute("m1", {"Age": 30.0, "OverTime": "Yes "}, FEATS, compute)
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    # the model sees the normalised profile, whichever spelling arrived first
+    cache.get_or_compute("m1", {"Age": 41, "OverTime": " No "}, FEATS, compute)
+    assert calls[-1] == {"Age": 41.0, "OverTime": "No"}
+
+    # a different model hash never reuses old answers
+    cache.get_or_compute("m2", {"Age": 30, "OverTime": "Yes"}, FEATS, compute)
+    assert len(calls) == 3
+
+
+def test_cache_is_bounded_lru():
+    cache = PredictionCache(maxsize=2)
+    for age in (20, 30, 20, 40):          # 20 is refreshed, so 30 is evicted
+        cache.get_or_compute("m", {"Age": age, "OverTime": "No"}, FEATS, lambda r: 0.1)
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["hits"] == 1
+    assert normalise_row({"Age": 1, "OverTime": "No"}, FEATS) == (1.0, "No")
@@ -0,0 +1,60 @@
+import pytest
+
+from src.config import MODEL_FILE, FEATURES_FILE
+from src.registry import MODEL_NAME, ModelLoader, activate, active_dir, read_registry, register
+
+pytestmark = pytest.mark.skipif(not MODEL_FILE.exists(), reason="model not found")
+
+
+def test_register_and_activate(tmp_path):
+    assert read_registry(tmp_path)["active"] is None
+    v1 = register(MODEL_FILE, FEATURES_FILE, {"note": "first"}, root=tmp_path)
+    v2 = register(MODEL_FILE, FEATURES_FILE, root=tmp_path)
+    registry = read_registry(tmp_path)
+    assert (v1, v2) == ("v1", "v2")
+    assert registry["active"] == "v1"          # first version activates itself
+    assert registry["versions"]["v1"]["note"] == "first"
+    assert (tmp_path / "v2" / "rf_compiled.npz").exists()
+    assert (tmp_path / "v2" / "feature_schema.json").exists()
+
+    activate("v2", root=tmp_path)
+    assert read_registry(tmp_path)["active"] == "v2"
+    assert active_dir(tmp_path) == tmp_path / "v2"
+    with pytest.raises(KeyError):
+        activate("v9", root=tmp_path)
+
+
+def test_loader_swaps_in_background(tmp_path):
+    register(MODEL_FILE, FEATURES_FILE, root=tmp_path)
+    register(MODEL_FILE, FEATURES_FILE, root=tmp_path)
+    loader = ModelLoader(root=tmp_path, poll_interval=0)
+    first = loader.get()
+    assert first.version == "v1"
+    assert 0 <= first.predict_one({f: None for f in first.feats}) <= 1
+
+    activate("v2", root=tmp_path)
+    assert loader.get() is first              # old model served while loading
+    loader.join(timeout=60)
+    assert loader.get().version == "v2"
+    assert loader.error is None
+
+
+def test_loader_retries_a_failed_load(tmp_path):
+    register(MODEL_FILE, FEATURES_FILE, root=tmp_path)
+    register(MODEL_FILE, FEATURES_FILE, root=tmp_path)
+    loader = ModelLoader(root=tmp_path, poll_interval=0)
+    first = loader.get()
+    good = (tmp_path / "v2" / MODEL_NAME).read_bytes()
+    (tmp_path / "v2" / MODEL_NAME).write_bytes(b"not a pickle")
+
+    activate("v2", root=tmp_path)
+    loader.get()
+    loader.join(timeout=60)
+    assert loader.get() is first and loader.error is not None
+    loader.join(timeout=60)                   # the retry that get() just started
+
+    (tmp_path / "v2" / MODEL_NAME).write_bytes(good)  # registry.json unchanged
+    loader.get()
+    loader.join(timeout=60)
+    assert loader.get().version == "v2"
+    assert loader.error is None
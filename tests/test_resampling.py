@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.resampling as resampling
+from src.resampling import bootstrap_rates, permutation_gaps, rate_intervals
+
+
+def test_bootstrap_matches_binomial_spread():
+    draws = bootstrap_rates([400, 900], [100, 90], resamples=4000, seed=3)
+    assert draws.shape == (4000, 2)
+    assert draws.mean(axis=0) == pytest.approx([0.25, 0.10], abs=0.005)
+    assert draws.std(axis=0) == pytest.approx(
+        [np.sqrt(0.25 * 0.75 / 400), np.sqrt(0.1 * 0.9 / 900)], rel=0.1)
+
+
+def test_bootstrap_is_independent_of_process_pool(monkeypatch):
+    monkeypatch.setattr(resampling, "BATCH_ELEMENTS", 100_000)
+    serial = bootstrap_rates([2000, 1500], [300, 100], resamples=300, seed=1)
+    monkeypatch.setattr(resampling, "PARALLEL_MIN_DRAWS", 1)
+    pooled = bootstrap_rates([2000, 1500], [300, 100], resamples=300, seed=1, n_jobs=2)
+    np.testing.assert_array_equal(serial, pooled)
+
+
+def test_permutation_null_is_centred():
+    null = permutation_gaps(400, 100, 600, 150, resamples=5000, seed=0)
+    assert abs(null.mean()) < 0.005
+
+
+def test_rate_intervals():
+    table = pd.DataFrame({0: [700, 300], 1: [100, 100]}, index=["No", "Yes"])
+    groups, gap = rate_intervals(table, "Yes", "No", resamples=2000)
+    assert (groups["ci_low"] < groups["rate"]).all() and (groups["rate"] < groups["ci_high"]).all()
+    assert gap["ci_low"] < gap["gap"] < gap["ci_high"]
+    assert gap["perm_p"] < 0.01
+    same = pd.DataFrame({0: [700, 350], 1: [100, 50]}, index=["No", "Yes"])
+    assert rate_intervals(same, "Yes", "No", resamples=2000)[1]["perm_p"] > 0.5
+
+
+def test_missing_group_gives_no_interval():
+    table = pd.DataFrame({0: [700], 1: [100]}, index=["No"])
+    assert rate_intervals(table, "Yes", "No", resamples=100) is None
@@ -0,0 +1,89 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from src.config import DATA_READY, FEATURES_FILE, MODEL_FILE, SCHEMA_FILE
+from src.features import CAT_FEATURES, NUM_FEATURES
+from src.schema import build_schema, load_schema, validate_frame
+from src.utils import load_feature_order
+
+pytestmark = pytest.mark.skipif(not DATA_READY.exists(), reason="ready parquet not found")
+
+
+def test_schema_describes_training_frame():
+    df = pd.read_parquet(DATA_READY)
+    schema = build_schema(df, NUM_FEATURES, CAT_FEATURES)["features"]
+    assert schema["Age"] == {"kind": "numeric", "dtype": "int64", "min": int(df["Age"].min()),
+                             "max": int(df["Age"].max()), "median": float(df["Age"].median())}
+    assert schema["JobLevel"]["categories"] == sorted(df["JobLevel"].unique().tolist())
+    assert schema["OverTime"]["mode"] == df["OverTime"].mode()[0]
+    assert validate_frame(df, {"features": schema}).empty
+
+
+def test_validate_frame_counts_problems():
+    schema = {"features": {
+        "Age": {"kind": "numeric", "dtype": "int64", "min": 18, "max": 60, "median": 36.0},
+        "JobLevel": {"kind": "categorical", "dtype": "int64", "categories": [1, 2], "mode": 1},
+    }}
+    df = pd.DataFrame({"Age": [17, 30, "x", None, 61, 70], "JobLevel": [1, 2, 3, "2", None, 1]})
+    report = validate_frame(df, schema)
+    got = {(f, p): n for f, p, n in report.itertuples(index=False)}
+    assert got == {("Age", "missing"): 1, ("Age", "not_numeric"): 1, ("Age", "below_min"): 1,
+                   ("Age", "above_max"): 2, ("JobLevel", "missing"): 1,
+                   ("JobLevel", "unknown_category"): 2}
+
+
+@pytest.mark.skipif(not SCHEMA_FILE.exists(), reason="schema not exported")
+def test_exported_schema_matches_features():
+    schema = load_schema(SCHEMA_FILE)
+    assert sorted(schema["features"]) == sorted(load_feature_order(FEATURES_FILE))
+
+
+@pytest.mark.skipif(not (MODEL_FILE.exists() and SCHEMA_FILE.exists()),
+                    reason="model or schema not found")
+def test_score_file_reports_invalid_values(tmp_path):
+    from src.scoring import score_file
+
+    df = pd.read_parquet(DATA_READY).head(100)
+    df.loc[:4, "JobRole"] = "Astronaut"
+    df.loc[:1, "Age"] = 99
+    src = tmp_path / "in.parquet"
+    df.to_parquet(src)
+    issues = {}
+    assert score_file(src, tmp_path / "out.parquet", batch_size=32, issues=issues) == 100
+    assert issues == {("JobRole", "unknown_category"): 5, ("Age", "above_max"): 2}
+    with pytest.raises(ValueError, match="JobRole"):
+        score_file(src, tmp_path / "out2.parquet", strict=True)
+
+
+@pytest.mark.skipif(not (MODEL_FILE.exists() and SCHEMA_FILE.exists()),
+                    reason="model or schema not found")
+def test_score_file_leaves_no_partial_output(tmp_path):
+    from src.scoring import score_file
+
+    df = pd.read_parquet(DATA_READY).head(100)
+    df.loc[90:, "JobRole"] = "Astronaut"      # only the last batch is bad
+    src = tmp_path / "in.parquet"
+    df.to_parquet(src)
+    with pytest.raises(ValueError, match="JobRole"):
+        score_file(src, tmp_path / "out.parquet", batch_size=32, strict=True)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["in.parquet"]
+
+
+@pytest.mark.skipif(not MODEL_FILE.exists(), reason="model not found")
+def test_score_file_uses_schema_next_to_model(tmp_path):
+    from src.scoring import score_file
+
+    model_dir = tmp_path / "v9"
+    model_dir.mkdir()
+    shutil.copy2(MODEL_FILE, model_dir / MODEL_FILE.name)
+    shutil.copy2(FEATURES_FILE, model_dir / FEATURES_FILE.name)
+    df = pd.read_parquet(DATA_READY).head(10)
+    df.loc[:4, "JobRole"] = "Astronaut"
+    src = tmp_path / "in.parquet"
+    df.to_parquet(src)
+    issues = {}
+    # no feature_schema.json beside this model, so v1's schema is not used
+    score_file(src, tmp_path / "out.parquet", model_dir / MODEL_FILE.name, issues=issues)
+    assert issues == {}
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import src.score_cache as score_cache
+from src.score_cache import _write, load_or_score, scores_key
+
+
+class _CountingModel:
+    calls = 0
+
+    def predict_proba(self, X):
+        _CountingModel.calls += 1
+        p = np.linspace(0, 1, len(X))
+        return np.column_stack([1 - p, p])
+
+
+def _setup(tmp_path):
+    model = tmp_path / "model.joblib"
+    model.write_bytes(b"model-v1")
+    data = tmp_path / "data.parquet"
+    df = pd.DataFrame({"Age": [30, 40, 50], "target": [0, 1, 0]})
+    df.to_parquet(data, index=False)
+    return model, data, df
+
+
+def test_scores_are_persisted_and_reused(tmp_path):
+    model, data, df = _setup(tmp_path)
+    out = tmp_path / "scores"
+    _CountingModel.calls = 0
+    args = (model, data, ["Age"], _CountingModel, lambda: df)
+
+    first = load_or_score(*args, scores_dir=out)
+    assert _CountingModel.calls == 1
+    assert first["target"].tolist() == [0, 1, 0]
+    assert len(list(out.glob("scores-*.parquet"))) == 1
+
+    # a fresh process (empty in-memory cache) reuses the sidecar on disk
+    score_cache._MEMORY.clear()
+    again = load_or_score(*args, scores_dir=out)
+    assert _CountingModel.calls == 1
+    pd.testing.assert_frame_equal(again, first)
+
+    # a new model file → new key → rescored once into a new sidecar
+    # (different size, so the change is seen even with coarse mtimes)
+    model.write_bytes(b"model-v2-retrained")
+    load_or_score(*args, scores_dir=out)
+    assert _CountingModel.calls == 2
+    assert len(list(out.glob("scores-*.parquet"))) == 2
+
+
+def test_key_depends_on_contents(tmp_path):
+    model, data, _ = _setup(tmp_path)
+    k1 = scores_key(model, data)
+    model.write_bytes(b"other model")
+    assert scores_key(model, data) != k1
+
+
+def test_concurrent_writers_and_prune_skip_temp_files(tmp_path):
+    path = tmp_path / "scores-abc.parquet"
+    frames = [pd.DataFrame({"probability": np.full(5000, i / 10)}) for i in range(8)]
+    in_flight = tmp_path / ".scores-other.tmp"
+    in_flight.write_bytes(b"half written")
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda f: _write(path, f), frames))
+    got = pd.read_parquet(path)["probability"]
+    assert got.nunique() == 1 and len(got) == 5000  # one writer's complete file
+    assert in_flight.exists()                       # not pruned
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == [in_flight.name]
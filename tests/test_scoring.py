@@ -0,0 +1,31 @@
+import joblib
+import pandas as pd
+import pytest
+
+from src.config import MODEL_FILE, FEATURES_FILE, DATA_READY
+from src.scoring import risk_band, risk_bands, score_file
+from src.utils import load_feature_order
+
+
+def test_risk_bands_match_scalar_cutoffs():
+    probs = [0.0, 0.349, 0.35, 0.59, 0.60, 1.0]
+    assert list(risk_bands(probs)) == [risk_band(p) for p in probs]
+    assert list(risk_bands(probs)) == ["Low", "Low", "Medium", "Medium", "High", "High"]
+
+
+@pytest.mark.skipif(not (MODEL_FILE.exists() and DATA_READY.exists()),
+                    reason="model or ready parquet not found")
+def test_score_file_streams_batches(tmp_path):
+    df = pd.read_parquet(DATA_READY).head(250)
+    src = tmp_path / "in.csv"
+    df.to_csv(src, index=False)
+
+    out = tmp_path / "scored.parquet"
+    n = score_file(src, out, keep=["EmployeeNumber"], batch_size=64)
+    scored = pd.read_parquet(out)
+
+    feats = load_feature_order(FEATURES_FILE)
+    want = joblib.load(MODEL_FILE).predict_proba(df[feats])[:, 1]
+    assert n == len(df) == len(scored)
+    assert scored["EmployeeNumber"].tolist() == df["EmployeeNumber"].tolist()
+    assert scored["probability"].to_numpy() == pytest.approx(want)
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from src.config import MODEL_FILE, DATA_READY
+from src.serve import Histogram, ValidationError, parse_payload, start_service
+
+pytestmark = pytest.mark.skipif(not (MODEL_FILE.exists() and DATA_READY.exists()),
+                                reason="model or ready parquet not found")
+
+CATEGORIES = {"OverTime": ["No", "Yes"], "JobLevel": [1, 2, 3]}
+FEATS = ["Age", "OverTime", "JobLevel"]
+
+
+def test_payload_validation():
+    rows = parse_payload(b'{"Age": 30, "OverTime": "Yes", "JobLevel": null}', FEATS, CATEGORIES)
+    assert rows[0]["Age"] == 30.0 and rows[0]["JobLevel"] != rows[0]["JobLevel"]  # NaN
+    with pytest.raises(ValidationError) as e:
+        parse_payload(b'{"rows": [{"Age": "old", "OverTime": "Maybe", "JobLevel": "2", "X": 1}]}',
+                      FEATS, CATEGORIES)
+    assert len(e.value.problems) == 4
+    with pytest.raises(ValidationError):
+        parse_payload(b"not json", FEATS, CATEGORIES)
+
+
+def test_histogram_is_cumulative():
+    h = Histogram([1, 2])
+    for v in (0.5, 1.5, 3):
+        h.observe(v)
+    assert h.render("x", "help")[2:5] == ['x_bucket{le="1"} 1', 'x_bucket{le="2"} 2',
+                                          'x_bucket{le="+Inf"} 3']
+
+
+async def _request(port, method, path, body=b"", length=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    length = len(body) if length is None else length
+    writer.write(f"{method} {path} HTTP/1.1\r\nConnection: close\r\n"
+                 f"Content-Length: {length}\r\n\r\n".encode() + body)
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+
+def test_concurrent_requests_are_batched():
+    async def scenario():
+        service, server = await start_service(port=0, max_wait_ms=20)
+        port = server.sockets[0].getsockname()[1]
+        model = service.loader.get()
+        df = pd.read_parquet(DATA_READY, columns=model.feats).head(50)
+        rows = json.loads(df.to_json(orient="records"))
+        try:
+            out = await asyncio.gather(*(_request(port, "POST", "/predict", json.dumps(r).encode())
+                                         for r in rows))
+            bad = await _request(port, "POST", "/predict", b'{"Age": 1}')
+            wrong = await _request(port, "GET", "/predict")
+            metrics = (await _request(port, "GET", "/metrics"))[1].decode()
+            health = json.loads((await _request(port, "GET", "/health"))[1])
+        finally:
+            await service.batcher.stop()
+            server.close()
+        return model, rows, out, bad, wrong, metrics, health, service.batcher.batch_sizes
+
+    model, rows, out, bad, wrong, metrics, health, sizes = asyncio.run(scenario())
+    assert all(status == 200 for status, _ in out)
+    got = [json.loads(p)["predictions"][0]["probability"] for _, p in out]
+    assert got == pytest.approx([model.predict_one(r) for r in rows], abs=1e-12)
+    assert sizes.count < len(rows)          # merged into fewer predict calls
+    assert bad[0] == 422 and wrong[0] == 405
+    assert "scoring_queue_depth 0" in metrics and "scoring_request_seconds_bucket" in metrics
+    assert health == {"status": "ok", "model_version": model.version, "queue_depth": 0}
+
+
+def test_bad_content_length_is_rejected():
+    async def scenario():
+        service, server = await start_service(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return [(await _request(port, "POST", "/predict", b"{}", length))[0]
+                    for length in ("abc", "-5")]
+        finally:
+            await service.batcher.stop()
+            server.close()
+
+    assert asyncio.run(scenario()) == [400, 400]
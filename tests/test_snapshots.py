@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from src.config import DATA_READY, MODEL_FILE
+from src.corr_stats import build_corr_stats
+from src.cube import build_cube
+from src.snapshots import (ingest, load_snapshot, publish, read_manifest, refresh,
+                           snapshot_aggregates, snapshot_dates)
+
+pytestmark = pytest.mark.skipif(not DATA_READY.exists(), reason="ready parquet not found")
+
+CUBE_KEYS = ["feature", "value", "Department", "OverTime", "Age"]
+
+
+@pytest.fixture
+def ready():
+    return pd.read_parquet(DATA_READY)
+
+
+def test_aggregates_from_partitions_match_full_build(ready, tmp_path):
+    result = ingest(ready.drop(columns="target"), "2026-09-30", store=tmp_path)
+    assert sorted(result["added"]) == sorted(ready["Department"].unique())
+    assert refresh(store=tmp_path) == {"computed": 3, "reused": 0}
+
+    cube, corr = snapshot_aggregates("2026-09-30", tmp_path)
+    want = build_cube(ready)
+    pd.testing.assert_frame_equal(cube.sort_values(CUBE_KEYS, ignore_index=True),
+                                  want.sort_values(CUBE_KEYS, ignore_index=True))
+    pd.testing.assert_frame_equal(corr, build_corr_stats(ready))
+    assert len(load_snapshot("2026-09-30", tmp_path)) == len(ready)
+
+
+def test_only_changed_partitions_are_rewritten(ready, tmp_path):
+    ingest(ready, "2026-08-31", store=tmp_path)
+    refresh(store=tmp_path)
+    assert ingest(ready, "2026-08-31", store=tmp_path)["added"] == []
+
+    changed = ready.copy()
+    changed.loc[changed["Department"] == "Sales", "MonthlyIncome"] += 100
+    with pytest.raises(ValueError):
+        ingest(changed, "2026-08-31", store=tmp_path)
+    result = ingest(changed, "2026-08-31", store=tmp_path, replace=True)
+    assert result["replaced"] == ["Sales"] and len(result["unchanged"]) == 2
+    assert refresh(store=tmp_path) == {"computed": 1, "reused": 2}
+
+    ingest(changed, "2026-09-30", store=tmp_path)   # next month, same rows
+    assert refresh(store=tmp_path) == {"computed": 0, "reused": 6}
+    assert snapshot_dates(tmp_path) == ["2026-08-31", "2026-09-30"]
+    sales = [p for p in read_manifest(tmp_path)["partitions"] if p["Department"] == "Sales"]
+    assert [p["revision"] for p in sales] == [2, 1]
+
+
+def test_rows_without_department_are_rejected(ready, tmp_path):
+    broken = ready.copy()
+    broken.loc[:2, "Department"] = None
+    with pytest.raises(ValueError, match="3 snapshot rows"):
+        ingest(broken, "2026-09-30", store=tmp_path)
+    assert read_manifest(tmp_path)["partitions"] == []
+
+
+@pytest.mark.skipif(not MODEL_FILE.exists(), reason="model not found")
+def test_publish_writes_app_inputs(ready, tmp_path):
+    from src.registry import LoadedModel
+    from src.score_cache import load_or_score
+
+    model = LoadedModel("v1")
+    store, out = tmp_path / "store", tmp_path / "out"
+    ingest(ready, "2026-09-30", store=store)
+    publish(store=store, model=model, ready_path=out / "ready.parquet",
+            cube_path=out / "cube.parquet", corr_path=out / "corr.parquet",
+            scores_dir=out / "scores")
+    published = pd.read_parquet(out / "ready.parquet")
+    scores = load_or_score(model.model_path, out / "ready.parquet", model.feats,
+                           get_model=None, get_data=None, scores_dir=out / "scores")
+    assert scores["probability"].to_numpy() == pytest.approx(
+        model.scorer().predict_proba(published[model.feats])[:, 1], abs=1e-12)
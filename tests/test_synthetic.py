@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from src.config import RAW_CSV
+from src.synthetic import fit_profile, generate
+
+pytestmark = pytest.mark.skipif(not RAW_CSV.exists(), reason="raw CSV not found")
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return pd.read_csv(RAW_CSV)
+
+
+def test_generate_is_seeded_and_chunked(raw, tmp_path):
+    profile = fit_profile(raw)
+    files = generate(profile, 5000, tmp_path / "a", seed=7, chunk_rows=2000)
+    generate(profile, 5000, tmp_path / "b", seed=7, chunk_rows=2000)
+    assert [f.name for f in files] == ["part-00000.parquet", "part-00001.parquet",
+                                       "part-00002.parquet"]
+    a = pd.read_parquet(tmp_path / "a")
+    pd.testing.assert_frame_equal(a, pd.read_parquet(tmp_path / "b"))
+    assert list(a.columns) == list(raw.columns)
+    assert len(a) == 5000 and a["EmployeeNumber"].is_unique
+
+
+def test_generated_data_keeps_relationships(raw, tmp_path):
+    generate(fit_profile(raw), 20000, tmp_path, seed=1)
+    df = pd.read_parquet(tmp_path)
+
+    seen = set(map(tuple, raw[["Department", "JobRole"]].drop_duplicates().to_numpy()))
+    assert set(map(tuple, df[["Department", "JobRole"]].drop_duplicates().to_numpy())) <= seen
+
+    rate = df.groupby("OverTime")["Attrition"].apply(lambda s: (s == "Yes").mean())
+    assert rate["Yes"] > 2 * rate["No"]
+    assert df.groupby("JobLevel")["MonthlyIncome"].median().is_monotonic_increasing
+    assert (df["YearsAtCompany"] <= df["TotalWorkingYears"]).all()
+    assert (df["TotalWorkingYears"] <= df["Age"] - 18).all()
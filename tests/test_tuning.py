@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from src.config import DATA_READY
+from src.features import NUM_FEATURES, CAT_FEATURES
+from src.tuning import rung_sizes, successive_halving
+
+pytestmark = pytest.mark.skipif(not DATA_READY.exists(), reason="ready parquet not found")
+
+SMALL_SPACE = {
+    "clf__max_depth": [None, 4],
+    "clf__min_samples_leaf": [1, 4],
+}
+
+
+def _data(n=300):
+    df = pd.read_parquet(DATA_READY).head(n)
+    return df[NUM_FEATURES + CAT_FEATURES], df["target"]
+
+
+def test_rung_sizes():
+    rungs = rung_sizes(81, 25, 500, 3)
+    assert [n for n, _ in rungs] == [81, 27, 9, 3, 1]
+    assert rungs[-1][1] == 500
+    assert [r for _, r in rungs] == [25, 25, 56, 167, 500]
+
+
+def test_search_runs_and_logs(tmp_path):
+    X, y = _data()
+    log_path = tmp_path / "log.csv"
+    best, log = successive_halving(X, y, SMALL_SPACE, n_candidates=4, eta=2,
+                                   min_estimators=2, max_estimators=8, cv=2,
+                                   n_jobs=1, log_path=log_path)
+    assert best["clf__n_estimators"] == 8
+    assert log["rung"].tolist() == [0, 0, 0, 0, 1, 1, 2]
+    assert pd.read_csv(log_path).shape[0] == len(log)
+
+
+def test_fit_budget_stops_early():
+    X, y = _data()
+    best, log = successive_halving(X, y, SMALL_SPACE, n_candidates=4, eta=2,
+                                   min_estimators=2, max_estimators=8, cv=2,
+                                   max_fits=10, n_jobs=1, log_path=None)
+    # rung 0 costs 8 fits, rung 1 would push it to 12
+    assert log["rung"].max() == 0
+    assert best["clf__n_estimators"] == 8  # refit at full size
+
+
+def test_fit_budget_limits_first_rung():
+    X, y = _data()
+    _, log = successive_halving(X, y, SMALL_SPACE, n_candidates=4, eta=2,
+                                min_estimators=2, max_estimators=8, cv=2,
+                                max_fits=5, n_jobs=1, log_path=None)
+    assert len(log) * 2 <= 5
+    with pytest.raises(ValueError):
+        successive_halving(X, y, SMALL_SPACE, cv=2, max_fits=1, n_jobs=1, log_path=None)
+
+
+def test_cached_preprocessing_matches_full_pipeline():
+    X, y = _data()
+    kw = dict(param_space=SMALL_SPACE, n_candidates=4, eta=2, min_estimators=2,
+              max_estimators=8, cv=2, n_jobs=1, log_path=None)
+    best_a, log_a = successive_halving(X, y, cache_preprocessing=True, **kw)
+    best_b, log_b = successive_halving(X, y, cache_preprocessing=False, **kw)
+    assert best_a == best_b
+    assert log_a["mean_auc"].tolist() == log_b["mean_auc"].tolist()
+
+
+def test_cached_preprocessing_rejects_preprocessor_params():
+    X, y = _data()
+    with pytest.raises(ValueError):
+        successive_halving(X, y, {"pre__num__impute__strategy": ["mean"]},
+                           n_candidates=1, cv=2, log_path=None)